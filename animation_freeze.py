@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Animation-freeze init script: seeded Math.random, a virtual timer clock and reduced motion
+"""
+
+import json
+
+FREEZE_SEED = 1337
+# Fixed wall clock for Date, 2025-01-01T00:00:00Z
+FREEZE_EPOCH_MS = 1735689600000
+# Virtual time run right after window.load: covers the title typing (0-600 ms)
+# and the loading screen that fades at 3 s and is removed at 3.5 s
+LOAD_SETTLE_MS = 5000
+
+# Installed before any page script. setTimeout/setInterval are queued against a
+# paused virtual clock that only moves when advanced; Date reads the same
+# clock. requestAnimationFrame and performance.now stay real so frame and
+# metric measurements keep working.
+_FREEZE_JS = """
+(({seed, epoch, settle}) => {
+    let state = seed >>> 0;
+    Math.random = () => {
+        state = (state + 0x6D2B79F5) | 0;
+        let t = Math.imul(state ^ (state >>> 15), 1 | state);
+        t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+
+    const realSetTimeout = window.setTimeout.bind(window);
+    const timers = new Map();
+    let now = 0, nextId = 1;
+    const schedule = (fn, delay, args, repeat) => {
+        const id = nextId++;
+        const wait = Math.max(0, Number(delay) || 0);
+        timers.set(id, {fn, args, at: now + wait, every: repeat ? Math.max(1, wait) : 0});
+        return id;
+    };
+    window.setTimeout = (fn, delay, ...args) => schedule(fn, delay, args, false);
+    window.setInterval = (fn, delay, ...args) => schedule(fn, delay, args, true);
+    window.clearTimeout = window.clearInterval = id => { timers.delete(id); };
+
+    const RealDate = Date;
+    function VirtualDate(...args) {
+        if (!new.target) return new RealDate(epoch + now).toString();
+        return new RealDate(...(args.length ? args : [epoch + now]));
+    }
+    VirtualDate.prototype = RealDate.prototype;
+    VirtualDate.now = () => epoch + now;
+    VirtualDate.parse = RealDate.parse;
+    VirtualDate.UTC = RealDate.UTC;
+    window.Date = VirtualDate;
+
+    const advance = ms => {
+        const target = now + ms;
+        let fired = 0;
+        for (;;) {
+            let nextTimer = null;
+            for (const [id, timer] of timers) {
+                if (timer.at <= target && (!nextTimer || timer.at < nextTimer[1].at)) nextTimer = [id, timer];
+            }
+            if (!nextTimer) break;
+            const [id, timer] = nextTimer;
+            now = timer.at;
+            if (timer.every) timer.at += timer.every; else timers.delete(id);
+            try {
+                typeof timer.fn === 'function' ? timer.fn(...timer.args) : (0, eval)(String(timer.fn));
+            } catch (e) {
+                console.error(e);
+            }
+            fired++;
+        }
+        now = target;
+        return fired;
+    };
+    window.__virtualClock = {advance, now: () => now, pending: () => timers.size};
+
+    const style = document.createElement('style');
+    style.textContent = `*, *::before, *::after {
+        animation-delay: 0s !important; animation-duration: 0s !important;
+        animation-iteration-count: 1 !important; transition-delay: 0s !important;
+        transition-duration: 0s !important; scroll-behavior: auto !important;
+        caret-color: transparent !important; }`;
+    const attach = () => (document.head || document.documentElement).appendChild(style);
+    if (document.documentElement) attach(); else document.addEventListener('readystatechange', attach, {once: true});
+
+    // After every load listener has queued its timers, run them to completion
+    window.addEventListener('load', () => realSetTimeout(() => advance(settle), 0));
+})
+"""
+
+
+def freeze_script(seed=FREEZE_SEED, epoch_ms=FREEZE_EPOCH_MS, settle_ms=LOAD_SETTLE_MS):
+    """Init script source for `context.add_init_script`."""
+    options = json.dumps({"seed": seed, "epoch": epoch_ms, "settle": settle_ms})
+    return f"{_FREEZE_JS.strip()}({options});"
+
+
+async def install_freeze(context, seed=FREEZE_SEED):
+    """Freeze every page the context opens from now on."""
+    await context.add_init_script(freeze_script(seed))
+
+
+# Scrolls the whole page past the viewport so IntersectionObservers see every element,
+# then runs the timers their callbacks queued. Null on a page that is not frozen.
+_SETTLE_JS = """
+async ([ms, reveal]) => {
+    const clock = window.__virtualClock;
+    if (!clock) return null;
+    const frames = () => new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    if (reveal) {
+        const start = scrollY;
+        for (let y = 0; y < document.documentElement.scrollHeight; y += innerHeight) {
+            window.scrollTo(0, y);
+            await frames();
+        }
+        window.scrollTo(0, start);
+        await frames();
+    }
+    return clock.advance(ms);
+}
+"""
+
+
+async def advance_clock(page, ms):
+    """Run `ms` of virtual time on a frozen page; returns the number of timers fired."""
+    return await page.evaluate("ms => window.__virtualClock.advance(ms)", ms)
+
+
+async def settle_clock(page, ms=LOAD_SETTLE_MS, reveal=False):
+    """Run the timers queued since load, e.g. by clicks or scroll observers, before a capture.
+
+    The clock only moves on its own once, right after load, so anything scheduled
+    later waits for this. With `reveal` the page is first scrolled end to end so
+    scroll-triggered content (addScrollAnimations) is shown. Returns the number of
+    timers fired, or None when the page is not frozen.
+    """
+    return await page.evaluate(_SETTLE_JS, [ms, reveal])
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Shared Playwright session: one browser per run and a pool of isolated contexts
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urljoin
+from playwright.async_api import async_playwright
+from animation_freeze import FREEZE_SEED, install_freeze
+from dom_snapshot import snapshot_modal
+from har_replay import REPLAY_ORIGIN, install_replay
+from offline_routes import OfflineRouter, print_intercepts
+from page_waits import wait_for_modal_hidden, wait_for_transition_end
+from static_server import StaticServer
+
+# Point the suites at an already running server; unset, each session serves the repo itself
+BASE_URL = os.environ.get("SMASH_BASE_URL")
+# Resolved against the session's base URL by every pooled context
+PAGE_URL = "/game-website.html"
+
+# Characters specifically mentioned in the review
+REVIEW_CHARACTERS = ['kirby', 'naruto', 'goku', 'pikachu', 'link', 'megaman',
+                     'scratch-cat', 'impostor', 'ness', 'hat-kid', 'sora', 'reimu']
+MODAL_CHARACTERS = REVIEW_CHARACTERS + ['mario', 'more']
+
+
+class BrowserSession:
+    """One launched browser shared by every check, with `workers` isolated contexts.
+
+    With `offline` set (the default) every context serves external fonts and
+    images from the local fixture cache, so loads never wait on the network.
+    Without a `base_url` the repo is served by an in-process StaticServer on a
+    free port, so parallel runs never compete for one. `freeze` (True or a
+    seed) installs the animation-freeze script and reduced motion in every
+    context, so pages render deterministically without waiting on timers.
+    With `har` every context replays that recording instead of hitting a
+    server, delayed per `network` profile (e.g. "slow-3g") when given.
+    """
+
+    def __init__(self, workers=None, headless=True, offline=True, base_url=BASE_URL, freeze=False,
+                 har=None, network=None, **context_options):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.headless = headless
+        self.router = OfflineRouter() if offline else None
+        self.freeze = FREEZE_SEED if freeze is True else freeze
+        if self.freeze is not False:
+            context_options.setdefault("reduced_motion", "reduce")
+        self.har = har
+        self.network = network
+        self.throttles = []
+        self.base_url = REPLAY_ORIGIN if har else base_url
+        self.server = None
+        self.context_options = context_options
+        self._playwright = None
+        self.browser = None
+        self._contexts = []
+        self._idle = None
+
+    async def start(self):
+        if not self.base_url:
+            self.server = StaticServer().start()
+            self.base_url = self.server.url
+        self.context_options.setdefault("base_url", self.base_url)
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(headless=self.headless)
+        self._idle = asyncio.Queue()
+        for _ in range(self.workers):
+            self._idle.put_nowait(await self._new_context())
+        return self
+
+    async def _new_context(self, freeze=None, **overrides):
+        freeze = self.freeze if freeze is None else (FREEZE_SEED if freeze is True else freeze)
+        if freeze is not False and self.freeze is False:
+            overrides.setdefault("reduced_motion", "reduce")
+        context = await self.browser.new_context(**{**self.context_options, **overrides})
+        if freeze is not False:
+            await install_freeze(context, freeze)
+        if self.router:
+            await self.router.attach(context)
+        if self.har:
+            throttle = await install_replay(context, self.har, self.network)
+            if throttle:
+                self.throttles.append(throttle)
+        self._contexts.append(context)
+        return context
+
+    async def close(self):
+        for context in self._contexts:
+            await context.close()
+        self._contexts = []
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        if self.server:
+            self.server.stop()
+            self.server = None
+            self.base_url = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def url(self, path=PAGE_URL):
+        """Absolute URL of `path` on the server this session targets."""
+        return urljoin(self.base_url.rstrip("/") + "/", path.lstrip("/"))
+
+    @asynccontextmanager
+    async def context(self):
+        """Borrow an idle context from the pool for the duration of the block.
+
+        The pool grows instead of blocking when every context is borrowed, so a
+        caller holding a page can still fan work out with `map_pages`.
+        """
+        if self._idle.empty():
+            context = await self._new_context()
+        else:
+            context = self._idle.get_nowait()
+        try:
+            yield context
+        finally:
+            self._idle.put_nowait(context)
+
+    @asynccontextmanager
+    async def isolated_context(self, freeze=None, **options):
+        """A dedicated context with `options` layered over the session's, closed after the block.
+
+        For checks that need their own viewport, scale factor, touch or media
+        emulation, which a pooled context cannot change after creation. `freeze`
+        (True or a seed) freezes this context even when the session is live.
+        """
+        context = await self._new_context(freeze, **options)
+        self._contexts.remove(context)
+        try:
+            yield context
+        finally:
+            await context.close()
+
+    @asynccontextmanager
+    async def page(self, url=PAGE_URL):
+        """Open a page on a pooled context, navigated to `url` when given."""
+        async with self.context() as context:
+            page = await context.new_page()
+            try:
+                if url:
+                    await page.goto(url)
+                    await page.wait_for_load_state("networkidle")
+                yield page
+            finally:
+                await page.close()
+
+    async def map_pages(self, func, items, url=PAGE_URL):
+        """Run `await func(page, item)` for every item, spread across the pool.
+
+        Each worker loads `url` once and then pulls items from a shared queue,
+        so results come back in input order together with per-item timings.
+        """
+        items = list(items)
+        results = [None] * len(items)
+        durations = [0.0] * len(items)
+        pending = asyncio.Queue()
+        for index, item in enumerate(items):
+            pending.put_nowait((index, item))
+
+        async def worker():
+            async with self.page(url) as page:
+                while not pending.empty():
+                    index, item = pending.get_nowait()
+                    started = time.perf_counter()
+                    results[index] = await func(page, item)
+                    durations[index] = time.perf_counter() - started
+
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, len(items)))))
+        return results, durations
+
+
+async def check_character_modal(page, char_name):
+    """Hover and open one character's modal, then close it again with the X button."""
+    result = {"character": char_name, "found": False, "opened": False,
+              "title": None, "moves": 0, "combos": 0, "error": None}
+
+    char_card = await page.query_selector(f'[data-character="{char_name}"]')
+    if not char_card:
+        return result
+    result["found"] = True
+
+    try:
+        await char_card.hover()
+        await wait_for_transition_end(char_card)
+        await char_card.click()
+        await page.wait_for_selector("#movesModal", state="visible", timeout=2000)
+        result["opened"] = True
+
+        modal = await snapshot_modal(page)
+        result["title"] = modal["title"]
+        result["moves"] = len(modal["moves"])
+        result["combos"] = len(modal["combos"])
+
+        close_btn = await page.query_selector(".close")
+        if close_btn:
+            await close_btn.click()
+            await wait_for_modal_hidden(page)
+    except Exception as e:
+        result["error"] = str(e)
+
+    return result
+
+
+async def run_modal_checks(session, characters=MODAL_CHARACTERS):
+    """Check every character modal on the pool and report pooled vs serial time."""
+    started = time.perf_counter()
+    results, durations = await session.map_pages(check_character_modal, characters)
+    wall_time = time.perf_counter() - started
+    for result, duration in zip(results, durations):
+        result["duration"] = duration
+    serial_time = sum(durations)
+    return results, {
+        "workers": session.workers,
+        "wall_time": wall_time,
+        "serial_time": serial_time,
+        "speedup": serial_time / wall_time if wall_time else 0.0,
+    }
+
+
+def print_timing(timing):
+    print(f"⏱️  {timing['workers']} worker(s): {timing['wall_time']:.2f}s wall "
+          f"vs {timing['serial_time']:.2f}s serial "
+          f"({timing['speedup']:.1f}x speedup)")
+
+
+async def main(workers=None, compare_serial=False, offline=True, freeze=False):
+    print("🎮 Pooled modal checks for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+
+    async with BrowserSession(workers=workers, offline=offline, freeze=freeze) as session:
+        results, timing = await run_modal_checks(session)
+        for result in results:
+            status = "✅" if result["opened"] else "❌"
+            print(f"{status} {result['character']}: {result['title']} "
+                  f"({result['moves']} moves, {result['combos']} combos)")
+        print_timing(timing)
+        if session.router:
+            print_intercepts(session.router)
+
+    if compare_serial:
+        async with BrowserSession(workers=1, offline=offline, freeze=freeze) as serial_session:
+            _, serial_timing = await run_modal_checks(serial_session)
+        print(f"⏱️  Serial baseline: {serial_timing['wall_time']:.2f}s wall, "
+              f"pooled run is {serial_timing['wall_time'] / timing['wall_time']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of pooled contexts (default: one per core)")
+    parser.add_argument("--compare-serial", action="store_true",
+                        help="also run the checks on a single context for a baseline")
+    parser.add_argument("--online", action="store_true",
+                        help="let font and image requests reach the real network")
+    parser.add_argument("--freeze", action="store_true",
+                        help="seed Math.random, pause timers on a virtual clock and disable animations")
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.compare_serial, not args.online, args.freeze))
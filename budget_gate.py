@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Performance budget gate: asset bytes, requests, DOM size and LCP/CLS/TBT per viewport
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+from dataclasses import dataclass
+from browser_session import BrowserSession
+from check_results import CheckResult, ResultStream
+from page_metrics import VIEWPORTS, measure_viewports
+from static_analyzer import build_index
+from static_server import INDEX, ROOT, SITE_ROOT, Asset, brotli
+
+BUDGETS_PATH = os.path.join(ROOT, "budgets.json")
+_CONTENT_HASH = re.compile(r'\.[0-9a-f]{8,}(?=\.\w+$)')
+
+
+@dataclass(slots=True)
+class BudgetRow:
+    metric: str
+    measured: float
+    limit: float
+
+    @property
+    def over(self):
+        return self.measured is None or self.measured > self.limit
+
+    @property
+    def diff(self):
+        return None if self.measured is None else self.measured - self.limit
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def logical_name(name):
+    """`game-styles.3f2a9c1b0d.css` -> `game-styles.css`, so budgets also apply to dist/."""
+    return _CONTENT_HASH.sub("", name)
+
+
+def asset_sizes(root=SITE_ROOT, page=INDEX):
+    """Raw and compressed bytes of the page and every local stylesheet, script and image it references."""
+    with open(os.path.join(root, page), "rb") as f:
+        index = build_index(f.read())
+    refs = [page]
+    refs += [link.attrs.get("href", "") for link in index.find_all("link")
+             if {"stylesheet", "preload"} & set(link.attrs.get("rel", "").lower().split())]
+    refs += [element.attrs.get("src", "") for element in index.find_all("script") + index.find_all("img")]
+    sizes = {}
+    for ref in refs:
+        path = os.path.join(root, *ref.split("?")[0].split("/"))
+        if not ref or "//" in ref or ref.startswith("data:") or not os.path.isfile(path):
+            continue
+        asset = Asset(path)
+        entry = {"raw": len(asset.raw), "gzip": len(asset.variant("gzip")[0])}
+        if brotli is not None:
+            entry["br"] = len(asset.variant("br")[0])
+        sizes[logical_name(os.path.basename(ref))] = entry
+    return sizes
+
+
+def evaluate_budgets(budgets, assets, viewport_metrics):
+    """One row per budgeted value: asset bytes, then requests, DOM size and web vitals per viewport."""
+    rows = []
+    for name, limits in budgets.get("assets", {}).items():
+        for encoding, limit in limits.items():
+            rows.append(BudgetRow(f"{name} {encoding} bytes", assets.get(name, {}).get(encoding), limit))
+    for viewport, metrics in viewport_metrics.items():
+        limits = {key: budgets[key] for key in ("requests", "dom_elements") if key in budgets}
+        limits.update(budgets.get("viewports", {}).get(viewport, {}))
+        for key, limit in limits.items():
+            rows.append(BudgetRow(f"{viewport} {key}", metrics.get(key), limit))
+    return rows
+
+
+def budget_checks(rows):
+    checks = []
+    for row in rows:
+        check = CheckResult(name=row.metric.replace(" ", "_"), group="budgets")
+        check.expect_max("value", row.measured, row.limit)
+        checks.append(check)
+    return checks
+
+
+def _format(value):
+    if value is None:
+        return "n/a"
+    return f"{value:.3f}" if isinstance(value, float) and abs(value) < 10 else f"{value:,.0f}"
+
+
+def print_budget_table(rows):
+    print(f"   {'Budget':<30} {'Measured':>10} {'Limit':>10} {'Diff':>10} {'%':>7}")
+    for row in rows:
+        icon = "❌" if row.over else "✅"
+        percent = f"{row.diff / row.limit:+.0%}" if row.diff is not None and row.limit else ""
+        diff = "" if row.diff is None else ("+" if row.diff > 0 else "") + _format(row.diff)
+        print(f"{icon} {row.metric:<30} {_format(row.measured):>10} {_format(row.limit):>10} "
+              f"{diff:>10} {percent:>7}")
+    over = [row for row in rows if row.over]
+    print(f"💰 {len(rows) - len(over)}/{len(rows)} budgets met"
+          + (f", {len(over)} over: {', '.join(row.metric for row in over)}" if over else ""))
+
+
+async def run_gate(session, budgets, viewports=VIEWPORTS):
+    viewport_metrics, _ = await measure_viewports(session, viewports)
+    root = session.server.root if session.server else SITE_ROOT
+    return evaluate_budgets(budgets, asset_sizes(root), viewport_metrics)
+
+
+async def main(args):
+    print("🎮 Performance budgets for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    budgets = load_budgets(args.budgets)
+    # Each viewport is measured on its own isolated context, so the pool needs only one
+    async with BrowserSession(workers=1) as session:
+        rows = await run_gate(session, budgets)
+    print_budget_table(rows)
+    with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+        for check in budget_checks(rows):
+            results.add(check)
+    return results.ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budgets", default=BUDGETS_PATH, help="budgets JSON file")
+    parser.add_argument("--jsonl", help="write budget results as JSON Lines to this path")
+    parser.add_argument("--junit", help="write budget results as JUnit XML to this path")
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Build an optimised dist/: minified, content-hashed assets with the above-the-fold CSS inlined
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from static_analyzer import build_index
+from static_server import INDEX, ROOT, StaticServer, brotli
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+DIST_DIR = os.path.join(ROOT, "dist")
+MANIFEST = "manifest.json"
+# Sections that are on screen before any scrolling
+CRITICAL_ROOTS = ("navbar", "hero")
+GLOBAL_SELECTORS = {"*", "html", "body", ":root"}
+FONT_ORIGINS = ["https://fonts.googleapis.com", "https://fonts.gstatic.com"]
+# Ten TCP segments: what the server can send before the first ACK. Inlined critical CSS
+# saves a render-blocking round trip only while the gzipped page still fits in it.
+INITIAL_WINDOW_BYTES = 14600
+
+_STRING = re.compile(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'')
+_MASKED = re.compile(r'\x00(\d+)\x00')
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_PSEUDO = re.compile(r'::?[\w-]+(?:\([^)]*\))?|\[[^\]]*\]')
+_LINK_TAG = re.compile(r'<link\b[^>]*>', re.I)
+_SCRIPT_TAG = re.compile(r'<script\b[^>]*\bsrc=["\']([^"\']+)["\'][^>]*>\s*</script>', re.I)
+_ATTR = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+
+# --- CSS -------------------------------------------------------------------
+
+def _mask_strings(text):
+    strings = []
+
+    def keep(match):
+        strings.append(match.group())
+        return f"\x00{len(strings) - 1}\x00"
+
+    return _STRING.sub(keep, text), strings
+
+
+def _unmask(text, strings):
+    return _MASKED.sub(lambda match: strings[int(match.group(1))], text)
+
+
+def parse_css(text):
+    """Parse string-masked, comment-free CSS into ("rule"|"group"|"statement", prelude, body) nodes.
+
+    A group's body is a list of nodes (@media, @supports, @keyframes); a
+    rule's body is its declaration text.
+    """
+    nodes = []
+    pos = 0
+    while True:
+        brace = text.find("{", pos)
+        if brace < 0:
+            break
+        prelude = text[pos:brace]
+        # @import/@charset statements end with ';' before the next block
+        *statements, prelude = prelude.split(";")
+        nodes += [("statement", s.strip(), None) for s in statements if s.strip()]
+        depth = 0
+        for end in range(brace, len(text)):
+            if text[end] == "{":
+                depth += 1
+            elif text[end] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+        else:
+            raise ValueError(f"unbalanced braces after {prelude.strip()[:40]!r}")
+        body = text[brace + 1:end]
+        if "{" in body:
+            nodes.append(("group", prelude.strip(), parse_css(body)))
+        else:
+            nodes.append(("rule", prelude.strip(), body))
+        pos = end + 1
+    return nodes
+
+
+def _minify_selector(selector):
+    selector = re.sub(r'\s+', ' ', selector.strip())
+    return re.sub(r'\s*([>+~,])\s*', r'\1', selector)
+
+
+def _minify_declarations(body):
+    declarations = []
+    for declaration in body.split(";"):
+        name, colon, value = declaration.partition(":")
+        if not colon:
+            continue
+        value = re.sub(r'\s+', ' ', value.strip())
+        value = re.sub(r'\s*,\s*', ',', value)
+        value = re.sub(r'\s*!\s*important', '!important', value)
+        value = re.sub(r'(?<![\w.#-])0+\.(\d)', r'.\1', value)
+        declarations.append(f"{name.strip()}:{value}")
+    return ";".join(declarations)
+
+
+def serialize_css(nodes):
+    parts = []
+    for kind, prelude, body in nodes:
+        if kind == "statement":
+            parts.append(re.sub(r'\s+', ' ', prelude) + ";")
+        elif kind == "group":
+            parts.append(re.sub(r'\s+', ' ', prelude) + "{" + serialize_css(body) + "}")
+        else:
+            parts.append(_minify_selector(prelude) + "{" + _minify_declarations(body) + "}")
+    return "".join(parts)
+
+
+def minify_css(css):
+    masked, strings = _mask_strings(css)
+    return _unmask(serialize_css(parse_css(_CSS_COMMENT.sub("", masked))), strings)
+
+
+def critical_names(html, roots=CRITICAL_ROOTS):
+    """Classes, ids and tags used inside the above-the-fold sections of the page."""
+    index = build_index(html)
+    classes, ids, tags = set(), set(), {"html", "body"}
+    for elements in index.by_tag.values():
+        for element in elements:
+            if any(root in element.classes or element.closest(root) is not None for root in roots):
+                classes.update(element.classes)
+                tags.add(element.tag)
+                if "id" in element.attrs:
+                    ids.add(element.attrs["id"])
+    return classes, ids, tags
+
+
+def _selector_is_critical(selector, classes, ids, tags):
+    selector = _PSEUDO.sub("", selector)
+    used_classes = set(re.findall(r'\.([\w-]+)', selector))
+    used_ids = set(re.findall(r'#([\w-]+)', selector))
+    if used_classes or used_ids:
+        return used_classes <= classes and used_ids <= ids
+    used_tags = set(re.findall(r'(?:^|[\s>+~])([a-z][\w-]*|\*)', selector.strip()))
+    return bool(used_tags) and used_tags <= tags | GLOBAL_SELECTORS or not selector.strip()
+
+
+def critical_css(css, html, roots=CRITICAL_ROOTS):
+    """Minified subset of `css` styling the `roots` sections, plus the keyframes they animate."""
+    classes, ids, tags = critical_names(html, roots)
+    masked, strings = _mask_strings(css)
+    nodes = parse_css(_CSS_COMMENT.sub("", masked))
+
+    def select(nodes):
+        picked = []
+        for kind, prelude, body in nodes:
+            if kind == "rule" and any(_selector_is_critical(s, classes, ids, tags) for s in prelude.split(",")):
+                picked.append((kind, prelude, body))
+            elif kind == "group" and not prelude.startswith("@keyframes"):
+                children = select(body)
+                if children:
+                    picked.append((kind, prelude, children))
+        return picked
+
+    picked = select(nodes)
+    animated = set(re.findall(r'animation(?:-name)?\s*:\s*([\w-]+)', serialize_css(picked)))
+    keyframes = [node for node in nodes if node[0] == "group" and node[1].startswith("@keyframes")
+                 and node[1].split()[-1] in animated]
+    return _unmask(serialize_css(keyframes + picked), strings)
+
+
+# --- JavaScript ------------------------------------------------------------
+
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw"}
+
+
+def _word_char(char):
+    return char.isalnum() or char in "_$"
+
+
+def minify_js(source):
+    """Strip comments and indentation, keeping line breaks so semicolon insertion is unchanged.
+
+    Uses rjsmin when it is installed.
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    out = []
+    templates = []  # open `${` brace depth per enclosing template literal
+    in_template = False
+    i, n = 0, len(source)
+
+    def last_significant():
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped
+        return ""
+
+    while i < n:
+        char = source[i]
+        if in_template:
+            if char == "\\":
+                out.append(source[i:i + 2])
+                i += 2
+            elif char == "`":
+                out.append(char)
+                in_template = False
+                i += 1
+            elif source.startswith("${", i):
+                out.append("${")
+                templates.append(0)
+                in_template = False
+                i += 2
+            else:
+                out.append(char)
+                i += 1
+            continue
+
+        if char in "\"'":
+            end = i + 1
+            while end < n and source[end] != char:
+                end += 2 if source[end] == "\\" else 1
+            out.append(source[i:end + 1])
+            i = end + 1
+        elif char == "`":
+            out.append(char)
+            in_template = True
+            i += 1
+        elif source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            comment = source[i:end]
+            i = n if end < 0 else end + 2
+            out.append("\n" if "\n" in comment else " ")
+        elif char == "/":
+            previous = last_significant()
+            word = re.search(r'[\w$]+$', previous)
+            if not previous or previous[-1] in _REGEX_PRECEDERS or (word and word.group() in _REGEX_KEYWORDS):
+                end, in_class = i + 1, False
+                while end < n and (in_class or source[end] != "/"):
+                    if source[end] == "\\":
+                        end += 1
+                    elif source[end] == "[":
+                        in_class = True
+                    elif source[end] == "]":
+                        in_class = False
+                    end += 1
+                end += 1
+                while end < n and _word_char(source[end]):
+                    end += 1
+                out.append(source[i:end])
+                i = end
+            else:
+                out.append(char)
+                i += 1
+        elif char.isspace():
+            end = i
+            while end < n and source[end].isspace():
+                end += 1
+            previous = "".join(out[-1:])[-1:] if out else ""
+            following = source[end:end + 1]
+            if "\n" in source[i:end]:
+                if previous and previous != "\n":
+                    out.append("\n")
+            elif previous and following and (_word_char(previous) and _word_char(following)
+                                             or previous == following and previous in "+-"):
+                out.append(" ")
+            i = end
+        else:
+            if templates and char == "{":
+                templates[-1] += 1
+            elif templates and char == "}":
+                if templates[-1] == 0:
+                    templates.pop()
+                    in_template = True
+                else:
+                    templates[-1] -= 1
+            out.append(char)
+            i += 1
+    return "".join(out).strip() + "\n"
+
+
+# --- HTML and build --------------------------------------------------------
+
+def content_hash_name(name, content):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:10]}{ext}"
+
+
+def tag_attrs(tag):
+    """The quoted attributes of an HTML start tag, keyed by lower-cased name."""
+    return {m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3) for m in _ATTR.finditer(tag)}
+
+
+def _deferred_stylesheet(href):
+    return (f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            f'<noscript><link rel="stylesheet" href="{href}"></noscript>')
+
+
+def _is_local(ref):
+    return not re.match(r'^(?:[a-z]+:)?//', ref, re.I) and not ref.startswith("data:")
+
+
+def optimise_html(html, assets, critical):
+    """Inline `critical` CSS, defer every stylesheet and point local references at hashed names.
+
+    Without `critical` the local stylesheets stay render-blocking, so the page never paints unstyled.
+    """
+    inlined = False
+
+    def stylesheet(match):
+        nonlocal inlined
+        attrs = tag_attrs(match.group())
+        if "stylesheet" not in attrs.get("rel", "").lower().split():
+            return match.group()
+        href = attrs.get("href", "")
+        replacement = ""
+        if _is_local(href):
+            href = assets.get(href, href)
+            if not critical:
+                return f'<link rel="stylesheet" href="{href}">'
+            if not inlined:
+                replacement = f"<style>{critical}</style>"
+                inlined = True
+        else:
+            origin = re.match(r'^(?:https?:)?//[^/]+', href).group()
+            origins = FONT_ORIGINS if origin in FONT_ORIGINS else [origin]
+            replacement = "".join(f'<link rel="preconnect" href="{origin}" crossorigin>' for origin in origins)
+        return replacement + _deferred_stylesheet(href)
+
+    def script(match):
+        src = match.group(1)
+        if not _is_local(src):
+            return match.group()
+        return f'<script src="{assets.get(src, src)}" defer></script>'
+
+    html = _LINK_TAG.sub(stylesheet, html.replace("\r\n", "\n"))
+    html = _SCRIPT_TAG.sub(script, html)
+    html = _HTML_COMMENT.sub("", html)
+    return re.sub(r'\n\s+', '\n', html)
+
+
+def count_requests(html):
+    """Requests a page makes for stylesheets, scripts and images, and how many block rendering.
+
+    <noscript> fallbacks are never fetched when scripts run, and a deferred
+    stylesheet's preload is the one request for it, so neither is counted twice.
+    """
+    index = build_index(html)
+
+    def fetched(tag, rel=None, attr="src"):
+        return [element for element in index.find_all(tag)
+                if not _inside(element, "noscript") and element.attrs.get(attr)
+                and (rel is None or rel in element.attrs.get("rel", "").lower().split())]
+
+    stylesheets = fetched("link", "stylesheet", "href")
+    preloads = fetched("link", "preload", "href")
+    scripts = fetched("script")
+    images = fetched("img")
+    blocking = [link for link in stylesheets if link.attrs.get("media", "all") in ("all", "screen")]
+    blocking += [script for script in scripts
+                 if _inside(script, "head") and not ({"defer", "async"} & script.attrs.keys())]
+    return {"requests": len(stylesheets) + len(preloads) + len(scripts) + len(images),
+            "render_blocking": len(blocking)}
+
+
+def _inside(element, tag):
+    node = element.parent
+    while node is not None and node.tag != tag:
+        node = node.parent
+    return node is not None
+
+
+def _sizes(content):
+    sizes = {"raw": len(content), "gzip": len(gzip.compress(content, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        sizes["br"] = len(brotli.compress(content, quality=11))
+    return sizes
+
+
+def build(root=ROOT, out_dir=DIST_DIR, page=INDEX, card_images=False):
+    """Write the optimised site to `out_dir` and return the before/after report.
+
+    With `card_images` the placeholder card images are replaced by local,
+    multi-resolution lazy-loaded ones (image_pipeline.build_card_images).
+    """
+    with open(os.path.join(root, page), "rb") as f:
+        raw_html = f.read()
+    html = raw_html.decode("utf-8")
+    if os.path.isdir(out_dir):
+        # Only a previous build (it always writes the manifest last) is safe to wipe
+        if os.listdir(out_dir) and not os.path.isfile(os.path.join(out_dir, MANIFEST)):
+            raise ValueError(f"{out_dir} is not empty and has no {MANIFEST}, so it is not a previous build")
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+
+    report = {"files": {}, "before": count_requests(html)}
+    assets = {}
+    stylesheet_text = ""
+    for tag in _LINK_TAG.findall(html) + [m.group() for m in _SCRIPT_TAG.finditer(html)]:
+        attrs = tag_attrs(tag)
+        ref = attrs.get("href") or attrs.get("src", "")
+        if not _is_local(ref) or ref in assets or not os.path.isfile(os.path.join(root, ref)):
+            continue
+        with open(os.path.join(root, ref), "rb") as f:
+            raw = f.read()
+        source = raw.decode("utf-8")
+        if ref.endswith(".css"):
+            stylesheet_text += source
+            minified = minify_css(source)
+        else:
+            minified = minify_js(source)
+        content = minified.encode("utf-8")
+        assets[ref] = content_hash_name(ref, content)
+        with open(os.path.join(out_dir, assets[ref]), "wb") as f:
+            f.write(content)
+        report["files"][ref] = {"output": assets[ref], "before": _sizes(raw),
+                                "after": _sizes(content)}
+
+    critical = critical_css(stylesheet_text, html)
+    optimised = optimise_html(html, assets, critical)
+    if _sizes(optimised.encode("utf-8"))["gzip"] > INITIAL_WINDOW_BYTES:
+        # Past the first round trip the inlined CSS costs more than the request it saves
+        critical = ""
+        optimised = optimise_html(html, assets, critical)
+    if card_images:
+        from image_pipeline import build_card_images
+
+        optimised, report["images"] = build_card_images(optimised, out_dir)
+    with open(os.path.join(out_dir, page), "w", encoding="utf-8", newline="\n") as f:
+        f.write(optimised)
+    report["files"][page] = {"output": page, "before": _sizes(raw_html),
+                             "after": _sizes(optimised.encode("utf-8"))}
+    report["critical_css_bytes"] = len(critical.encode("utf-8"))
+    report["after"] = count_requests(optimised)
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"assets": assets, "report": report}, f, indent=2)
+    return report
+
+
+def print_report(report):
+    print(f"{'File':<20} {'Output':<32} {'Raw':>17} {'Gzip':>15}")
+    totals = {"before": 0, "after": 0, "gzip_before": 0, "gzip_after": 0}
+    for name, entry in report["files"].items():
+        before, after = entry["before"], entry["after"]
+        totals["before"] += before["raw"]
+        totals["after"] += after["raw"]
+        totals["gzip_before"] += before["gzip"]
+        totals["gzip_after"] += after["gzip"]
+        print(f"{name:<20} {entry['output']:<32} {before['raw']:>7} -> {after['raw']:>6} "
+              f"{before['gzip']:>6} -> {after['gzip']:>5}")
+    print(f"{'Total':<53} {totals['before']:>7} -> {totals['after']:>6} "
+          f"{totals['gzip_before']:>6} -> {totals['gzip_after']:>5}")
+    saved = 1 - totals["after"] / totals["before"] if totals["before"] else 0.0
+    print(f"📉 {saved:.0%} fewer raw bytes")
+    page = report["files"].get(INDEX)
+    if report["critical_css_bytes"] and page:
+        grown = page["after"]["gzip"] - page["before"]["gzip"]
+        print(f"🎨 {report['critical_css_bytes']} B of critical CSS inlined: the page is {grown:+} B gzipped, "
+              f"{page['after']['gzip']} B of the {INITIAL_WINDOW_BYTES} B first round trip, "
+              f"so the stylesheets can load without blocking the first paint")
+    elif page:
+        print(f"🎨 Critical CSS not inlined: the page would not fit the {INITIAL_WINDOW_BYTES} B first round trip")
+    if report.get("images"):
+        placeholder = sum(sizes["placeholder"] for sizes in report["images"].values())
+        local = sum(sizes["1x"] for sizes in report["images"].values())
+        print(f"🖼️  {len(report['images'])} card images made local and lazy: "
+              f"{placeholder} B of placeholder PNGs -> {local} B at 1x")
+    print(f"🚧 Render-blocking requests: {report['before']['render_blocking']} -> "
+          f"{report['after']['render_blocking']} ({report['before']['requests']} -> "
+          f"{report['after']['requests']} requests in total; deferring changes when they load, not how many)")
+
+
+async def verify(out_dir=DIST_DIR):
+    """Run the full Playwright report against the built site."""
+    from browser_session import BrowserSession
+    from final_test_report import generate_final_report
+
+    with StaticServer(root=out_dir) as server:
+        async with BrowserSession(base_url=server.url) as session:
+            # The session targets an external server, so name the root its budgets measure
+            return await generate_final_report(session, root=out_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=DIST_DIR)
+    parser.add_argument("--verify", action="store_true",
+                        help="run final_test_report.py against the built site afterwards")
+    parser.add_argument("--card-images", action="store_true",
+                        help="serve the roster card images locally with srcset and lazy loading")
+    args = parser.parse_args()
+    try:
+        report = build(out_dir=args.out, card_images=args.card_images)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    print_report(report)
+    print(f"📦 Wrote {args.out}")
+    if args.verify:
+        raise SystemExit(0 if asyncio.run(verify(args.out)) else 1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Typed check results streamed as JSON Lines and JUnit XML while a suite runs
+"""
+
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from xml.sax.saxutils import escape, quoteattr
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+SKIPPED = "skipped"
+
+
+@dataclass(slots=True)
+class CheckResult:
+    name: str
+    group: str = ""
+    status: str = PASSED
+    duration: float = 0.0
+    measured: dict = field(default_factory=dict)
+    expected: dict = field(default_factory=dict)
+    message: str = ""
+
+    @property
+    def icon(self):
+        return {PASSED: "✅", SKIPPED: "⏭️"}.get(self.status, "❌")
+
+    def expect(self, key, measured, expected):
+        """Record a measured value next to its expectation; a mismatch fails the check."""
+        self.measured[key] = measured
+        self.expected[key] = expected
+        if measured != expected and self.status == PASSED:
+            self.status = FAILED
+            self.message = f"{key}: expected {expected!r}, got {measured!r}"
+        return measured == expected
+
+    def expect_max(self, key, measured, limit):
+        """Record a measured value against an upper bound; exceeding it fails the check."""
+        self.measured[key] = measured
+        self.expected[key] = {"max": limit}
+        ok = measured is not None and measured <= limit
+        if not ok and self.status == PASSED:
+            self.status = FAILED
+            self.message = f"{key}: {measured!r} exceeds limit {limit!r}"
+        return ok
+
+    def measure(self, key, value):
+        """Record a measured value that has no expectation attached."""
+        self.measured[key] = value
+        return value
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class ResultStream:
+    """Write every finished check straight to the JSON Lines and JUnit XML outputs."""
+
+    def __init__(self, jsonl_path=None, junit_path=None, suite="smash-website"):
+        self.suite = suite
+        self.counts = Counter()
+        self.failures = []
+        self._jsonl = open(jsonl_path, "w", encoding="utf-8") if jsonl_path else None
+        self._junit = open(junit_path, "w", encoding="utf-8") if junit_path else None
+        if self._junit:
+            timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+            self._junit.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            self._junit.write(f"<testsuite name={quoteattr(suite)} timestamp={quoteattr(timestamp)}>\n")
+            self._junit.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    def add(self, result):
+        self.counts[result.status] += 1
+        if result.status in (FAILED, ERROR):
+            self.failures.append(result)
+        if self._jsonl:
+            self._jsonl.write(json.dumps(result.to_dict(), ensure_ascii=False, default=str) + "\n")
+            self._jsonl.flush()
+        if self._junit:
+            self._junit.write(_junit_testcase(result))
+            self._junit.flush()
+        return result
+
+    @contextmanager
+    def check(self, name, group="", **expected):
+        """Time a block as one check; an exception inside it is recorded as an error."""
+        result = CheckResult(name=name, group=group, expected=dict(expected))
+        started = time.perf_counter()
+        try:
+            yield result
+        except Exception as e:
+            result.status = ERROR
+            result.message = str(e)
+            print(f"❌ {name}: {result.message}")
+        finally:
+            result.duration = time.perf_counter() - started
+            self.add(result)
+
+    def close(self):
+        if self._jsonl:
+            self._jsonl.close()
+            self._jsonl = None
+        if self._junit:
+            self._junit.write("</testsuite>\n")
+            self._junit.close()
+            self._junit = None
+
+    def summary(self):
+        total = sum(self.counts.values())
+        return (f"{total} checks: {self.counts[PASSED]} passed, {self.counts[FAILED]} failed, "
+                f"{self.counts[ERROR]} errors, {self.counts[SKIPPED]} skipped")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of `values` (0 for an empty sample)."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _junit_testcase(result):
+    attrs = (f"classname={quoteattr(result.group or 'checks')} name={quoteattr(result.name)} "
+             f"time={quoteattr(f'{result.duration:.6f}')}")
+    body = ""
+    if result.status == FAILED:
+        body += f"<failure message={quoteattr(result.message)}/>"
+    elif result.status == ERROR:
+        body += f"<error message={quoteattr(result.message)}/>"
+    elif result.status == SKIPPED:
+        body += f"<skipped message={quoteattr(result.message)}/>"
+    values = json.dumps({"measured": result.measured, "expected": result.expected},
+                        ensure_ascii=False, default=str)
+    body += f"<system-out>{escape(values)}</system-out>"
+    return f"  <testcase {attrs}>{body}</testcase>\n"
@@ -0,0 +1,5 @@
+"""
+Loads the website checks pytest plugin for the test modules in this directory
+"""
+
+pytest_plugins = ["smash_plugin"]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+One-round-trip DOM snapshots: collect every character card in a single evaluate
+"""
+
+PLACEHOLDER_HOST = "via.placeholder.com"
+CARD_STYLES = ["display", "visibility", "opacity", "transform", "backgroundColor"]
+
+_SNAPSHOT_JS = """
+(styles) => {
+    const pick = (el) => {
+        const computed = getComputedStyle(el);
+        return Object.fromEntries(styles.map(name => [name, computed[name]]));
+    };
+    const box = (el) => {
+        const rect = el.getBoundingClientRect();
+        return {x: rect.x, y: rect.y, width: rect.width, height: rect.height};
+    };
+    const hero = document.querySelector('.hero');
+    return {
+        title: document.title,
+        navLinks: Array.from(document.querySelectorAll('.nav-menu a'), a => a.getAttribute('href')),
+        hero: hero ? {box: box(hero), style: pick(hero)} : null,
+        cards: Array.from(document.querySelectorAll('.character-card'), card => {
+            const img = card.querySelector('img');
+            const h3 = card.querySelector('h3');
+            return {
+                character: card.dataset.character || null,
+                src: img ? img.getAttribute('src') : null,
+                alt: img ? img.getAttribute('alt') : null,
+                name: h3 ? h3.textContent.trim() : null,
+                box: box(card),
+                style: pick(card),
+            };
+        }),
+    };
+}
+"""
+
+
+_MODAL_JS = """
+() => {
+    const modal = document.getElementById('movesModal');
+    const title = document.getElementById('modalCharacterName');
+    const texts = (selector) => Array.from(modal.querySelectorAll(selector), li => li.textContent);
+    return {
+        display: getComputedStyle(modal).display,
+        title: title ? title.textContent : null,
+        moves: texts('.moves-list li'),
+        combos: texts('.combos-list li'),
+    };
+}
+"""
+
+
+class PageSnapshot:
+    """In-memory copy of the page state the checks read, taken in one evaluate."""
+
+    def __init__(self, data):
+        self.title = data["title"]
+        self.nav_links = data["navLinks"]
+        self.hero = data["hero"]
+        self.cards = data["cards"]
+        self.by_character = {card["character"]: card for card in self.cards if card["character"]}
+
+    def card(self, character):
+        return self.by_character.get(character)
+
+    def placeholder_images(self):
+        return [card for card in self.cards if card["src"] and PLACEHOLDER_HOST in card["src"]]
+
+
+async def snapshot_page(page, styles=CARD_STYLES):
+    """Collect title, nav links, hero and all card data in a single CDP round-trip."""
+    return PageSnapshot(await page.evaluate(_SNAPSHOT_JS, styles))
+
+
+async def snapshot_modal(page):
+    """Collect the moves modal's display state, title, moves and combos at once."""
+    return await page.evaluate(_MODAL_JS)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Shared asset fetch layer: pooled session, concurrent async variant and ETag/Last-Modified cache
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache")
+POOL_SIZE = 8
+TIMEOUT = 10
+# The in-process StaticServer binds a fresh port every run, so its origin is not part of the key
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+@dataclass(slots=True)
+class FetchResult:
+    url: str
+    status: int
+    content: bytes
+    from_cache: bool
+    wire_bytes: int
+    ttfb_ms: float
+    total_ms: float
+    content_type: str = ""
+
+    @property
+    def ok(self):
+        return self.status in (200, 304)
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", "replace")
+
+
+class HttpCache:
+    """On-disk validator cache: one JSON entry and one body file per URL."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(url):
+        """`url` itself, or just its path and query when it points at a local server."""
+        parts = urlsplit(url)
+        if parts.hostname in LOCAL_HOSTS:
+            return urlunsplit(("", "", parts.path, parts.query, ""))
+        return url
+
+    def _paths(self, url):
+        key = os.path.join(self.cache_dir, hashlib.sha1(self.key(url).encode()).hexdigest())
+        return key + ".json", key + ".body"
+
+    def validators(self, url):
+        """Conditional request headers for `url`, empty when nothing is cached."""
+        meta_path, _ = self._paths(url)
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url):
+        meta_path, body_path = self._paths(url)
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            return f.read(), meta.get("content_type", "")
+
+    def store(self, url, headers, content):
+        if not (headers.get("etag") or headers.get("last-modified")):
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        with open(body_path, "wb") as f:
+            f.write(content)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": headers.get("etag"),
+                       "last_modified": headers.get("last-modified"),
+                       "content_type": headers.get("content-type", "")}, f)
+
+    def result(self, url, response_status, headers, content, wire_bytes, ttfb, total):
+        """Build a FetchResult, serving the cached body on 304 and caching fresh 200s."""
+        if response_status == 304:
+            content, content_type = self.load(url)
+            return FetchResult(url, 304, content, True, wire_bytes, ttfb, total, content_type)
+        if response_status == 200:
+            self.store(url, headers, content)
+        return FetchResult(url, response_status, content, False, wire_bytes, ttfb, total,
+                           headers.get("content-type", ""))
+
+
+class AssetFetcher:
+    """Blocking fetcher over one pooled, keep-alive requests.Session."""
+
+    def __init__(self, cache=None):
+        self.cache = cache or HttpCache()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url):
+        started = time.perf_counter()
+        with self.session.get(url, headers=self.cache.validators(url), stream=True, timeout=TIMEOUT) as response:
+            ttfb = (time.perf_counter() - started) * 1000
+            content = response.content
+            wire_bytes = response.raw.tell()
+        total = (time.perf_counter() - started) * 1000
+        return self.cache.result(url, response.status_code, response.headers, content, wire_bytes, ttfb, total)
+
+    def fetch_all(self, urls):
+        return [self.get(url) for url in urls]
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncAssetFetcher:
+    """httpx-based fetcher that downloads every asset concurrently over one client."""
+
+    def __init__(self, cache=None):
+        if httpx is None:
+            raise RuntimeError("httpx is not installed")
+        self.cache = cache or HttpCache()
+        self.client = httpx.AsyncClient(timeout=TIMEOUT,
+                                        limits=httpx.Limits(max_connections=POOL_SIZE))
+
+    async def get(self, url):
+        started = time.perf_counter()
+        async with self.client.stream("GET", url, headers=self.cache.validators(url)) as response:
+            ttfb = (time.perf_counter() - started) * 1000
+            content = await response.aread()
+            wire_bytes = response.num_bytes_downloaded
+        total = (time.perf_counter() - started) * 1000
+        return self.cache.result(url, response.status_code, response.headers, content, wire_bytes, ttfb, total)
+
+    async def fetch_all(self, urls):
+        return await asyncio.gather(*(self.get(url) for url in urls))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+async def afetch_assets(urls, cache=None):
+    """Fetch `urls` concurrently, falling back to the pooled session in a thread."""
+    if httpx is None:
+        return await asyncio.to_thread(fetch_assets, urls, cache, False)
+    fetcher = AsyncAssetFetcher(cache)
+    try:
+        return await fetcher.fetch_all(urls)
+    finally:
+        await fetcher.close()
+
+
+def fetch_assets(urls, cache=None, concurrent=True):
+    """Fetch `urls` from a blocking context, concurrently when httpx is available."""
+    if concurrent and httpx is not None:
+        return asyncio.run(afetch_assets(urls, cache))
+    fetcher = AssetFetcher(cache)
+    try:
+        return fetcher.fetch_all(urls)
+    finally:
+        fetcher.close()
+
+
+def print_transfers(results):
+    print(f"\n📦 Transfer report ({sum(r.from_cache for r in results)}/{len(results)} served as 304):")
+    for result in results:
+        source = "304 cache" if result.from_cache else str(result.status)
+        print(f"   {result.url.rsplit('/', 1)[-1]:<20} {source:>9}  {result.wire_bytes:>7} B on the wire, "
+              f"{len(result.content):>7} B body, TTFB {result.ttfb_ms:6.1f}ms, total {result.total_ms:6.1f}ms")
@@ -3,220 +3,244 @@
 Final comprehensive test report for Super Smash Bros Infinity v0.7.0 website
 """
 
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
-import requests
-from bs4 import BeautifulSoup
+import sys
+from browser_session import BrowserSession, PAGE_URL, REVIEW_CHARACTERS, print_timing, run_modal_checks
+from budget_gate import asset_sizes, budget_checks, evaluate_budgets, load_budgets, print_budget_table
+from check_results import CheckResult, ERROR, ResultStream
+from dom_snapshot import snapshot_page
+from fetch_client import afetch_assets
+from offline_routes import print_intercepts
+from page_metrics import measure_viewports, print_metrics
+from page_waits import wait_for_modal_hidden, wait_for_transition_end
+from responsive_sweep import device_matrix, run_sweep
+from static_analyzer import analyze_html
+from static_server import SITE_ROOT
+from visual_regression import capture, check_capture, print_diff
 
-async def generate_final_report():
+CAPTURE_SETTLE_TIMEOUT = 5000
+
+async def generate_final_report(session=None, results=None, root=None):
+    """Run every check on `session`; `root` is the site on disk the size budgets measure."""
     print("🎮 FINAL TEST REPORT: Super Smash Bros Infinity v0.7.0 Website")
     print("=" * 80)
-    
-    # Test results summary
-    test_results = {
-        "visual_tests": [],
-        "modal_tests": [],
-        "functionality_tests": [],
-        "responsive_tests": [],
-        "issues_found": []
-    }
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
+
+    # Every check is streamed to the structured outputs as soon as it finishes
+    if results is None:
+        results = ResultStream()
+
+    own_session = session is None
+    if own_session:
+        session = await BrowserSession().start()
+    page_url = session.url(PAGE_URL)
+
+    async with session.page(url=None) as page:
         try:
             # Set desktop viewport
             await page.set_viewport_size({"width": 1920, "height": 1080})
-            await page.goto("http://localhost:8081/game-website.html")
+            await page.goto(PAGE_URL)
             await page.wait_for_load_state("networkidle")
-            
+
             print("\n📋 VISUAL TESTING RESULTS:")
             print("-" * 40)
-            
+
+            # Collect every card, the hero and the nav in one round-trip
+            snapshot = await snapshot_page(page)
+
             # Test 1: Character cards display
-            character_cards = await page.query_selector_all(".character-card")
-            test_results["visual_tests"].append(f"✅ Found {len(character_cards)} character cards (Expected: 19)")
-            print(f"✅ Character Cards: {len(character_cards)}/19 found")
-            
+            character_cards = snapshot.cards
+            with results.check("character_cards", "visual_tests") as check:
+                check.expect("count", len(character_cards), 19)
+                print(f"{check.icon} Character Cards: {len(character_cards)}/19 found")
+
             # Test 2: Placeholder images
-            images = await page.query_selector_all(".character-card img")
-            placeholder_count = 0
-            for img in images:
-                src = await img.get_attribute("src")
-                if src and "via.placeholder.com" in src:
-                    placeholder_count += 1
-            
-            test_results["visual_tests"].append(f"✅ Found {placeholder_count} placeholder images (Expected: 18)")
-            print(f"✅ Placeholder Images: {placeholder_count}/18 found")
-            
+            with results.check("placeholder_images", "visual_tests") as check:
+                placeholder_count = len(snapshot.placeholder_images())
+                check.expect("count", placeholder_count, 18)
+                print(f"{check.icon} Placeholder Images: {placeholder_count}/18 found")
+
             # Test 3: CSS styling verification
-            hero_section = await page.query_selector(".hero")
-            if hero_section:
-                bg_color = await hero_section.evaluate("el => getComputedStyle(el).backgroundColor")
-                test_results["visual_tests"].append("✅ Hero section has proper styling")
-                print("✅ Hero section styling: Applied correctly")
-            
+            with results.check("hero_styling", "visual_tests") as check:
+                check.expect("present", snapshot.hero is not None, True)
+                if snapshot.hero:
+                    check.measure("background_color", snapshot.hero["style"]["backgroundColor"])
+                print(f"{check.icon} Hero section styling: {'Applied correctly' if snapshot.hero else 'Missing'}")
+
             print("\n🎯 MODAL FUNCTIONALITY RESULTS:")
             print("-" * 40)
-            
-            # Test specific characters from review
-            review_characters = ['kirby', 'naruto', 'goku', 'pikachu', 'link', 'megaman', 
-                               'scratch-cat', 'impostor', 'ness', 'hat-kid', 'sora', 'reimu']
-            
-            working_modals = 0
-            for char in review_characters:
-                char_card = await page.query_selector(f'[data-character="{char}"]')
-                if char_card:
-                    await char_card.click()
-                    try:
-                        await page.wait_for_selector("#movesModal", state="visible", timeout=1000)
-                        working_modals += 1
-                        # Close modal
-                        close_btn = await page.query_selector(".close")
-                        if close_btn:
-                            await close_btn.click()
-                            await page.wait_for_timeout(200)
-                    except:
-                        pass
-            
-            test_results["modal_tests"].append(f"✅ {working_modals}/{len(review_characters)} character modals working")
-            print(f"✅ Character Modals: {working_modals}/{len(review_characters)} working correctly")
-            
+
+            # Test specific characters from review, spread across the context pool
+            modal_results, timing = await run_modal_checks(session, REVIEW_CHARACTERS)
+            for modal in modal_results:
+                result = CheckResult(name=f"modal_{modal['character']}", group="modal_tests",
+                                     duration=modal["duration"])
+                result.expect("opened", modal["opened"], True)
+                result.measure("title", modal["title"])
+                result.measure("moves", modal["moves"])
+                result.measure("combos", modal["combos"])
+                if modal["error"]:
+                    result.status = ERROR
+                    result.message = modal["error"]
+                results.add(result)
+
+            working_modals = sum(1 for modal in modal_results if modal["opened"])
+            icon = "✅" if working_modals == len(REVIEW_CHARACTERS) else "❌"
+            print(f"{icon} Character Modals: {working_modals}/{len(REVIEW_CHARACTERS)} working correctly")
+            print_timing(timing)
+
             # Test modal close methods
             mario_card = await page.query_selector('[data-character="mario"]')
             if mario_card:
                 # Test X button close
-                await mario_card.click()
-                await page.wait_for_selector("#movesModal", state="visible", timeout=1000)
-                close_btn = await page.query_selector(".close")
-                await close_btn.click()
-                await page.wait_for_timeout(300)
-                test_results["modal_tests"].append("✅ X button close functionality working")
-                print("✅ X Button Close: Working")
-                
+                with results.check("close_x_button", "modal_tests"):
+                    await mario_card.click()
+                    await page.wait_for_selector("#movesModal", state="visible", timeout=1000)
+                    close_btn = await page.query_selector(".close")
+                    await close_btn.click()
+                    await wait_for_modal_hidden(page)
+                    print("✅ X Button Close: Working")
+
                 # Test ESC key close
-                await mario_card.click()
-                await page.wait_for_selector("#movesModal", state="visible", timeout=1000)
-                await page.keyboard.press("Escape")
-                await page.wait_for_timeout(300)
-                test_results["modal_tests"].append("✅ ESC key close functionality working")
-                print("✅ ESC Key Close: Working")
-                
+                with results.check("close_escape_key", "modal_tests"):
+                    await mario_card.click()
+                    await page.wait_for_selector("#movesModal", state="visible", timeout=1000)
+                    await page.keyboard.press("Escape")
+                    await wait_for_modal_hidden(page)
+                    print("✅ ESC Key Close: Working")
+
                 # Test click outside close
-                await mario_card.click()
-                await page.wait_for_selector("#movesModal", state="visible", timeout=1000)
-                await page.click("#movesModal", position={"x": 10, "y": 10})
-                await page.wait_for_timeout(300)
-                test_results["modal_tests"].append("✅ Click outside close functionality working")
-                print("✅ Click Outside Close: Working")
-            
+                with results.check("close_click_outside", "modal_tests"):
+                    await mario_card.click()
+                    await page.wait_for_selector("#movesModal", state="visible", timeout=1000)
+                    await page.click("#movesModal", position={"x": 10, "y": 10})
+                    await wait_for_modal_hidden(page)
+                    print("✅ Click Outside Close: Working")
+
             print("\n🎮 FUNCTIONALITY TESTING RESULTS:")
             print("-" * 40)
-            
+
             # Test navigation
-            nav_links = await page.query_selector_all(".nav-menu a")
-            test_results["functionality_tests"].append(f"✅ Navigation menu has {len(nav_links)} links")
-            print(f"✅ Navigation Links: {len(nav_links)} found")
-            
+            with results.check("navigation_links", "functionality_tests") as check:
+                nav_links = check.measure("count", len(snapshot.nav_links))
+                print(f"✅ Navigation Links: {nav_links} found")
+
             # Test hover effects
-            first_card = character_cards[0] if character_cards else None
+            first_card = await page.query_selector(".character-card") if character_cards else None
             if first_card:
-                await first_card.hover()
-                await page.wait_for_timeout(500)
-                test_results["functionality_tests"].append("✅ Hover effects working on character cards")
-                print("✅ Hover Effects: Working correctly")
-            
+                with results.check("card_hover", "functionality_tests") as check:
+                    await first_card.hover()
+                    await wait_for_transition_end(first_card)
+                    check.measure("transform", await first_card.evaluate("el => el.style.transform"))
+                    print("✅ Hover Effects: Working correctly")
+
             print("\n📱 RESPONSIVE DESIGN RESULTS:")
             print("-" * 40)
-            
-            # Test mobile responsiveness
-            await page.set_viewport_size({"width": 390, "height": 844})
-            await page.wait_for_timeout(1000)
-            
-            hamburger = await page.query_selector(".hamburger")
-            if hamburger:
-                is_visible = await hamburger.is_visible()
-                test_results["responsive_tests"].append(f"✅ Hamburger menu visible on mobile: {is_visible}")
-                print(f"✅ Mobile Hamburger Menu: {'Visible' if is_visible else 'Hidden'}")
-            
-            # Test tablet responsiveness
-            await page.set_viewport_size({"width": 768, "height": 1024})
-            await page.wait_for_timeout(1000)
-            
-            # Check character grid layout
-            roster_grid = await page.query_selector(".roster-grid")
-            if roster_grid:
-                test_results["responsive_tests"].append("✅ Character grid adapts to tablet size")
-                print("✅ Tablet Layout: Character grid responsive")
-            
-            print("\n🔍 DETAILED ANALYSIS:")
+
+            # Every device profile gets its own frozen context, swept concurrently, so
+            # none waits out the real loading-screen timer
+            await run_sweep(session, device_matrix(), results, freeze=True)
+
+            # Full-page captures are diffed against the stored baselines
+            print("\n📸 VISUAL REGRESSION:")
+            print("-" * 40)
+            for name, size in (("final_desktop_test", {"width": 1920, "height": 1080}),
+                               ("final_mobile_test", {"width": 390, "height": 844})):
+                # Always on a frozen context: live timers (the section-title glitch, the
+                # particles) would make every capture differ from its baseline
+                async with session.isolated_context(freeze=True, viewport=size) as context:
+                    capture_page = await context.new_page()
+                    await capture_page.goto(PAGE_URL)
+                    await capture_page.wait_for_selector(".loading-screen", state="detached",
+                                                         timeout=CAPTURE_SETTLE_TIMEOUT)
+                    png, regions = await capture(capture_page, name)
+                check, diff = check_capture(name, png, regions)
+                results.add(check)
+                if diff:
+                    print_diff(diff)
+                else:
+                    print(f"📸 {name}: {check.message}")
+
+            print("\n⚡ PERFORMANCE METRICS:")
             print("-" * 40)
-            
-            # Check specific requirements from review
-            print("Review Requirements Check:")
-            print("1. ✅ All 18 character cards display with placeholder images")
-            print("2. ✅ Complete movesets for all characters (Kirby, Naruto, Goku, etc.)")
-            print("3. ✅ Modal functionality (open, close with X, ESC, click outside)")
-            print("4. ✅ Hover effects on character cards working")
-            print("5. ✅ Responsive design working on mobile and tablet")
-            
-            # Take final screenshots
-            await page.set_viewport_size({"width": 1920, "height": 1080})
-            await page.screenshot(path="/app/final_desktop_test.png", full_page=True)
-            
-            await page.set_viewport_size({"width": 390, "height": 844})
-            await page.screenshot(path="/app/final_mobile_test.png", full_page=True)
-            
-            print("\n📸 Screenshots saved:")
-            print("   - final_desktop_test.png (Desktop view)")
-            print("   - final_mobile_test.png (Mobile view)")
-            
+
+            # Desktop and mobile loads are measured one at a time, each on a fresh context
+            viewport_metrics, durations = await measure_viewports(session)
+            for name, metrics in viewport_metrics.items():
+                results.add(CheckResult(name=f"metrics_{name}", group="performance_metrics",
+                                        duration=durations[name], measured=metrics))
+                print_metrics(name.title(), metrics)
+
+            print("\n💰 PERFORMANCE BUDGETS:")
+            print("-" * 40)
+
+            # Asset bytes, request count, DOM size and web vitals against budgets.json
+            if root is None:
+                root = session.server.root if session.server else SITE_ROOT
+            budget_rows = evaluate_budgets(load_budgets(), asset_sizes(root), viewport_metrics)
+            for check in budget_checks(budget_rows):
+                results.add(check)
+            print_budget_table(budget_rows)
+
+            if session.router:
+                print()
+                print_intercepts(session.router)
+
         except Exception as e:
-            test_results["issues_found"].append(f"❌ Error during testing: {str(e)}")
+            results.add(CheckResult(name="browser_run", group="issues_found", status=ERROR, message=str(e)))
             print(f"❌ Error during testing: {str(e)}")
-        
-        finally:
-            await browser.close()
-    
+
     # Additional static analysis
     print("\n🔧 STATIC ANALYSIS RESULTS:")
     print("-" * 40)
-    
-    try:
-        response = requests.get("http://localhost:8081/game-website.html")
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
+
+    with results.check("static_analysis", "static_tests") as check:
+        response, = await afetch_assets([page_url])
+        report = analyze_html(response.content)
+        check.measure("backend", report["backend"])
+
         # Check HTML structure
-        sections = soup.find_all('section')
-        print(f"✅ HTML Structure: {len(sections)} main sections found")
-        
+        sections = check.measure("sections", report["sections"])
+        print(f"✅ HTML Structure: {sections} main sections found")
+
         # Check external resources
-        external_links = soup.find_all('link', href=True)
-        external_scripts = soup.find_all('script', src=True)
-        print(f"✅ External Resources: {len(external_links)} CSS, {len(external_scripts)} JS files")
-        
+        external_links = check.measure("links", report["stylesheets"])
+        external_scripts = check.measure("scripts", report["scripts"])
+        print(f"✅ External Resources: {external_links} CSS, {external_scripts} JS files")
+
         # Check accessibility
-        images_with_alt = soup.find_all('img', alt=True)
-        total_images = soup.find_all('img')
-        print(f"✅ Accessibility: {len(images_with_alt)}/{len(total_images)} images have alt text")
-        
-    except Exception as e:
-        print(f"❌ Static analysis error: {str(e)}")
-    
+        images_with_alt = report["images_with_alt"]
+        total_images = report["images"]
+        check.expect("images_with_alt", images_with_alt, total_images)
+        print(f"{check.icon} Accessibility: {images_with_alt}/{total_images} images have alt text")
+
+    if own_session:
+        await session.close()
+
     print("\n" + "=" * 80)
-    print("🎮 FINAL VERDICT: WEBSITE TESTING COMPLETED SUCCESSFULLY!")
-    print("=" * 80)
-    print("\n✅ ALL MAJOR REQUIREMENTS MET:")
-    print("   • Visual display of character cards with placeholder images")
-    print("   • Complete moveset modals for all characters")
-    print("   • Modal functionality (open/close methods)")
-    print("   • Hover effects and animations")
-    print("   • Responsive design for mobile/tablet")
-    print("   • No critical JavaScript errors")
-    print("   • Proper HTML structure and styling")
-    
-    print("\n🎯 READY FOR PRODUCTION!")
+    print(f"📊 {results.summary()}")
+    if results.ok:
+        print("🎮 FINAL VERDICT: WEBSITE TESTING COMPLETED SUCCESSFULLY!")
+        print("=" * 80)
+        print("\n🎯 READY FOR PRODUCTION!")
+    else:
+        print(f"🎮 FINAL VERDICT: {len(results.failures)} CHECK(S) FAILED")
+        print("=" * 80)
+        for failure in results.failures:
+            print(f"   ❌ {failure.group}/{failure.name}: {failure.message}")
+
+    return results.ok
+
+async def main(args):
+    with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+        async with BrowserSession(freeze=args.freeze) as session:
+            return await generate_final_report(session, results)
 
 if __name__ == "__main__":
-    asyncio.run(generate_final_report())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jsonl", help="stream check results as JSON Lines to this path")
+    parser.add_argument("--junit", help="stream check results as JUnit XML to this path")
+    parser.add_argument("--freeze", action="store_true",
+                        help="freeze animations, timers and Math.random on every page "
+                             "(the responsive sweep and visual regression captures are always frozen)")
+    sys.exit(0 if asyncio.run(main(parser.parse_args())) else 1)
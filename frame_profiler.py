@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Frame-rate and main-thread profiler for the hero particles and scroll handlers
+"""
+
+import argparse
+import asyncio
+import json
+from collections import Counter, defaultdict
+from browser_session import BrowserSession, PAGE_URL
+from check_results import CheckResult, ERROR, PASSED, percentile
+from page_metrics import SETTLE_TIMEOUT, VIEWPORTS
+
+FRAME_BUDGET_MS = 1000 / 60
+HISTOGRAM_BUCKETS = [8.4, 16.7, 33.4, 50.0, 100.0]
+TRACE_CATEGORIES = ["devtools.timeline", "disabled-by-default-devtools.timeline", "toplevel", "v8.execute"]
+MAIN_THREAD = "CrRendererMain"
+
+# Scrolls the document top-to-bottom (then back on odd passes) by `step`
+# pixels per frame, recording the delta between requestAnimationFrame
+# timestamps. Every scrollBy fires the page's scroll listener.
+_SCROLL_SAMPLER_JS = """
+async ([step, passes]) => {
+    const deltas = [];
+    let last = await new Promise(resolve => requestAnimationFrame(resolve));
+    const frame = () => new Promise(resolve => requestAnimationFrame(now => {
+        deltas.push(now - last);
+        last = now;
+        resolve();
+    }));
+    const distance = document.documentElement.scrollHeight - innerHeight;
+    for (let pass = 0; pass < passes; pass++) {
+        const direction = pass % 2 === 0 ? 1 : -1;
+        for (let scrolled = 0; scrolled < distance; scrolled += step) {
+            window.scrollBy(0, direction * step);
+            await frame();
+        }
+    }
+    return deltas;
+}
+"""
+
+
+def frame_histogram(deltas):
+    """Count frame times (ms) into the HISTOGRAM_BUCKETS upper bounds, in bucket order."""
+    labels = [f"<={limit:g}ms" for limit in HISTOGRAM_BUCKETS] + [f">{HISTOGRAM_BUCKETS[-1]:g}ms"]
+    histogram = dict.fromkeys(labels, 0)
+    for delta in deltas:
+        index = next((i for i, limit in enumerate(HISTOGRAM_BUCKETS) if delta <= limit), len(HISTOGRAM_BUCKETS))
+        histogram[labels[index]] += 1
+    return histogram
+
+
+def _event_label(event):
+    data = event.get("args", {}).get("data", {}) or {}
+    detail = data.get("functionName") or data.get("type") or ""
+    return f"{event['name']}:{detail}" if detail else event["name"]
+
+
+def main_thread_costs(trace_events, top=10):
+    """Aggregate self and total time (ms) per event on the renderer main thread."""
+    threads = {(e["pid"], e["tid"]) for e in trace_events
+               if e.get("ph") == "M" and e.get("name") == "thread_name"
+               and e.get("args", {}).get("name") == MAIN_THREAD}
+    by_thread = defaultdict(list)
+    for event in trace_events:
+        if event.get("ph") == "X" and "dur" in event and (event["pid"], event["tid"]) in threads:
+            by_thread[(event["pid"], event["tid"])].append(event)
+
+    self_time = Counter()
+    total_time = Counter()
+    for events in by_thread.values():
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        stack = []  # [end, label, duration, children]
+
+        def pop():
+            _, label, duration, children = stack.pop()
+            self_time[label] += duration - children
+            if stack:
+                stack[-1][3] += duration
+
+        for event in events:
+            while stack and stack[-1][0] <= event["ts"]:
+                pop()
+            label = _event_label(event)
+            total_time[label] += event["dur"]
+            stack.append([event["ts"] + event["dur"], label, event["dur"], 0])
+        while stack:
+            pop()
+
+    return [{"event": label, "self_ms": self_us / 1000, "total_ms": total_time[label] / 1000}
+            for label, self_us in self_time.most_common(top)]
+
+
+def summarize_frames(deltas):
+    janky = [delta for delta in deltas if delta > FRAME_BUDGET_MS * 1.5]
+    elapsed = sum(deltas)
+    return {
+        "frames": len(deltas),
+        "fps": len(deltas) / elapsed * 1000 if elapsed else 0.0,
+        "p50_ms": percentile(deltas, 50),
+        "p95_ms": percentile(deltas, 95),
+        "p99_ms": percentile(deltas, 99),
+        "max_ms": max(deltas, default=0.0),
+        "janky_frames": len(janky),
+        "jank_ratio": len(janky) / len(deltas) if deltas else 0.0,
+        "histogram": frame_histogram(deltas),
+    }
+
+
+async def profile_scroll(session, viewport=VIEWPORTS["desktop"], step=40, passes=2,
+                         url=PAGE_URL, trace_path=None, top=10):
+    """Scroll the page while sampling frames and tracing the main thread."""
+    async with session.page(url=None) as page:
+        await page.set_viewport_size(viewport)
+        await page.goto(url)
+        await page.wait_for_load_state("networkidle")
+        await page.wait_for_selector(".loading-screen", state="detached", timeout=SETTLE_TIMEOUT)
+
+        await session.browser.start_tracing(page=page, categories=TRACE_CATEGORIES)
+        try:
+            deltas = await page.evaluate(_SCROLL_SAMPLER_JS, [step, passes])
+        finally:
+            trace = await session.browser.stop_tracing()
+
+    if trace_path:
+        with open(trace_path, "wb") as f:
+            f.write(trace)
+
+    trace_events = json.loads(trace).get("traceEvents", [])
+    profile = summarize_frames(deltas)
+    profile["top_costs"] = main_thread_costs(trace_events, top)
+    return profile
+
+
+def check_frame_budget(profile, name="scroll_frames", p95_ms=FRAME_BUDGET_MS * 2, jank_ratio=0.05):
+    """Turn a profile into a benchmark assertion on p95 frame time and jank ratio.
+
+    A profile with no frames is an error: its zero percentiles measured nothing.
+    """
+    result = CheckResult(name=name, group="frame_profile")
+    if not profile["frames"]:
+        result.status = ERROR
+        result.message = "no frames were sampled"
+    result.expect_max("p95_ms", profile["p95_ms"], p95_ms)
+    result.expect_max("jank_ratio", profile["jank_ratio"], jank_ratio)
+    for key in ("frames", "fps", "p50_ms", "p99_ms", "max_ms", "histogram", "top_costs"):
+        result.measure(key, profile[key])
+    return result
+
+
+def print_profile(profile):
+    print(f"🎞️  {profile['frames']} frames, {profile['fps']:.1f} fps, "
+          f"p50 {profile['p50_ms']:.1f}ms, p95 {profile['p95_ms']:.1f}ms, "
+          f"p99 {profile['p99_ms']:.1f}ms, {profile['janky_frames']} janky")
+    print("📊 Frame-time histogram:")
+    peak = max(profile["histogram"].values(), default=0) or 1
+    for bucket, count in profile["histogram"].items():
+        print(f"   {bucket:>9} {'█' * round(count / peak * 40)} {count}")
+    print("🔥 Top main-thread costs (self time):")
+    for cost in profile["top_costs"]:
+        print(f"   {cost['self_ms']:8.1f}ms self {cost['total_ms']:8.1f}ms total  {cost['event']}")
+
+
+async def main(args):
+    print("🎮 Scroll profiling for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    async with BrowserSession(workers=1) as session:
+        profile = await profile_scroll(session, VIEWPORTS[args.viewport], args.step,
+                                       args.passes, trace_path=args.trace)
+    print_profile(profile)
+    result = check_frame_budget(profile, p95_ms=args.p95_budget, jank_ratio=args.jank_budget)
+    print(f"{result.icon} Frame budget: {result.message or 'within limits'}")
+    return result.status == PASSED
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--viewport", choices=sorted(VIEWPORTS), default="desktop")
+    parser.add_argument("--step", type=int, default=40, help="pixels scrolled per frame")
+    parser.add_argument("--passes", type=int, default=2, help="down/up scroll passes")
+    parser.add_argument("--trace", help="write the raw Chrome trace to this path")
+    parser.add_argument("--p95-budget", type=float, default=FRAME_BUDGET_MS * 2)
+    parser.add_argument("--jank-budget", type=float, default=0.05)
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
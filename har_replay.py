@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+HAR record and replay: a golden page load served byte-for-byte, optionally over a simulated network
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlparse
+from check_results import percentile
+from static_server import ROOT
+
+HAR_PATH = os.path.join(ROOT, "har", "golden.har")
+# Recordings are rewritten to this origin so replays never depend on the recording server's port
+REPLAY_ORIGIN = "http://smash.replay"
+
+# WebPageTest connectivity presets: round-trip time and link bandwidth in kbit/s
+NETWORK_PROFILES = {
+    "slow-3g": {"rtt_ms": 400, "down_kbps": 400, "up_kbps": 400},
+    "3g": {"rtt_ms": 300, "down_kbps": 1600, "up_kbps": 768},
+    "cable": {"rtt_ms": 28, "down_kbps": 5000, "up_kbps": 1000},
+}
+
+
+class NetworkThrottle:
+    """Delay each request by its round trips plus its share of one simulated link.
+
+    Requests fulfilled from a HAR never touch the browser's network stack, so
+    DevTools network emulation cannot slow them; this route sits in front of
+    the HAR route instead. Every new host costs an extra round trip for the
+    connection, and response bodies queue for the link's download bandwidth,
+    so parallel fetches contend with each other the way they would on a phone.
+    """
+
+    def __init__(self, profile, sizes):
+        self.profile = NETWORK_PROFILES[profile] if isinstance(profile, str) else profile
+        self.sizes = sizes
+        self._hosts = set()
+        self._link_free = 0.0
+        self.delays = []
+
+    def delay(self, url, sent_bytes=0):
+        """Seconds before the response to `url` has fully arrived, reserving the link for it."""
+        rtt = self.profile["rtt_ms"] / 1000
+        host = urlparse(url).netloc
+        round_trips = 1 if host in self._hosts else 2
+        self._hosts.add(host)
+        now = time.monotonic()
+        upload = sent_bytes * 8 / (self.profile["up_kbps"] * 1000)
+        transfer = self.sizes.get(url.split("#")[0], 0) * 8 / (self.profile["down_kbps"] * 1000)
+        start = max(now + round_trips * rtt + upload, self._link_free)
+        self._link_free = start + transfer
+        return self._link_free - now
+
+    async def attach(self, context):
+        # Registered after the HAR route, so it runs first and then falls back to it
+        await context.route("**/*", self.handle)
+
+    async def handle(self, route):
+        request = route.request
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            # Every page load starts cold, so repeated runs measure the same thing
+            self._hosts.clear()
+        delay = self.delay(request.url, len(request.post_data_buffer or b""))
+        self.delays.append((request.url, delay))
+        await asyncio.sleep(delay)
+        await route.fallback()
+
+
+def load_har(path=HAR_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def response_sizes(har):
+    """Bytes on the wire per URL: the encoded body when recorded, else the decoded content."""
+    sizes = {}
+    for entry in har["log"]["entries"]:
+        response = entry["response"]
+        size = response.get("_transferSize", -1)
+        if size is None or size < 0:
+            size = max(response.get("bodySize", -1), 0) + max(response.get("headersSize", -1), 0)
+        if size <= 0:
+            size = response.get("content", {}).get("size", 0)
+        sizes[entry["request"]["url"]] = size
+    return sizes
+
+
+def rebase_har(har, origin, replay_origin=REPLAY_ORIGIN):
+    """Rewrite every URL and header naming the recording server onto the replay origin."""
+    text = json.dumps(har)
+    return json.loads(text.replace(origin.rstrip("/"), replay_origin))
+
+
+async def record_har(path=HAR_PATH, page_url=None):
+    """Load the page once on a fresh context and save every request it made as a HAR."""
+    from browser_session import PAGE_URL, BrowserSession
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    raw_path = path + ".partial"
+    session = await BrowserSession(workers=1, record_har_path=raw_path, record_har_content="embed",
+                                   record_har_mode="full").start()
+    origin = session.base_url
+    try:
+        async with session.page(page_url or PAGE_URL) as page:
+            await page.wait_for_selector(".loading-screen", state="detached", timeout=5000)
+    finally:
+        # The HAR is only written when its context closes
+        await session.close()
+    har = rebase_har(load_har(raw_path), origin)
+    os.remove(raw_path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(har, f, indent=1)
+    return har
+
+
+async def install_replay(context, har_path=HAR_PATH, network=None):
+    """Serve every request from `har_path`; misses fall through to the routes installed before it."""
+    await context.route_from_har(har_path, not_found="fallback")
+    if network is None:
+        return None
+    throttle = NetworkThrottle(network, response_sizes(load_har(har_path)))
+    await throttle.attach(context)
+    return throttle
+
+
+def print_delays(throttles, slowest=3):
+    """Summarise the per-request delays the throttles of one session imposed."""
+    delays = [(url, delay * 1000) for throttle in throttles for url, delay in throttle.delays]
+    if not delays:
+        return
+    values = [delay for _, delay in delays]
+    print(f"🐢 {len(delays)} throttled requests: p50 {percentile(values, 50):.0f}ms, "
+          f"p95 {percentile(values, 95):.0f}ms, max {max(values):.0f}ms")
+    for url, delay in sorted(delays, key=lambda item: item[1], reverse=True)[:slowest]:
+        print(f"   {delay:8.0f}ms  {url.replace(REPLAY_ORIGIN, '')}")
+
+
+async def main(args):
+    from browser_session import BrowserSession
+    from page_metrics import VIEWPORTS, measure_viewports, print_metrics
+
+    print("🎮 HAR replay for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    if args.record or not os.path.exists(args.har):
+        har = await record_har(args.har)
+        entries = har["log"]["entries"]
+        print(f"📼 Recorded {len(entries)} requests, {sum(response_sizes(har).values()):,} bytes "
+              f"to {os.path.relpath(args.har, ROOT)}")
+        if args.record:
+            return True
+
+    viewports = {name: VIEWPORTS[name] for name in args.viewports}
+    for network in args.network or [None]:
+        async with BrowserSession(workers=1, har=args.har, network=network) as session:
+            runs = [(await measure_viewports(session, viewports))[0] for _ in range(args.runs)]
+        label = network or "unthrottled"
+        for name in viewports:
+            metrics = runs[-1][name]
+            lcps = [run[name]["lcp_ms"] for run in runs if run[name].get("lcp_ms") is not None]
+            print_metrics(f"{name.title()} ({label})", metrics)
+            if len(lcps) > 1:
+                print(f"   LCP over {len(lcps)} runs: {min(lcps):.0f}-{max(lcps):.0f}ms")
+        print_delays(session.throttles)
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--har", default=HAR_PATH, help="HAR file to record to or replay from")
+    parser.add_argument("--record", action="store_true", help="record a fresh golden HAR and exit")
+    parser.add_argument("--network", action="append", choices=sorted(NETWORK_PROFILES),
+                        help="simulated network profile; repeat to compare several")
+    parser.add_argument("--viewports", nargs="+", default=["mobile"], choices=["desktop", "mobile"],
+                        help="viewports to measure (default: the 390x844 mobile viewport)")
+    parser.add_argument("--runs", type=int, default=3, help="replayed loads per profile")
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Opt-in harness profiler: spans around every fetch, parse, query, evaluate, wait and screenshot
+as a Chrome trace, plus cProfile and tracemalloc summaries
+"""
+
+import argparse
+import asyncio
+import cProfile
+import functools
+import importlib
+import inspect
+import io
+import json
+import os
+import pstats
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+DETAIL_CHARS = 80
+
+# (module, attribute, category): harness functions and the methods they spend their time in.
+# Methods are patched on the class, functions on their module and on every module that
+# already imported them by name.
+HARNESS_STEPS = [
+    ("fetch_client", "AssetFetcher.get", "fetch"),
+    ("fetch_client", "AsyncAssetFetcher.get", "fetch"),
+    ("static_analyzer", "build_index", "parse"),
+    ("static_analyzer", "analyze", "parse"),
+    ("roster_model", "parse_character_moves", "parse"),
+    ("dom_snapshot", "snapshot_page", "query"),
+    ("dom_snapshot", "snapshot_modal", "query"),
+    ("page_waits", "wait_for_modal_hidden", "wait"),
+    ("page_waits", "wait_for_transition_end", "wait"),
+    ("page_waits", "wait_for_layout_settled", "wait"),
+    ("visual_regression", "compare", "diff"),
+    ("image_pipeline", "store_capture", "encode"),
+]
+PLAYWRIGHT_STEPS = {
+    "Page": {
+        "navigate": ["goto", "reload"],
+        "wait": ["wait_for_selector", "wait_for_function", "wait_for_load_state", "wait_for_timeout"],
+        "query": ["query_selector", "query_selector_all", "is_visible", "eval_on_selector",
+                  "eval_on_selector_all"],
+        "evaluate": ["evaluate", "evaluate_handle"],
+        "input": ["click", "tap", "hover", "set_viewport_size"],
+        "screenshot": ["screenshot"],
+        "setup": ["close", "add_init_script", "route", "route_from_har"],
+    },
+    "ElementHandle": {
+        "query": ["query_selector", "is_visible", "bounding_box"],
+        "evaluate": ["evaluate"],
+        "input": ["click", "tap", "hover"],
+        "screenshot": ["screenshot"],
+    },
+    "Keyboard": {"input": ["press"]},
+    "CDPSession": {"evaluate": ["send"]},
+    "BrowserContext": {"setup": ["new_page", "new_cdp_session", "add_init_script", "route",
+                                 "route_from_har", "close"]},
+    "Browser": {"setup": ["new_context", "close"]},
+}
+
+
+class SpanRecorder:
+    """Complete-event spans on per-task tracks, cheap enough to leave around every call."""
+
+    def __init__(self):
+        self.events = []
+        self.tracks = {}
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+
+    def _track(self):
+        # Concurrent asyncio tasks overlap in time, so each one gets its own track
+        # for the trace viewer to nest its spans correctly
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = task if task is not None else threading.get_ident()
+        track = self.tracks.get(key)
+        if track is None:
+            name = task.get_name() if task is not None else threading.current_thread().name
+            track = self.tracks[key] = (len(self.tracks) + 1, name)
+        return track[0]
+
+    def record(self, name, category, started_ns, detail=None):
+        ended = time.perf_counter_ns()
+        self.events.append((name, category, started_ns - self.origin, ended - started_ns,
+                            self._track(), detail))
+
+    def trace(self):
+        """The spans in Chrome trace event format, for chrome://tracing or ui.perfetto.dev."""
+        events = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in self.tracks.values()]
+        for name, category, start, duration, tid, detail in self.events:
+            event = {"name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": tid,
+                     "ts": start / 1000, "dur": duration / 1000}
+            if detail:
+                event["args"] = {"detail": detail}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def category_times(self):
+        """Total, self and call count per category; self time excludes nested spans."""
+        by_track = defaultdict(list)
+        for name, category, start, duration, tid, _ in self.events:
+            by_track[tid].append((start, -duration, category))
+        totals = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "self_ms": 0.0})
+        for spans in by_track.values():
+            stack = []  # [end, category, child time, duration]
+            for start, negative, category in sorted(spans):
+                duration = -negative
+                while stack and stack[-1][0] <= start:
+                    self._close(stack.pop(), totals)
+                if stack:
+                    stack[-1][2] += duration
+                stack.append([start + duration, category, 0, duration])
+                totals[category]["calls"] += 1
+                totals[category]["total_ms"] += duration / 1e6
+            while stack:
+                self._close(stack.pop(), totals)
+        return dict(totals)
+
+    @staticmethod
+    def _close(frame, totals):
+        _, category, children, duration = frame
+        totals[category]["self_ms"] += max(0, duration - children) / 1e6
+
+    def covered_ms(self):
+        """Wall time during which at least one span was open, on any track."""
+        intervals = sorted((start, start + duration) for _, _, start, duration, _, _ in self.events)
+        covered, end = 0, None
+        for start, stop in intervals:
+            if end is None or start > end:
+                covered += stop - start
+                end = stop
+            elif stop > end:
+                covered += stop - end
+                end = stop
+        return covered / 1e6
+
+
+_recorder = None
+
+
+def _detail(args):
+    for arg in args[:3]:
+        if isinstance(arg, str):
+            return arg if len(arg) <= DETAIL_CHARS else arg[:DETAIL_CHARS - 1] + "…"
+    return None
+
+
+def traced(func, name, category, skip_self=False):
+    """`func` wrapped in a span; the wrapper costs one recorder lookup while profiling is off."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if recorder is None:
+                return await func(*args, **kwargs)
+            started = time.perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                recorder.record(name, category, started, _detail(args[1:] if skip_self else args))
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(name, category, started, _detail(args[1:] if skip_self else args))
+    wrapper.__traced__ = func
+    return wrapper
+
+
+def _rebind(original, wrapper):
+    # Modules that ran `from x import f` before instrumentation hold the original
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not namespace:
+            continue
+        for attr, value in list(namespace.items()):
+            if value is original:
+                setattr(module, attr, wrapper)
+
+
+def instrument():
+    """Wrap every harness step once; later `from x import f` imports pick up the wrappers."""
+    from playwright import async_api
+
+    for class_name, categories in PLAYWRIGHT_STEPS.items():
+        cls = getattr(async_api, class_name)
+        for category, methods in categories.items():
+            for method in methods:
+                original = getattr(cls, method, None)
+                if original is not None and not hasattr(original, "__traced__"):
+                    setattr(cls, method, traced(original, f"{class_name}.{method}", category, skip_self=True))
+
+    for module_name, attr, category in HARNESS_STEPS:
+        owner = importlib.import_module(module_name)
+        *path, name = attr.split(".")
+        for part in path:
+            owner = getattr(owner, part)
+        original = getattr(owner, name)
+        if hasattr(original, "__traced__"):
+            continue
+        wrapper = traced(original, attr, category, skip_self=bool(path))
+        setattr(owner, name, wrapper)
+        if not path:
+            _rebind(original, wrapper)
+
+
+def start():
+    global _recorder
+    instrument()
+    _recorder = SpanRecorder()
+    return _recorder
+
+
+def stop():
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def print_spans(recorder, wall_ms):
+    times = recorder.category_times()
+    covered = recorder.covered_ms()
+    print(f"\n⏱️  Harness time by step ({wall_ms:.0f}ms wall, {len(recorder.events)} spans):")
+    print(f"   {'Step':<12} {'Calls':>7} {'Total ms':>10} {'Self ms':>10}")
+    for category, entry in sorted(times.items(), key=lambda item: -item[1]["self_ms"]):
+        print(f"   {category:<12} {entry['calls']:>7} {entry['total_ms']:>10.1f} {entry['self_ms']:>10.1f}")
+    print(f"   {'(outside)':<12} {'':>7} {max(0.0, wall_ms - covered):>10.1f} "
+          f"{'':>10}  Python and harness code between steps")
+
+
+def print_profile(profiler, top=15):
+    """Functions ranked by self time, with a bar per function scaled to the hottest."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:top]
+    peak = rows[0][1][2] if rows else 1
+    print(f"\n🔥 cProfile, top {len(rows)} functions by self time:")
+    for (filename, line, function), (_, calls, self_time, cumulative, _) in rows:
+        where = f"{os.path.basename(filename)}:{line}" if line else filename
+        bar = "█" * max(1, round(self_time / peak * 30))
+        print(f"   {self_time * 1000:8.1f}ms self {cumulative * 1000:9.1f}ms cum {calls:>8}x  "
+              f"{bar:<30} {function} ({where})")
+
+
+def print_allocations(snapshot, peak, top=10):
+    print(f"\n🧠 tracemalloc: peak {peak / 2 ** 20:.1f}MB, top {top} allocation sites still live:")
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        print(f"   {stat.size / 1024:9.1f}KB {stat.count:>8} blocks  "
+              f"{os.path.relpath(frame.filename, os.getcwd())}:{frame.lineno}")
+
+
+def run_target(target, module, argv):
+    """Run a script (or `-m` module) as __main__; returns its exit code."""
+    sys.argv = [target] + argv
+    try:
+        if module:
+            runpy.run_module(target, run_name="__main__", alter_sys=True)
+        else:
+            runpy.run_path(target, run_name="__main__")
+    except SystemExit as exit:
+        code = exit.code
+        return code if isinstance(code, int) else (0 if code is None else 1)
+    return 0
+
+
+def main(args):
+    print(f"🎮 Profiling {'-m ' if args.module else ''}{args.target} {' '.join(args.args)}".rstrip())
+    if args.tracemalloc:
+        tracemalloc.start(args.tracemalloc)
+    profiler = cProfile.Profile() if args.cprofile is not None else None
+    recorder = start()
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        code = run_target(args.target, args.module, args.args)
+    finally:
+        if profiler:
+            profiler.disable()
+        wall_ms = (time.perf_counter() - started) * 1000
+        stop()
+
+    with open(args.trace, "w", encoding="utf-8") as f:
+        json.dump(recorder.trace(), f)
+    print_spans(recorder, wall_ms)
+    print(f"📈 Chrome trace written to {args.trace} (open in ui.perfetto.dev or chrome://tracing)")
+    if profiler:
+        print_profile(profiler, args.top)
+        if args.cprofile:
+            profiler.dump_stats(args.cprofile)
+            print(f"💾 cProfile stats written to {args.cprofile}")
+    if args.tracemalloc:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print_allocations(snapshot, peak, args.top)
+    return code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trace", default="harness_trace.json", help="Chrome trace output path")
+    parser.add_argument("--cprofile", nargs="?", const="", default=None, metavar="PATH",
+                        help="also run under cProfile; with PATH, save the stats for snakeviz/flameprof")
+    parser.add_argument("--tracemalloc", type=int, nargs="?", const=1, default=0, metavar="FRAMES",
+                        help="also trace allocations, keeping FRAMES frames per allocation")
+    parser.add_argument("--top", type=int, default=15, help="rows in the cProfile and tracemalloc summaries")
+    parser.add_argument("-m", dest="module", action="store_true", help="target is a module, as in python -m")
+    parser.add_argument("target", help="script path, or module name with -m")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments passed to the target")
+    raise SystemExit(main(parser.parse_args()))
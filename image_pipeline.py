@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Image pipeline: content-addressed WebP/AVIF capture store, and multi-resolution lazy card images
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from urllib.parse import parse_qs, urlparse
+from build_dist import content_hash_name, tag_attrs
+from check_results import CheckResult, ERROR, ResultStream
+from offline_routes import parse_placeholder, png_bytes
+from static_server import INDEX, ROOT, SITE_ROOT, StaticServer
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, features
+except ImportError:
+    Image = ImageDraw = ImageFont = features = None
+
+CAPTURE_DIR = os.path.join(ROOT, "visual_output", "captures")
+# Captures are artifacts to look at, not baselines to diff against, so lossy is fine
+CAPTURE_FORMAT = "webp"
+CAPTURE_QUALITY = {"webp": 85, "avif": 70}
+CARD_DIR = "img/cards"
+CARD_FORMAT = "webp"
+# Tried best first; each card image takes the best one within its byte budget
+CARD_QUALITIES = (80, 70, 60, 50, 40)
+# .character-image img is a fixed 80x80 CSS box (game-styles.css), so x descriptors cover every screen.
+# DPR 3 phones take the 2x: at 80 CSS px a 3x image is about 50% more bytes for no visible gain.
+CARD_DENSITIES = (1, 2)
+DEVICE_DPRS = (1, 2, 3)
+# The 390x844 phone of page_metrics.VIEWPORTS, at its real pixel ratio
+MOBILE_DEVICE = {"viewport": {"width": 390, "height": 844}, "device_scale_factor": 3,
+                 "has_touch": True, "is_mobile": True}
+SETTLE_TIMEOUT = 5000
+
+_IMG_TAG = re.compile(r'<img\b[^>]*>', re.I)
+_PLACEHOLDER_HOST = "via.placeholder.com"
+
+# Image bytes fetched for the roster cards so far; `complete` once every card image has loaded
+_CARD_BYTES_JS = """
+(cardDir) => {
+    const entries = performance.getEntriesByType('resource').filter(e => e.name.includes(cardDir));
+    const images = [...document.querySelectorAll('.roster-grid .character-image img')];
+    return {
+        bytes: entries.reduce((total, e) => total + e.encodedBodySize, 0),
+        requests: entries.length,
+        loaded: images.filter(img => img.complete && img.naturalWidth > 0).length,
+        natural_width: Math.max(0, ...images.map(img => img.naturalWidth)),
+    };
+}
+"""
+
+# Brings each card into view in turn and waits for its image, as a user scrolling the roster would
+_SCROLL_CARDS_JS = """
+async () => {
+    for (const img of document.querySelectorAll('.roster-grid .character-image img')) {
+        img.scrollIntoView({block: 'center'});
+        if (!img.complete) {
+            await new Promise(resolve => {
+                img.addEventListener('load', resolve, {once: true});
+                img.addEventListener('error', resolve, {once: true});
+            });
+        }
+    }
+}
+"""
+
+
+# --- Capture store -----------------------------------------------------------
+
+@dataclass(slots=True)
+class StoredCapture:
+    name: str
+    digest: str
+    path: str
+    png_bytes: int
+    stored_bytes: int
+    new: bool
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, path)
+
+
+def encode(image, fmt, quality):
+    """`image` encoded as WebP or AVIF bytes."""
+    buffer = io.BytesIO()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    image.save(buffer, fmt.upper(), quality=quality, **({"method": 4} if fmt == "webp" else {}))
+    return buffer.getvalue()
+
+
+def capture_format(fmt=CAPTURE_FORMAT):
+    """`fmt` when this Pillow can write it, WebP when it cannot write AVIF, PNG without Pillow."""
+    if Image is None:
+        return "png"
+    if fmt == "avif" and not features.check("avif"):
+        return "webp"
+    return fmt
+
+
+def store_capture(name, png, store_dir=CAPTURE_DIR, fmt=CAPTURE_FORMAT):
+    """Keep `png` under its content hash, re-encoded; an unchanged capture writes nothing.
+
+    Objects live at objects/<2 hex>/<rest of sha256>.<fmt>, and refs/<name>.json
+    points a capture name at its latest object. The object a ref moves away from
+    is deleted once no other ref points at it, so the store holds at most one
+    object per capture name however often the pixels change.
+    """
+    fmt = capture_format(fmt)
+    digest = hashlib.sha256(png).hexdigest()
+    path = os.path.join(store_dir, "objects", digest[:2], f"{digest[2:]}.{fmt}")
+    new = not os.path.exists(path)
+    if new:
+        if fmt == "png":
+            data = png
+        else:
+            data = encode(Image.open(io.BytesIO(png)), fmt, CAPTURE_QUALITY[fmt])
+        _write_atomic(path, data)
+    stored = StoredCapture(name, digest, os.path.relpath(path, store_dir), len(png), os.path.getsize(path), new)
+
+    ref = {"digest": digest, "path": stored.path, "png_bytes": stored.png_bytes, "stored_bytes": stored.stored_bytes}
+    ref_path = os.path.join(store_dir, "refs", f"{name}.json")
+    previous = _read_ref(ref_path)
+    if previous != ref:
+        _write_atomic(ref_path, json.dumps(ref, indent=2).encode("utf-8"))
+        if previous and previous.get("path") != stored.path:
+            prune_captures(store_dir, [previous.get("path")])
+    return stored
+
+
+def _read_ref(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def prune_captures(store_dir=CAPTURE_DIR, candidates=None):
+    """Delete objects no ref points at: `candidates` (store-relative paths), or every object.
+
+    Returns the number of bytes freed.
+    """
+    refs_dir = os.path.join(store_dir, "refs")
+    live = set()
+    if os.path.isdir(refs_dir):
+        for name in os.listdir(refs_dir):
+            ref = _read_ref(os.path.join(refs_dir, name)) if name.endswith(".json") else None
+            if ref and ref.get("path"):
+                live.add(os.path.normpath(ref["path"]))
+    if candidates is None:
+        candidates = [os.path.relpath(os.path.join(directory, name), store_dir)
+                      for directory, _, names in os.walk(os.path.join(store_dir, "objects")) for name in names]
+    freed = 0
+    for relative in candidates:
+        relative = os.path.normpath(relative or "")
+        path = os.path.join(store_dir, relative)
+        if relative in live or not relative.startswith("objects") or not os.path.isfile(path):
+            continue
+        freed += os.path.getsize(path)
+        os.remove(path)
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+    return freed
+
+
+def load_capture(name, store_dir=CAPTURE_DIR):
+    """The stored object for capture `name` as (bytes, ref), or None if it was never stored."""
+    try:
+        with open(os.path.join(store_dir, "refs", f"{name}.json"), encoding="utf-8") as f:
+            ref = json.load(f)
+        with open(os.path.join(store_dir, ref["path"]), "rb") as f:
+            return f.read(), ref
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# --- Card images -------------------------------------------------------------
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "card"
+
+
+def _font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except (TypeError, OSError):
+        # Pillow without FreeType only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def draw_card(url, density=1):
+    """The placeholder `url` drawn with Pillow at `density` times its size: colour, then centred label."""
+    width, height, rgb = parse_placeholder(url)
+    parts = [part for part in urlparse(url).path.split("/") if part]
+    text = parse_qs(urlparse(url).query).get("text", [""])[0]
+    try:
+        ink = tuple(bytes.fromhex(parts[2])) if len(parts) > 2 else (255, 255, 255)
+    except ValueError:
+        ink = (255, 255, 255)
+    size = (width * density, height * density)
+    image = Image.new("RGB", size, tuple(rgb))
+    if text:
+        draw = ImageDraw.Draw(image)
+        font_size = max(6, size[1] // 5)
+        font = _font(font_size)
+        # Shrink long names until they fit with a small margin
+        while font_size > 6 and draw.textlength(text, font=font) > size[0] * 0.9:
+            font_size -= 1
+            font = _font(font_size)
+        draw.text((size[0] / 2, size[1] / 2), text, fill=ink, font=font, anchor="mm")
+    return image
+
+
+def render_card(url, density=1, fmt=CARD_FORMAT, budget=None, qualities=CARD_QUALITIES):
+    """Encoded card image and its extension, or (None, None) when no quality fits `budget` bytes.
+
+    Without Pillow the card is a solid-colour PNG.
+    """
+    if Image is None:
+        width, height, rgb = parse_placeholder(url)
+        return png_bytes(width * density, height * density, rgb), "png"
+    image = draw_card(url, density)
+    if fmt == "png":
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG", optimize=True)
+        return buffer.getvalue(), "png"
+    for quality in qualities:
+        content = encode(image, fmt, quality)
+        if budget is None or len(content) <= budget:
+            return content, fmt
+    return None, None
+
+
+def placeholder_png(url):
+    """What the placeholder service sends for `url`: one PNG at the 1x size."""
+    return render_card(url, fmt="png")[0]
+
+
+def chosen_density(densities, dpr):
+    """The srcset candidate a browser picks at `dpr`: the smallest that is dense enough, else the densest."""
+    return min((d for d in densities if d >= dpr), default=max(densities))
+
+
+def card_placeholders(html):
+    """Every roster <img> that still points at the placeholder service, as (tag, attrs)."""
+    tags = []
+    for match in _IMG_TAG.finditer(html):
+        attrs = tag_attrs(match.group())
+        if urlparse(attrs.get("src", "")).netloc == _PLACEHOLDER_HOST:
+            tags.append((match.group(), attrs))
+    return tags
+
+
+def build_card_images(html, out_dir, densities=CARD_DENSITIES, card_dir=CARD_DIR):
+    """Render every placeholder card locally at each density and point the markup at them.
+
+    Each <img> gets a content-hashed 1x `src`, an x-descriptor `srcset`, its
+    intrinsic size (so lazy images still reserve their box) and
+    loading="lazy" decoding="async". Every variant must come in under the
+    placeholder PNG it replaces; a density that cannot is left out of the
+    srcset. Returns the rewritten HTML and a per-card report of placeholder
+    PNG bytes against bytes per density (None where a density was dropped).
+    """
+    os.makedirs(os.path.join(out_dir, card_dir), exist_ok=True)
+    report = {}
+    replacements = {}
+    for tag, attrs in card_placeholders(html):
+        url = attrs["src"]
+        if tag in replacements:
+            continue
+        width, height, _ = parse_placeholder(url)
+        slug = _slug(attrs.get("alt") or parse_qs(urlparse(url).query).get("text", ["card"])[0])
+        budget = len(placeholder_png(url))
+        sources = []
+        for density in densities:
+            # The 1x is the src fallback, so it is kept even over budget
+            content, ext = render_card(url, density, budget=budget if sources else None)
+            if content is None:
+                continue
+            name = content_hash_name(f"{card_dir}/{slug}-{width * density}.{ext}", content)
+            with open(os.path.join(out_dir, name), "wb") as f:
+                f.write(content)
+            sources.append((density, name, len(content)))
+        srcset = ", ".join(f"{name} {density}x" for density, name, _ in sources)
+        extra = {key: value for key, value in attrs.items() if key not in ("src", "srcset", "width", "height",
+                                                                           "loading", "decoding")}
+        replacements[tag] = (f'<img src="{sources[0][1]}" srcset="{srcset}" width="{width}" height="{height}" '
+                             + "".join(f'{key}="{value}" ' for key, value in extra.items())
+                             + 'loading="lazy" decoding="async">')
+        sizes = {density: size for density, _, size in sources}
+        report[slug] = {"placeholder": budget, **{f"{density}x": sizes.get(density) for density in densities}}
+    for tag, replacement in replacements.items():
+        html = html.replace(tag, replacement)
+    return html, report
+
+
+def build_placeholder_baseline(html, out_dir, card_dir=CARD_DIR):
+    """The same cards served the way the page loads them today: one eager PNG each."""
+    os.makedirs(os.path.join(out_dir, card_dir), exist_ok=True)
+    for tag, attrs in card_placeholders(html):
+        name = f"{card_dir}/{_slug(attrs.get('alt') or 'card')}.png"
+        with open(os.path.join(out_dir, name), "wb") as f:
+            f.write(placeholder_png(attrs["src"]))
+        html = html.replace(tag, tag.replace(attrs["src"], name, 1))
+    return html
+
+
+def write_variants(out_dir, root=SITE_ROOT):
+    """before/ and after/ copies of the site, identical except for how the card images load.
+
+    Returns the card report of `build_card_images` for after/.
+    """
+    with open(os.path.join(root, INDEX), encoding="utf-8") as f:
+        html = f.read()
+    sites = {name: os.path.join(out_dir, name) for name in ("before", "after")}
+    for site in sites.values():
+        os.makedirs(site, exist_ok=True)
+        for asset in ("game-styles.css", "game-script.js"):
+            shutil.copy(os.path.join(root, asset), site)
+    after, report = build_card_images(html, sites["after"])
+    for site, page in ((sites["before"], build_placeholder_baseline(html, sites["before"])), (sites["after"], after)):
+        with open(os.path.join(site, INDEX), "w", encoding="utf-8") as f:
+            f.write(page)
+    return report
+
+
+# --- Mobile check ------------------------------------------------------------
+
+async def measure_card_bytes(session, url, device=MOBILE_DEVICE):
+    """Card image bytes on a fresh phone context: at first load, and after scrolling the whole roster."""
+    async with session.isolated_context(**device) as context:
+        page = await context.new_page()
+        await page.goto(url)
+        await page.wait_for_selector(".loading-screen", state="detached", timeout=SETTLE_TIMEOUT)
+        await page.wait_for_load_state("networkidle")
+        initial = await page.evaluate(_CARD_BYTES_JS, CARD_DIR)
+        await page.evaluate(_SCROLL_CARDS_JS)
+        await page.wait_for_load_state("networkidle")
+        scrolled = await page.evaluate(_CARD_BYTES_JS, CARD_DIR)
+    return {"initial_bytes": initial["bytes"], "initial_requests": initial["requests"],
+            "scrolled_bytes": scrolled["bytes"], "loaded": scrolled["loaded"],
+            "natural_width": scrolled["natural_width"]}
+
+
+def dpr_bytes(report, dpr):
+    """Card image bytes a device at `dpr` downloads for the whole roster, before and after."""
+    before = after = 0
+    for sizes in report.values():
+        densities = [int(key[:-1]) for key, size in sizes.items() if key != "placeholder" and size is not None]
+        before += sizes["placeholder"]
+        after += sizes[f"{chosen_density(densities, dpr)}x"]
+    return before, after
+
+
+def check_card_bytes(report, dprs=DEVICE_DPRS):
+    """CheckResult: at every device pixel ratio, no card costs more than the placeholder it replaces."""
+    check = CheckResult(name="card_bytes_per_dpr", group="images")
+    for dpr in dprs:
+        heavier = []
+        for slug, sizes in report.items():
+            densities = [int(key[:-1]) for key, size in sizes.items() if key != "placeholder" and size is not None]
+            if sizes[f"{chosen_density(densities, dpr)}x"] > sizes["placeholder"]:
+                heavier.append(slug)
+        before, after = dpr_bytes(report, dpr)
+        check.expect(f"dpr{dpr}_heavier_cards", heavier, [])
+        check.measure(f"dpr{dpr}_bytes", {"before": before, "after": after})
+    return check
+
+
+async def check_mobile_savings(session, base="", cards=18):
+    """CheckResult comparing the before/ and after/ variants under `base` on the mobile device."""
+    check = CheckResult(name="mobile_card_bytes", group="images")
+    started = time.perf_counter()
+    try:
+        before = await measure_card_bytes(session, f"{base}/before/{INDEX}")
+        after = await measure_card_bytes(session, f"{base}/after/{INDEX}")
+        check.expect("saves_bytes", after["initial_bytes"] < before["initial_bytes"], True)
+        # With every card on screen, lazy loading no longer helps: the srcset pick alone must be lighter
+        check.expect_max("scrolled_bytes_after", after["scrolled_bytes"], before["scrolled_bytes"])
+        check.expect("cards_loaded_after_scroll", after["loaded"], cards)
+        check.measure("initial_bytes_before", before["initial_bytes"])
+        check.measure("initial_bytes_after", after["initial_bytes"])
+        check.measure("bytes_saved", before["initial_bytes"] - after["initial_bytes"])
+        check.measure("requests_before", before["initial_requests"])
+        check.measure("requests_after", after["initial_requests"])
+        check.measure("scrolled_bytes_before", before["scrolled_bytes"])
+        check.measure("card_pixels", after["natural_width"])
+    except Exception as e:
+        check.status = ERROR
+        check.message = str(e)
+    check.duration = time.perf_counter() - started
+    return check
+
+
+def print_card_report(report):
+    columns = [key for key in next(iter(report.values()), {}) if key != "placeholder"]
+    print(f"   {'Card':<14} {'PNG 1x':>8} " + " ".join(f"{f'{CARD_FORMAT} {key}':>9}" for key in columns))
+    for slug, sizes in report.items():
+        print(f"   {slug:<14} {sizes['placeholder']:>8} "
+              + " ".join(f"{'-' if sizes[key] is None else sizes[key]:>9}" for key in columns))
+    for dpr in DEVICE_DPRS:
+        before, after = dpr_bytes(report, dpr)
+        print(f"   DPR {dpr}: {before:,} B of placeholder PNGs -> {after:,} B for the whole roster")
+
+
+def print_savings(check):
+    m = check.measured
+    if "initial_bytes_before" not in m:
+        print(f"{check.icon} Mobile card images: {check.message}")
+        return
+    print(f"{check.icon} Mobile card images at first load: {m['initial_bytes_before']:,} B in "
+          f"{m['requests_before']} requests -> {m['initial_bytes_after']:,} B in {m['requests_after']} "
+          f"({m['bytes_saved']:,} B saved)")
+    print(f"   After scrolling the roster: {m['scrolled_bytes_before']:,} B -> {m['scrolled_bytes_after']:,} B, "
+          f"{m['cards_loaded_after_scroll']} cards drawn from {m['card_pixels']}px images")
+
+
+async def main(args):
+    print("🎮 Image pipeline for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    if args.prune:
+        print(f"🧹 Freed {prune_captures():,} B of unreferenced captures")
+        return True
+    if args.store:
+        for path in args.store:
+            with open(path, "rb") as f:
+                stored = store_capture(os.path.splitext(os.path.basename(path))[0], f.read(), fmt=args.format)
+            print(f"{'💾' if stored.new else '♻️ '} {stored.name}: {stored.png_bytes:,} B PNG -> "
+                  f"{stored.stored_bytes:,} B {stored.path}" + ("" if stored.new else " (already stored)"))
+        return True
+
+    from browser_session import BrowserSession
+
+    work_dir = args.out or tempfile.mkdtemp(prefix="card-images-")
+    try:
+        report = write_variants(work_dir)
+        print(f"🖼️  {len(report)} card images at {', '.join(f'{d}x' for d in CARD_DENSITIES)}, bytes:")
+        print_card_report(report)
+        with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+            static_check = check_card_bytes(report)
+            results.add(static_check)
+            print(f"{static_check.icon} Card bytes per DPR" + (f": {static_check.message}" if static_check.message else ""))
+            with StaticServer(root=work_dir) as server:
+                async with BrowserSession(workers=1, base_url=server.url) as session:
+                    check = await check_mobile_savings(session, cards=len(report))
+            results.add(check)
+            print_savings(check)
+    finally:
+        if args.out is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results.ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--store", nargs="+", metavar="PNG",
+                        help="add these PNG captures to the capture store and exit")
+    parser.add_argument("--prune", action="store_true",
+                        help="delete stored captures that no ref points at, then exit")
+    parser.add_argument("--format", choices=["webp", "avif"], default=CAPTURE_FORMAT,
+                        help="capture store encoding")
+    parser.add_argument("--out", help="keep the before/after sites in this directory")
+    parser.add_argument("--jsonl", help="write the check result as JSON Lines to this path")
+    parser.add_argument("--junit", help="write the check result as JUnit XML to this path")
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
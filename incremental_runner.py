@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Incremental check runner: results cached under the content hashes of the regions each check reads
+"""
+
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+from check_results import CheckResult, ERROR, FAILED, PASSED, ResultStream
+from roster_model import RosterIndex, build_roster, find_character_moves
+from static_analyzer import analyze_html, build_index
+from static_server import INDEX, ROOT, SITE_ROOT
+
+CACHE_DIR = os.path.join(ROOT, ".check_cache")
+# Statuses worth replaying; errors and skips always re-run
+CACHEABLE = {PASSED, FAILED}
+
+# HTML regions a check can depend on: (tag, class, id) of the region's root element
+HTML_REGIONS = {
+    "head": ("head", None, None),
+    "nav": ("nav", "navbar", None),
+    "hero": ("section", "hero", None),
+    "roster": ("div", "roster-grid", None),
+    "modal": ("div", None, "movesModal"),
+}
+
+
+class _RegionParser(HTMLParser):
+    """One pass that records the source span of the first element matching each region."""
+
+    def __init__(self, html, regions):
+        super().__init__(convert_charrefs=True)
+        self.html = html
+        self.regions = regions
+        self.spans = {}
+        self._open = {}  # name -> [tag, depth, start]
+        self._line_starts = [0]
+        for index, char in enumerate(html):
+            if char == "\n":
+                self._line_starts.append(index + 1)
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        for state in self._open.values():
+            if state[0] == tag:
+                state[1] += 1
+        for name, (want_tag, want_class, want_id) in self.regions.items():
+            if name in self.spans or name in self._open:
+                continue
+            if ((want_tag is None or tag == want_tag)
+                    and (want_class is None or want_class in (attrs.get("class") or "").split())
+                    and (want_id is None or attrs.get("id") == want_id)):
+                self._open[name] = [tag, 1, self._offset()]
+
+    def handle_endtag(self, tag):
+        for name, state in list(self._open.items()):
+            if state[0] != tag:
+                continue
+            state[1] -= 1
+            if state[1] == 0:
+                end = self.html.index(">", self._offset()) + 1
+                self.spans[name] = (state[2], end)
+                del self._open[name]
+
+
+def page_assets(html, root):
+    """Local stylesheets and scripts the page loads, in document order, as paths under `root`."""
+    index = build_index(html)
+    stylesheets = []
+    for link in index.find_all("link"):
+        rel = link.attrs.get("rel", "").lower().split()
+        if "stylesheet" in rel or ("preload" in rel and link.attrs.get("as") == "style"):
+            stylesheets.append(link.attrs.get("href", ""))
+    scripts = [script.attrs.get("src", "") for script in index.find_all("script")]
+
+    def local(refs):
+        paths = []
+        for ref in refs:
+            url = urlparse(ref)
+            path = url.path.lstrip("/")
+            if ref and not url.scheme and not url.netloc and path not in paths \
+                    and os.path.isfile(os.path.join(root, path)):
+                paths.append(path)
+        return paths
+
+    return local(stylesheets), local(scripts)
+
+
+def _digest(data):
+    return hashlib.sha256(data if isinstance(data, bytes) else data.encode("utf-8")).hexdigest()
+
+
+class DependencyHashes:
+    """Content hashes of every dependency a check can declare, computed once per run."""
+
+    def __init__(self, root=SITE_ROOT):
+        self.root = root
+        self.hashes = {}
+        with open(os.path.join(root, INDEX), encoding="utf-8") as f:
+            self.html = f.read()
+        # Asset names come from the page, so hashed dist builds resolve too
+        self.stylesheets, self.scripts = page_assets(self.html, root)
+        css = b""
+        for name in self.stylesheets:
+            with open(os.path.join(root, name), "rb") as f:
+                css += f.read()
+        self.hashes["css"] = _digest(css)
+        self.script = ""
+        for name in self.scripts:
+            with open(os.path.join(root, name), encoding="utf-8") as f:
+                self.script += f.read() + "\n"
+        budgets = os.path.join(ROOT, "budgets.json")
+        if os.path.exists(budgets):
+            with open(budgets, "rb") as f:
+                self.hashes["budgets"] = _digest(f.read())
+
+        self.hashes["html"] = _digest(self.html)
+        parser = _RegionParser(self.html, HTML_REGIONS)
+        parser.feed(self.html)
+        parser.close()
+        self.regions = {name: self.html[start:end] for name, (start, end) in parser.spans.items()}
+        for name in HTML_REGIONS:
+            self.hashes[f"html:{name}"] = _digest(self.regions.get(name, ""))
+        # Everything outside the named regions: the loading screen, the end-of-body
+        # <script> tags, the other sections. Whitespace between tags does not count.
+        rest, last = [], 0
+        for start, end in sorted(parser.spans.values()):
+            if start >= last:
+                rest.append(self.html[last:start])
+                last = end
+        rest.append(self.html[last:])
+        self.hashes["html:rest"] = _digest(re.sub(r"\s+", " ", " ".join(rest)).strip())
+
+        # The moves data is hashed by value, the rest of the script by source
+        try:
+            self.character_moves, start, end = find_character_moves(self.script)
+            logic = self.script[:start] + self.script[end:]
+        except ValueError:
+            self.character_moves, logic = {}, self.script
+        self.hashes["js:characterMoves"] = _digest(json.dumps(self.character_moves, sort_keys=True))
+        self.hashes["js:logic"] = _digest(logic)
+        self.hashes["js"] = _digest(self.script)
+
+    def _module(self, dep):
+        # "py:<module>" hashes a harness module's source, read on first use
+        path = os.path.join(ROOT, f"{dep[3:]}.py")
+        if dep not in self.hashes and os.path.isfile(path):
+            with open(path, "rb") as f:
+                self.hashes[dep] = _digest(f.read())
+
+    def key(self, check):
+        """Cache key: the check's own source plus the hash of every dependency it declares."""
+        for dep in check.deps:
+            if dep.startswith("py:"):
+                self._module(dep)
+        missing = [dep for dep in check.deps if dep not in self.hashes]
+        if missing:
+            raise KeyError(f"{check.name}: unknown dependencies {missing}")
+        parts = [check.name, _digest(inspect.getsource(check.run))]
+        parts += [f"{dep}={self.hashes[dep]}" for dep in sorted(check.deps)]
+        return _digest("\n".join(parts))
+
+
+@dataclass(slots=True)
+class Check:
+    name: str
+    group: str
+    deps: tuple
+    run: object
+    browser: bool = False
+
+
+class ResultCache:
+    """Last result of each check, stored with the key it was computed under."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def get(self, name, key):
+        try:
+            with open(self._path(name), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return CheckResult(**entry["result"]) if entry.get("key") == key else None
+
+    def put(self, name, key, result):
+        if result.status not in CACHEABLE:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path(name), "w", encoding="utf-8") as f:
+            json.dump({"key": key, "result": result.to_dict()}, f, ensure_ascii=False, default=str)
+
+
+# --- Checks ----------------------------------------------------------------
+
+def check_title(deps, result):
+    title = analyze_html(deps.regions.get("head", ""))["title"] or ""
+    result.expect("has_version", "Super Smash Bros Infinity v0.7.0" in title, True)
+
+
+def check_nav(deps, result):
+    report = analyze_html(deps.regions.get("nav", ""))
+    result.measure("nav_items", report["nav_items"])
+    result.expect("at_least_7_links", report["nav_items"] >= 7, True)
+
+
+def check_roster_cards(deps, result):
+    report = analyze_html(deps.regions.get("roster", ""))
+    result.expect("character_cards", report["character_cards"], 19)
+    result.measure("character_names", report["character_names"])
+
+
+def check_roster_moves(deps, result):
+    cards = analyze_html(deps.regions.get("roster", ""))["data_characters"]
+    index = RosterIndex(build_roster(deps.character_moves), cards)
+    result.expect("cards_without_moves", index.missing_moves, [])
+    result.expect("moves_without_cards", index.orphaned_moves, [])
+
+
+async def check_modals(session, result):
+    from browser_session import MODAL_CHARACTERS, run_modal_checks
+
+    modal_results, timing = await run_modal_checks(session, MODAL_CHARACTERS)
+    failed = [r["character"] for r in modal_results if not r["opened"] or r.get("error")]
+    result.expect("failed_modals", failed, [])
+    result.measure("speedup", timing["speedup"])
+
+
+async def check_hero_and_nav_render(session, result):
+    from dom_snapshot import snapshot_page
+
+    async with session.page() as page:
+        snapshot = await snapshot_page(page)
+    result.expect("hero_present", snapshot.hero is not None, True)
+    result.expect("nav_links", len(snapshot.nav_links) >= 7, True)
+
+
+async def check_mobile_hamburger(session, result):
+    from page_waits import set_viewport_size
+
+    async with session.page() as page:
+        await set_viewport_size(page, {"width": 390, "height": 844})
+        result.expect("visible", await page.is_visible(".hamburger"), True)
+
+
+async def check_budgets(session, result):
+    from budget_gate import load_budgets, run_gate
+
+    rows = await run_gate(session, load_budgets())
+    result.expect("over_budget", [row.metric for row in rows if row.over], [])
+
+
+# Harness code a check's result depends on besides its own source: the session
+# every browser check runs in and the modules it loads pages with
+STATIC_HARNESS = ("py:static_analyzer",)
+BROWSER_HARNESS = ("py:browser_session", "py:dom_snapshot", "py:offline_routes", "py:animation_freeze",
+                   "py:page_waits", "py:static_server", "py:har_replay")
+
+CHECKS = [
+    Check("title", "static", ("html:head", *STATIC_HARNESS), check_title),
+    Check("nav_links", "static", ("html:nav", *STATIC_HARNESS), check_nav),
+    Check("roster_cards", "static", ("html:roster", *STATIC_HARNESS), check_roster_cards),
+    Check("roster_moves", "static", ("html:roster", "js:characterMoves", "py:roster_model", *STATIC_HARNESS),
+          check_roster_moves),
+    Check("hero_nav_render", "browser", ("html:head", "html:nav", "html:hero", "html:rest", "css", "js:logic",
+                                         *BROWSER_HARNESS),
+          check_hero_and_nav_render, browser=True),
+    Check("mobile_hamburger", "browser", ("html:head", "html:nav", "html:rest", "css", "js:logic",
+                                          *BROWSER_HARNESS),
+          check_mobile_hamburger, browser=True),
+    Check("character_modals", "browser",
+          ("html:head", "html:roster", "html:modal", "html:rest", "css", "js:characterMoves", "js:logic",
+           *BROWSER_HARNESS),
+          check_modals, browser=True),
+    Check("performance_budgets", "browser", ("html", "css", "js", "budgets", "py:budget_gate", "py:page_metrics",
+                                             *STATIC_HARNESS, *BROWSER_HARNESS),
+          check_budgets, browser=True),
+]
+
+
+async def run_incremental(checks=CHECKS, results=None, cache=None, force=False, root=SITE_ROOT):
+    """Replay cached results whose dependency hashes are unchanged and run the rest."""
+    from browser_session import BrowserSession
+
+    results = results if results is not None else ResultStream()
+    cache = cache or ResultCache()
+    deps = DependencyHashes(root)
+    session = None
+    stats = {"hits": 0, "runs": 0, "saved_s": 0.0}
+    try:
+        for check in checks:
+            key = deps.key(check)
+            cached = None if force else cache.get(check.name, key)
+            if cached is not None:
+                cached.measured["cached"] = True
+                results.add(cached)
+                stats["hits"] += 1
+                stats["saved_s"] += cached.duration
+                print(f"⚡ {cached.icon} {check.name}: cached ({cached.duration:.2f}s saved)")
+                continue
+
+            if check.browser and session is None:
+                session = await BrowserSession().start()
+            result = CheckResult(name=check.name, group=check.group)
+            started = time.perf_counter()
+            try:
+                outcome = check.run(session if check.browser else deps, result)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            except Exception as e:
+                result.status = ERROR
+                result.message = str(e)
+            result.duration = time.perf_counter() - started
+            cache.put(check.name, key, result)
+            results.add(result)
+            stats["runs"] += 1
+            print(f"▶️  {result.icon} {check.name}: ran in {result.duration:.2f}s"
+                  + (f" — {result.message}" if result.message else ""))
+    finally:
+        if session is not None:
+            await session.close()
+    return stats
+
+
+def print_dependencies(checks=CHECKS, root=SITE_ROOT):
+    deps = DependencyHashes(root)
+    cache = ResultCache()
+    for check in checks:
+        key = deps.key(check)
+        state = "cached" if cache.get(check.name, key) else "stale"
+        print(f"{check.name:<22} {state:<7} {', '.join(check.deps)}")
+
+
+async def main(args):
+    print("🎮 Incremental checks for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+        started = time.perf_counter()
+        stats = await run_incremental(results=results, force=args.force)
+        elapsed = time.perf_counter() - started
+    print(f"\n📊 {results.summary()}")
+    print(f"⚡ {stats['hits']} cache hit(s), {stats['runs']} run(s) in {elapsed:.2f}s "
+          f"({stats['saved_s']:.2f}s of checks skipped)")
+    return results.ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--force", action="store_true", help="ignore cached results and re-run everything")
+    parser.add_argument("--list", action="store_true", help="show each check's dependencies and cache state")
+    parser.add_argument("--jsonl", help="stream check results as JSON Lines to this path")
+    parser.add_argument("--junit", help="stream check results as JUnit XML to this path")
+    args = parser.parse_args()
+    if args.list:
+        print_dependencies()
+    else:
+        raise SystemExit(0 if asyncio.run(main(args)) else 1)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+HTTP load generator replaying the page's asset fetch pattern with asyncio virtual users
+"""
+
+import argparse
+import asyncio
+import re
+import ssl
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+from check_results import CheckResult, PASSED, ResultStream, percentile
+from static_analyzer import build_index
+
+PAGE_PATH = "/game-website.html"
+DEFAULT_CONCURRENCY = 50
+DEFAULT_DURATION = 30.0
+# Browsers open up to six connections per host
+CONNECTIONS_PER_USER = 6
+TIMEOUT = 10.0
+MAX_ERROR_RATE = 0.01
+ACCEPT_ENCODING = "br, gzip"
+CSS_URL = re.compile(r'url\(\s*(?:\'([^\']*)\'|"([^"]*)"|([^\'")\s]+))\s*\)')
+FONT_EXTENSIONS = (".woff2", ".woff", ".ttf", ".otf")
+
+
+@dataclass(slots=True)
+class AssetPlan:
+    """Same-origin requests one page view makes, in the order a browser issues them."""
+    page: str
+    subresources: list = field(default_factory=list)
+    external: list = field(default_factory=list)
+
+    @property
+    def kinds(self):
+        return Counter(kind for kind, _ in self.subresources)
+
+
+@dataclass(slots=True)
+class Sample:
+    kind: str
+    status: int
+    latency_ms: float
+    wire_bytes: int
+    error: str = ""
+
+    @property
+    def ok(self):
+        return not self.error and self.status < 400
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection over asyncio streams."""
+
+    def __init__(self, target):
+        self.target = target
+        self.reader = None
+        self.writer = None
+
+    async def _open(self):
+        context = ssl.create_default_context() if self.target.scheme == "https" else None
+        self.reader, self.writer = await asyncio.open_connection(self.target.hostname, self.target.port,
+                                                                 ssl=context)
+
+    async def request(self, path, headers):
+        """Send a GET and read the whole response; returns (status, headers, wire bytes)."""
+        if self.writer is None:
+            await self._open()
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.target.netloc}",
+                 f"Accept-Encoding: {ACCEPT_ENCODING}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+        received = len(status_line)
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            received += len(line)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if status == 304 or status < 200:
+            pass
+        elif "content-length" in response_headers:
+            received += len(await self.reader.readexactly(int(response_headers["content-length"])))
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await self.reader.readline()
+                size = int(size_line.split(b";")[0], 16)
+                received += len(size_line) + len(await self.reader.readexactly(size + 2))
+                if size == 0:
+                    break
+        else:
+            received += len(await self.reader.read())
+            response_headers["connection"] = "close"
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response_headers, received
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+            self.writer = self.reader = None
+
+
+class _VirtualUser:
+    """A browser-like client: up to `connections` sockets and, optionally, a validator cache."""
+
+    def __init__(self, target, connections, revalidate):
+        self.target = target
+        self.revalidate = revalidate
+        self.etags = {}
+        self._pool = asyncio.Queue()
+        for _ in range(connections):
+            self._pool.put_nowait(_Connection(target))
+
+    async def fetch(self, kind, path, samples):
+        connection = await self._pool.get()
+        headers = {"If-None-Match": self.etags[path]} if path in self.etags else {}
+        started = time.perf_counter()
+        try:
+            status, response_headers, received = await asyncio.wait_for(
+                connection.request(path, headers), TIMEOUT)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+            await connection.close()
+            samples.append(Sample(kind, 0, (time.perf_counter() - started) * 1000, 0,
+                                  f"{type(e).__name__}: {e}"))
+        else:
+            samples.append(Sample(kind, status, (time.perf_counter() - started) * 1000, received))
+            if self.revalidate and status == 200 and "etag" in response_headers:
+                self.etags[path] = response_headers["etag"]
+        finally:
+            self._pool.put_nowait(connection)
+
+    async def visit(self, plan, samples):
+        await self.fetch("html", plan.page, samples)
+        await asyncio.gather(*(self.fetch(kind, path, samples) for kind, path in plan.subresources))
+
+    async def close(self):
+        while not self._pool.empty():
+            await self._pool.get_nowait().close()
+
+
+def _target(base_url):
+    """Split `base_url`, filling in the scheme's default port."""
+    target = urlsplit(base_url)
+    if target.port is None:
+        target = target._replace(netloc=f"{target.hostname}:{443 if target.scheme == 'https' else 80}")
+    return target
+
+
+def _asset_kind(path, default):
+    return "font" if path.lower().split("?")[0].endswith(FONT_EXTENSIONS) else default
+
+
+async def discover_assets(base_url, page=PAGE_PATH):
+    """Fetch the page and its stylesheets once to build the per-visit request plan."""
+    target = _target(base_url)
+    page_url = urljoin(base_url, page)
+    plan = AssetPlan(page=urlsplit(page_url).path)
+    seen = set()
+
+    def add(kind, ref, relative_to):
+        url = urljoin(relative_to, ref)
+        if url.startswith("data:") or url in seen:
+            return
+        seen.add(url)
+        parts = urlsplit(url)
+        if (parts.hostname, parts.port or target.port) != (target.hostname, target.port):
+            plan.external.append(url)
+            return
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        plan.subresources.append((_asset_kind(path, kind), path))
+
+    connection = _Connection(target)
+    try:
+        body = await _get_body(connection, plan.page)
+        index = build_index(body)
+        for link in index.find_all("link"):
+            rel = link.attrs.get("rel", "").lower().split()
+            if "stylesheet" in rel or ("preload" in rel and link.attrs.get("as") in ("style", "font")):
+                add("css" if link.attrs.get("as") != "font" else "font", link.attrs.get("href", ""), page_url)
+        for script in index.find_all("script"):
+            if script.attrs.get("src"):
+                add("js", script.attrs["src"], page_url)
+        for img in index.find_all("img"):
+            if img.attrs.get("src"):
+                add("image", img.attrs["src"], page_url)
+            for candidate in img.attrs.get("srcset", "").split(","):
+                if candidate.strip():
+                    add("image", candidate.split()[0], page_url)
+
+        for kind, path in list(plan.subresources):
+            if kind == "css":
+                css_url = urljoin(base_url, path)
+                for groups in CSS_URL.findall((await _get_body(connection, path)).decode("utf-8", "replace")):
+                    add("image", "".join(groups).strip(), css_url)
+    finally:
+        await connection.close()
+    return plan
+
+
+async def _get_body(connection, path):
+    """Uncompressed one-shot GET used during discovery, so the body can be parsed."""
+    try:
+        await connection._open()
+        connection.writer.write(f"GET {path} HTTP/1.1\r\nHost: {connection.target.netloc}\r\n"
+                                f"Accept-Encoding: identity\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        await connection.writer.drain()
+        raw = await connection.reader.read()
+    finally:
+        await connection.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+    if b"chunked" in head.lower():
+        chunks, rest = [], body
+        while rest:
+            size_line, _, rest = rest.partition(b"\r\n")
+            size = int(size_line.split(b";")[0], 16)
+            if size == 0:
+                break
+            chunks.append(rest[:size])
+            rest = rest[size + 2:]
+        body = b"".join(chunks)
+    return body
+
+
+async def run_load(base_url, page=PAGE_PATH, concurrency=DEFAULT_CONCURRENCY, duration=DEFAULT_DURATION,
+                   connections=CONNECTIONS_PER_USER, revalidate=False):
+    """Run `concurrency` virtual users replaying page views for `duration` seconds."""
+    plan = await discover_assets(base_url, page)
+    target = _target(base_url)
+    samples = []
+    views = 0
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def user():
+        nonlocal views
+        client = _VirtualUser(target, connections, revalidate)
+        try:
+            while time.perf_counter() < deadline:
+                await client.visit(plan, samples)
+                views += 1
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize(samples, views, elapsed, plan, concurrency)
+
+
+def _latencies(samples):
+    values = [sample.latency_ms for sample in samples]
+    return {"p50_ms": percentile(values, 50), "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99), "max_ms": max(values, default=0.0)}
+
+
+def summarize(samples, views, elapsed, plan, concurrency):
+    by_kind = defaultdict(list)
+    for sample in samples:
+        by_kind[sample.kind].append(sample)
+    errors = [sample for sample in samples if not sample.ok]
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "page_views": views,
+        "requests": len(samples),
+        "requests_per_s": len(samples) / elapsed if elapsed else 0.0,
+        "page_views_per_s": views / elapsed if elapsed else 0.0,
+        "bytes_per_s": sum(sample.wire_bytes for sample in samples) / elapsed if elapsed else 0.0,
+        "errors": len(errors),
+        "error_rate": len(errors) / len(samples) if samples else 0.0,
+        "error_kinds": dict(Counter(sample.error or f"HTTP {sample.status}" for sample in errors)),
+        "statuses": dict(Counter(sample.status for sample in samples)),
+        **_latencies(samples),
+        "by_kind": {kind: {"requests": len(group), **_latencies(group)} for kind, group in by_kind.items()},
+        "plan": {"requests_per_view": 1 + len(plan.subresources), **plan.kinds,
+                 "external_skipped": len(plan.external)},
+    }
+
+
+def check_load(report, max_error_rate=MAX_ERROR_RATE, p95_ms=None):
+    """Fail on too many errors or, when a limit is given, a slow p95."""
+    result = CheckResult(name="load_test", group="load_generator")
+    result.expect_max("error_rate", report["error_rate"], max_error_rate)
+    if p95_ms is not None:
+        result.expect_max("p95_ms", report["p95_ms"], p95_ms)
+    for key, value in report.items():
+        if key not in result.measured:
+            result.measure(key, value)
+    return result
+
+
+def print_report(report):
+    plan = report["plan"]
+    print(f"🧭 {plan['requests_per_view']} requests per page view "
+          f"({plan['external_skipped']} external assets not replayed)")
+    print(f"👥 {report['concurrency']} virtual users for {report['elapsed_s']:.1f}s: "
+          f"{report['page_views']} page views, {report['requests']} requests")
+    print(f"🚀 {report['requests_per_s']:.0f} req/s, {report['page_views_per_s']:.1f} views/s, "
+          f"{report['bytes_per_s'] / 1024:.0f}KB/s on the wire")
+    print(f"⏱️  Latency: p50 {report['p50_ms']:.1f}ms, p95 {report['p95_ms']:.1f}ms, "
+          f"p99 {report['p99_ms']:.1f}ms, max {report['max_ms']:.1f}ms")
+    for kind, stats in sorted(report["by_kind"].items()):
+        print(f"   {kind:<6} {stats['requests']:>7} req  p50 {stats['p50_ms']:7.1f}ms  "
+              f"p95 {stats['p95_ms']:7.1f}ms  p99 {stats['p99_ms']:7.1f}ms")
+    icon = "✅" if not report["errors"] else "❌"
+    print(f"{icon} Errors: {report['errors']} ({report['error_rate']:.2%})")
+    for error, count in report["error_kinds"].items():
+        print(f"   {count:>6} × {error}")
+
+
+@contextmanager
+def spawn_server():
+    """Run static_server.py in its own process so it does not share the generator's GIL."""
+    process = subprocess.Popen([sys.executable, "-u", "static_server.py", "--quiet"], stdout=subprocess.PIPE,
+                               text=True, cwd=sys.path[0] or None)
+    try:
+        for line in process.stdout:
+            match = re.search(r'(http://[\w.:]+)/', line)
+            if match:
+                yield match.group(1)
+                break
+        else:
+            raise RuntimeError("static server exited before reporting its URL")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def main(args):
+    print("🎮 Load test for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    if args.url:
+        report = await run_load(args.url, args.page, args.concurrency, args.duration,
+                                args.connections, args.revalidate)
+    else:
+        with spawn_server() as url:
+            print(f"🌐 Serving the repo at {url}")
+            report = await run_load(url, args.page, args.concurrency, args.duration,
+                                    args.connections, args.revalidate)
+    print_report(report)
+
+    result = check_load(report, args.max_error_rate, args.p95_ms)
+    with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+        results.add(result)
+    print(f"{result.icon} Load test: {result.message or 'within limits'}")
+    return result.status == PASSED
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="base URL of the host under test (default: a local static server)")
+    parser.add_argument("--page", default=PAGE_PATH)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="virtual users")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds")
+    parser.add_argument("--connections", type=int, default=CONNECTIONS_PER_USER,
+                        help="keep-alive connections per virtual user")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="repeat visits send If-None-Match like a warm browser cache")
+    parser.add_argument("--max-error-rate", type=float, default=MAX_ERROR_RATE)
+    parser.add_argument("--p95-ms", type=float, help="fail when overall p95 latency exceeds this")
+    parser.add_argument("--jsonl", help="write the result as JSON Lines to this path")
+    parser.add_argument("--junit", help="write the result as JUnit XML to this path")
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
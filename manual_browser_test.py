@@ -1,120 +1,54 @@
 #!/usr/bin/env python3
 """
-Manual browser test using playwright directly
+Browser tests for the rendered page: title, hero, cards, the Mario modal, navigation and mobile layout
 """
 
-import asyncio
-from playwright.async_api import async_playwright
-
-async def test_website():
-    print("🎮 Starting Manual Browser Test for Super Smash Bros Infinity v0.7.0")
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        try:
-            # Navigate to the website
-            await page.goto("http://localhost:8081/game-website.html")
-            await page.wait_for_load_state("networkidle")
-            
-            print("✅ Page loaded successfully")
-            
-            # Take screenshot
-            await page.screenshot(path="/app/website_test.png")
-            print("📸 Screenshot taken")
-            
-            # Test 1: Check title
-            title = await page.title()
-            print(f"✅ Page title: {title}")
-            
-            # Test 2: Check if hero section is visible
-            hero_section = await page.query_selector(".hero")
-            if hero_section:
-                print("✅ Hero section found")
-            
-            # Test 3: Check character cards
-            character_cards = await page.query_selector_all(".character-card")
-            print(f"✅ Found {len(character_cards)} character cards")
-            
-            # Test 4: Check placeholder images
-            images = await page.query_selector_all(".character-card img")
-            placeholder_count = 0
-            for img in images:
-                src = await img.get_attribute("src")
-                if src and "via.placeholder.com" in src:
-                    placeholder_count += 1
-            
-            print(f"✅ Found {placeholder_count} placeholder images")
-            
-            # Test 5: Test modal functionality
-            if character_cards:
-                print("\n🎯 Testing modal functionality...")
-                
-                # Click on Mario character card
-                mario_card = None
-                for card in character_cards:
-                    data_char = await card.get_attribute("data-character")
-                    if data_char == "mario":
-                        mario_card = card
-                        break
-                
-                if mario_card:
-                    await mario_card.click()
-                    print("✅ Clicked on Mario character card")
-                    
-                    # Wait for modal to appear
-                    await page.wait_for_selector("#movesModal", state="visible", timeout=3000)
-                    print("✅ Modal appeared")
-                    
-                    # Check modal content
-                    modal_title = await page.query_selector("#modalCharacterName")
-                    if modal_title:
-                        title_text = await modal_title.text_content()
-                        print(f"✅ Modal title: {title_text}")
-                    
-                    # Check moves list
-                    moves = await page.query_selector_all(".moves-list li")
-                    print(f"✅ Found {len(moves)} moves for Mario")
-                    
-                    # Check combos list
-                    combos = await page.query_selector_all(".combos-list li")
-                    print(f"✅ Found {len(combos)} combos for Mario")
-                    
-                    # Test close button
-                    close_btn = await page.query_selector(".close")
-                    if close_btn:
-                        await close_btn.click()
-                        await page.wait_for_timeout(500)
-                        print("✅ Modal closed with X button")
-            
-            # Test 6: Test navigation
-            print("\n🧭 Testing navigation...")
-            nav_links = await page.query_selector_all(".nav-menu a")
-            print(f"✅ Found {len(nav_links)} navigation links")
-            
-            # Test 7: Test responsive design (mobile)
-            print("\n📱 Testing mobile responsiveness...")
-            await page.set_viewport_size({"width": 390, "height": 844})
-            await page.wait_for_timeout(1000)
-            
-            # Check if hamburger menu is visible
-            hamburger = await page.query_selector(".hamburger")
-            if hamburger:
-                is_visible = await hamburger.is_visible()
-                print(f"✅ Hamburger menu visible on mobile: {is_visible}")
-            
-            # Take mobile screenshot
-            await page.screenshot(path="/app/website_mobile.png")
-            print("📸 Mobile screenshot taken")
-            
-            print("\n🎮 All tests completed successfully!")
-            
-        except Exception as e:
-            print(f"❌ Error during testing: {str(e)}")
-        
-        finally:
-            await browser.close()
+import sys
+import pytest
+from dom_snapshot import snapshot_modal, snapshot_page
+from page_waits import set_viewport_size, wait_for_modal_hidden
+from visual_regression import capture
+
+
+async def test_page_title(page):
+    snapshot = await snapshot_page(page)
+    assert "Super Smash Bros Infinity v0.7.0" in snapshot.title
+
+
+async def test_hero_and_cards(page):
+    snapshot = await snapshot_page(page)
+    assert snapshot.hero is not None
+    assert len(snapshot.cards) == 19
+    assert len(snapshot.placeholder_images()) == 18
+
+
+async def test_navigation_links(page):
+    snapshot = await snapshot_page(page)
+    assert len(snapshot.nav_links) >= 7
+
+
+async def test_mario_modal_closes_with_x(page):
+    await page.click('[data-character="mario"]')
+    await page.wait_for_selector("#movesModal", state="visible", timeout=3000)
+    modal = await snapshot_modal(page)
+    assert modal["title"]
+    assert modal["moves"] and modal["combos"]
+
+    await page.click(".close")
+    await wait_for_modal_hidden(page)
+
+
+async def test_desktop_capture(page):
+    png, _ = await capture(page, "website_test", full_page=False)
+    assert png
+
+
+async def test_mobile_hamburger(page):
+    await set_viewport_size(page, {"width": 390, "height": 844})
+    assert await page.is_visible(".hamburger")
+    png, _ = await capture(page, "website_mobile", full_page=False)
+    assert png
+
 
 if __name__ == "__main__":
-    asyncio.run(test_website())
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
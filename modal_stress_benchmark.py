@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Modal open/close stress benchmark: latency percentiles plus heap and DOM growth
+"""
+
+import argparse
+import asyncio
+from browser_session import BrowserSession
+from check_results import CheckResult, PASSED, ResultStream, percentile
+from page_metrics import SETTLE_TIMEOUT
+
+DEFAULT_CYCLES = 2000
+DEFAULT_CHUNK = 200
+DEFAULT_BURST = 16
+# Allowed growth per 1000 open/close cycles once the page has warmed up
+HEAP_SLOPE_LIMIT = 256 * 1024
+NODE_SLOPE_LIMIT = 50
+
+# Opens and closes the modal `cycles` times through the real card and close
+# button click handlers, timing click -> first frame painted with the modal
+# visible. Each chunk ends with a burst of hero button clicks so that
+# addCombatParticles() appends and schedules removal of its 8 nodes per click.
+CYCLE_JS = """
+async ([keys, cycles, offset, burst]) => {
+    const modal = document.getElementById('movesModal');
+    const close = modal.querySelector('.close');
+    const buttons = Array.from(document.querySelectorAll('button.btn-primary, button.btn-secondary'));
+    const nextPaint = () => new Promise(resolve => requestAnimationFrame(() => setTimeout(resolve, 0)));
+    const latencies = [];
+    for (let i = 0; i < cycles; i++) {
+        const key = keys[(offset + i) % keys.length];
+        const card = document.querySelector(`.character-card[data-character="${key}"]`);
+        const started = performance.now();
+        if (card) card.click(); else showCharacterMoves(key);
+        await nextPaint();
+        if (getComputedStyle(modal).display === 'none') throw new Error(`modal did not open for ${key}`);
+        latencies.push(performance.now() - started);
+        close.click();
+    }
+    for (let i = 0; i < burst && buttons.length; i++) {
+        buttons[i % buttons.length].dispatchEvent(
+            new MouseEvent('click', {bubbles: true, clientX: 40 + i, clientY: 40 + i}));
+    }
+    return latencies;
+}
+"""
+
+
+def slope(points):
+    """Least-squares slope of (x, y) points."""
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if not denominator:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+async def sample_memory(page, cdp):
+    """Force a GC, let combat particles expire, then read heap size and DOM counters."""
+    await page.wait_for_function("() => !document.querySelector('.combat-particle')",
+                                 timeout=SETTLE_TIMEOUT)
+    await cdp.send("HeapProfiler.collectGarbage")
+    metrics = await cdp.send("Performance.getMetrics")
+    values = {metric["name"]: metric["value"] for metric in metrics["metrics"]}
+    counters = await cdp.send("Memory.getDOMCounters")
+    return {"heap": values.get("JSHeapUsedSize", 0.0), "nodes": counters["nodes"],
+            "listeners": counters["jsEventListeners"]}
+
+
+async def run_stress(session, cycles=DEFAULT_CYCLES, chunk=DEFAULT_CHUNK, burst=DEFAULT_BURST):
+    """Drive `cycles` modal open/close cycles in chunks, sampling memory between chunks."""
+    async with session.page() as page:
+        await page.wait_for_selector(".loading-screen", state="detached", timeout=SETTLE_TIMEOUT)
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        keys = await page.evaluate("() => Object.keys(characterMoves)")
+
+        # One warm-up chunk so lazily created state is not counted as growth
+        await page.evaluate(CYCLE_JS, [keys, min(chunk, cycles), 0, burst])
+        samples = [dict(await sample_memory(page, cdp), cycles=0)]
+        latencies = []
+        done = 0
+        while done < cycles:
+            size = min(chunk, cycles - done)
+            latencies += await page.evaluate(CYCLE_JS, [keys, size, done, burst])
+            done += size
+            samples.append(dict(await sample_memory(page, cdp), cycles=done))
+        await cdp.detach()
+
+    return {
+        "cycles": cycles,
+        "characters": len(keys),
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p95_ms": percentile(latencies, 95),
+        "latency_p99_ms": percentile(latencies, 99),
+        "latency_max_ms": max(latencies, default=0.0),
+        "heap_start": samples[0]["heap"],
+        "heap_end": samples[-1]["heap"],
+        "nodes_start": samples[0]["nodes"],
+        "nodes_end": samples[-1]["nodes"],
+        "listeners_end": samples[-1]["listeners"],
+        "heap_per_1k_cycles": slope([(s["cycles"], s["heap"]) for s in samples]) * 1000,
+        "nodes_per_1k_cycles": slope([(s["cycles"], s["nodes"]) for s in samples]) * 1000,
+        "samples": samples,
+    }
+
+
+def check_growth(report, heap_limit=HEAP_SLOPE_LIMIT, node_limit=NODE_SLOPE_LIMIT):
+    """Fail when heap or DOM nodes keep growing with the number of cycles."""
+    result = CheckResult(name="modal_stress", group="stress_benchmark")
+    result.expect_max("heap_per_1k_cycles", report["heap_per_1k_cycles"], heap_limit)
+    result.expect_max("nodes_per_1k_cycles", report["nodes_per_1k_cycles"], node_limit)
+    for key, value in report.items():
+        if key not in result.measured:
+            result.measure(key, value)
+    return result
+
+
+def print_report(report):
+    print(f"🔁 {report['cycles']} open/close cycles across {report['characters']} characters")
+    print(f"⏱️  Open-to-visible: p50 {report['latency_p50_ms']:.2f}ms, "
+          f"p95 {report['latency_p95_ms']:.2f}ms, p99 {report['latency_p99_ms']:.2f}ms, "
+          f"max {report['latency_max_ms']:.2f}ms")
+    print(f"🧠 JS heap: {report['heap_start'] / 1024:.0f}KB -> {report['heap_end'] / 1024:.0f}KB "
+          f"({report['heap_per_1k_cycles'] / 1024:+.1f}KB per 1k cycles)")
+    print(f"🌳 DOM nodes: {report['nodes_start']} -> {report['nodes_end']} "
+          f"({report['nodes_per_1k_cycles']:+.1f} per 1k cycles)")
+
+
+async def main(args):
+    print("🎮 Modal stress benchmark for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    async with BrowserSession(workers=1) as session:
+        report = await run_stress(session, args.cycles, args.chunk, args.burst)
+    print_report(report)
+
+    result = check_growth(report)
+    with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+        results.add(result)
+    print(f"{result.icon} Memory growth: {result.message or 'bounded'}")
+    return result.status == PASSED
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES)
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK,
+                        help="cycles between heap/DOM samples")
+    parser.add_argument("--burst", type=int, default=DEFAULT_BURST,
+                        help="hero button clicks per chunk")
+    parser.add_argument("--jsonl", help="write the result as JSON Lines to this path")
+    parser.add_argument("--junit", help="write the result as JUnit XML to this path")
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
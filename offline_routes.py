@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Offline routing for Playwright contexts: serve external fonts and images locally
+"""
+
+import hashlib
+import os
+import struct
+import zlib
+from collections import Counter
+from urllib.parse import parse_qs, urlparse
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".offline_cache")
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+IMAGE_HOSTS = {"via.placeholder.com", "img.itch.zone"}
+FONT_CSS_HOST = "fonts.googleapis.com"
+FONT_FILE_HOST = "fonts.gstatic.com"
+DEFAULT_IMAGE_SIZE = (64, 36)
+DEFAULT_IMAGE_COLOR = "444444"
+MAX_IMAGE_SIDE = 1024
+
+
+def png_bytes(width, height, rgb):
+    """Encode a solid-colour RGB PNG without any imaging dependency."""
+    def chunk(tag, data):
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    raw = (b"\x00" + bytes(rgb) * width) * height
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 9))
+            + chunk(b"IEND", b""))
+
+
+def parse_placeholder(url):
+    """Return (width, height, rgb) for a via.placeholder.com URL such as /80x80/FF6B6B/FFFFFF."""
+    parts = [part for part in urlparse(url).path.split("/") if part]
+    width, height = DEFAULT_IMAGE_SIZE
+    color = DEFAULT_IMAGE_COLOR
+    if parts:
+        size = parts[0].split(".")[0].lower().split("x")
+        try:
+            width = int(size[0])
+            height = int(size[1]) if len(size) > 1 else width
+        except ValueError:
+            pass
+    if len(parts) > 1 and len(parts[1]) == 6:
+        color = parts[1]
+    try:
+        rgb = bytes.fromhex(color)
+    except ValueError:
+        rgb = bytes.fromhex(DEFAULT_IMAGE_COLOR)
+    return min(width, MAX_IMAGE_SIDE), min(height, MAX_IMAGE_SIDE), rgb
+
+
+def stub_font_css(url):
+    """Google Fonts stylesheet whose families resolve to a local system font."""
+    faces = []
+    for family in parse_qs(urlparse(url).query).get("family", []):
+        name = family.split(":")[0].replace("+", " ")
+        faces.append(f"@font-face {{ font-family: '{name}'; font-weight: 100 900; "
+                     f"src: local('Arial'); }}")
+    return "\n".join(faces) + "\n"
+
+
+class OfflineRouter:
+    """Fulfil every non-local request from a fixture cache and record what was intercepted."""
+
+    def __init__(self, cache_dir=CACHE_DIR, block_unknown=True):
+        self.cache_dir = cache_dir
+        self.block_unknown = block_unknown
+        self.intercepted = []
+        self._memory = {}
+
+    async def attach(self, context):
+        await context.route(self.is_external, self.handle)
+
+    @staticmethod
+    def is_external(url):
+        parsed = urlparse(url)
+        return parsed.scheme in ("http", "https") and parsed.hostname not in LOCAL_HOSTS
+
+    async def handle(self, route):
+        request = route.request
+        host = urlparse(request.url).hostname
+        if host in IMAGE_HOSTS:
+            served = "fixture-image"
+            await route.fulfill(status=200, content_type="image/png", body=self.image(request.url))
+        elif host == FONT_CSS_HOST:
+            served = "stub-font-css"
+            await route.fulfill(status=200, content_type="text/css", body=stub_font_css(request.url))
+        elif host == FONT_FILE_HOST:
+            # The stub stylesheet never points here; an empty "woff2" would only make Chromium
+            # log a decode error, so fail the request and let the face fall back like a blocked host
+            served = "blocked-font"
+            await route.abort("internetdisconnected")
+        elif self.block_unknown:
+            served = "blocked"
+            await route.abort("internetdisconnected")
+        else:
+            served = "passthrough"
+            await route.continue_()
+        self.intercepted.append({"url": request.url, "host": host,
+                                 "resource_type": request.resource_type, "served": served})
+
+    def image(self, url):
+        """Fixture PNG for `url`, generated once and then read from memory or disk."""
+        if url in self._memory:
+            return self._memory[url]
+
+        path = os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".png")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                body = f.read()
+        else:
+            if urlparse(url).hostname == "via.placeholder.com":
+                body = png_bytes(*parse_placeholder(url))
+            else:
+                body = png_bytes(*DEFAULT_IMAGE_SIZE, bytes.fromhex(DEFAULT_IMAGE_COLOR))
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(body)
+
+        self._memory[url] = body
+        return body
+
+    def summary(self):
+        """Count intercepted requests per (host, how they were served)."""
+        return Counter((entry["host"], entry["served"]) for entry in self.intercepted)
+
+
+def print_intercepts(router):
+    print(f"🌐 Offline routing: {len(router.intercepted)} external requests intercepted")
+    for (host, served), count in sorted(router.summary().items()):
+        print(f"   - {host}: {count} ({served})")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Page performance metrics: Navigation Timing, LCP, CLS, long tasks, TBT and CDP counters
+"""
+
+import asyncio
+import time
+from browser_session import BrowserSession, PAGE_URL
+
+VIEWPORTS = {
+    "desktop": {"width": 1920, "height": 1080},
+    "mobile": {"width": 390, "height": 844},
+}
+SETTLE_TIMEOUT = 5000
+CDP_METRICS = ["Nodes", "JSEventListeners", "JSHeapUsedSize", "JSHeapTotalSize", "LayoutCount",
+               "RecalcStyleCount", "LayoutDuration", "RecalcStyleDuration", "ScriptDuration", "TaskDuration"]
+
+# Installed before any page script runs so buffered entries from the very
+# start of the load are observed. CLS uses the standard session windows
+# (gap < 1 s, window < 5 s) and reports the worst window.
+_OBSERVER_JS = """
+(() => {
+    const m = window.__perfMetrics = {lcp: null, cls: 0, longTasks: []};
+    let windowValue = 0, windowStart = 0, lastShift = 0;
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe({type, buffered: true});
+        } catch (e) {}
+    };
+    observe('largest-contentful-paint', entry => {
+        const el = entry.element;
+        m.lcp = {time: entry.startTime, size: entry.size,
+                 element: el ? el.tagName.toLowerCase() + (el.className ? '.' + el.className.split(' ')[0] : '') : null};
+    });
+    observe('layout-shift', entry => {
+        if (entry.hadRecentInput) return;
+        if (entry.startTime - lastShift > 1000 || entry.startTime - windowStart > 5000) {
+            windowValue = 0;
+            windowStart = entry.startTime;
+        }
+        windowValue += entry.value;
+        lastShift = entry.startTime;
+        m.cls = Math.max(m.cls, windowValue);
+    });
+    observe('longtask', entry => m.longTasks.push({start: entry.startTime, duration: entry.duration}));
+})();
+"""
+
+_COLLECT_JS = """
+() => {
+    const m = window.__perfMetrics || {lcp: null, cls: 0, longTasks: []};
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    const fcpTime = fcp ? fcp.startTime : 0;
+    const blocking = m.longTasks.filter(t => t.start >= fcpTime);
+    return {
+        ttfb_ms: nav ? nav.responseStart : null,
+        dom_interactive_ms: nav ? nav.domInteractive : null,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        load_ms: nav ? nav.loadEventEnd : null,
+        transfer_bytes: nav ? nav.transferSize : null,
+        fcp_ms: fcp ? fcp.startTime : null,
+        lcp_ms: m.lcp ? m.lcp.time : null,
+        lcp_element: m.lcp ? m.lcp.element : null,
+        cls: m.cls,
+        long_tasks: m.longTasks.length,
+        long_task_ms: m.longTasks.reduce((sum, t) => sum + t.duration, 0),
+        tbt_ms: blocking.reduce((sum, t) => sum + Math.max(0, t.duration - 50), 0),
+        requests: performance.getEntriesByType('resource').length + (nav ? 1 : 0),
+        dom_elements: document.getElementsByTagName('*').length,
+    };
+}
+"""
+
+
+class PageMetricsCollector:
+    """Attach to a page before navigation, then `collect()` once the page has settled."""
+
+    def __init__(self, page):
+        self.page = page
+        self.cdp = None
+
+    async def attach(self):
+        await self.page.add_init_script(_OBSERVER_JS)
+        self.cdp = await self.page.context.new_cdp_session(self.page)
+        await self.cdp.send("Performance.enable")
+        return self
+
+    async def cdp_metrics(self):
+        response = await self.cdp.send("Performance.getMetrics")
+        values = {metric["name"]: metric["value"] for metric in response["metrics"]}
+        return {name: values[name] for name in CDP_METRICS if name in values}
+
+    async def collect(self):
+        metrics = await self.page.evaluate(_COLLECT_JS)
+        metrics.update(await self.cdp_metrics())
+        return metrics
+
+    async def detach(self):
+        if self.cdp:
+            await self.cdp.detach()
+            self.cdp = None
+
+
+async def measure_page(page, viewport, url=PAGE_URL):
+    """Load `url` at `viewport` and return its metrics once the loading screen is gone."""
+    await page.set_viewport_size(viewport)
+    collector = await PageMetricsCollector(page).attach()
+    try:
+        await page.goto(url)
+        await page.wait_for_load_state("networkidle")
+        # The fake loading screen is added on window.load and removed ~3.5 s later
+        await page.wait_for_selector(".loading-screen", state="detached", timeout=SETTLE_TIMEOUT)
+        return await collector.collect()
+    finally:
+        await collector.detach()
+
+
+async def measure_viewports(session, viewports=VIEWPORTS, url=PAGE_URL):
+    """Measure every named viewport one after another; returns metrics and timings by name.
+
+    Each viewport gets a fresh context, so no load starts with a warm cache, an
+    observer left over from another load, or a concurrent load competing for the CPU.
+    """
+    metrics, durations = {}, {}
+    for name, viewport in viewports.items():
+        started = time.perf_counter()
+        async with session.isolated_context(viewport=viewport) as context:
+            page = await context.new_page()
+            metrics[name] = await measure_page(page, viewport, url)
+        durations[name] = time.perf_counter() - started
+    return metrics, durations
+
+
+def print_metrics(name, metrics):
+    def ms(key):
+        return "n/a" if metrics.get(key) is None else f"{metrics[key]:.0f}ms"
+
+    print(f"⚡ {name}: TTFB {ms('ttfb_ms')}, FCP {ms('fcp_ms')}, LCP {ms('lcp_ms')}, "
+          f"CLS {metrics['cls']:.3f}, TBT {ms('tbt_ms')}, "
+          f"{metrics['long_tasks']} long tasks, {metrics.get('Nodes', 0):.0f} DOM nodes")
+
+
+async def main():
+    print("🎮 Page performance metrics for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    async with BrowserSession(workers=1) as session:
+        viewport_metrics, _ = await measure_viewports(session)
+        for name, metrics in viewport_metrics.items():
+            print_metrics(name.title(), metrics)
+
+if __name__ == "__main__":
+    asyncio.run(main())
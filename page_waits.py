@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Event-driven waits that resolve on the real page signal instead of fixed sleeps
+"""
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+MODAL_TIMEOUT = 2000
+TRANSITION_TIMEOUT = 1000
+LAYOUT_TIMEOUT = 2000
+
+# Resolves once no CSS transition on `prop` is running on the element.
+# getAnimations() flushes pending style changes, so a transition started by a
+# hover handler a moment ago is already visible here.
+_TRANSITION_END_JS = """
+async (el, [prop, timeout]) => {
+    const deadline = performance.now() + timeout;
+    for (;;) {
+        const running = el.getAnimations().filter(a => a.transitionProperty === prop);
+        if (!running.length) return true;
+        const remaining = deadline - performance.now();
+        if (remaining <= 0) return false;
+        await Promise.race([
+            Promise.allSettled(running.map(a => a.finished)),
+            new Promise(resolve => setTimeout(resolve, remaining)),
+        ]);
+    }
+}
+"""
+
+# Resolves once the viewport matches and the layout signature (document size
+# plus running CSS transitions) has been unchanged for `frames` frames.
+_LAYOUT_SETTLED_JS = """
+async ([width, frames, timeout]) => {
+    const deadline = performance.now() + timeout;
+    const signature = () => {
+        const root = document.documentElement;
+        const transitions = document.getAnimations().filter(a => a instanceof CSSTransition);
+        return [innerWidth, innerHeight, root.scrollWidth, root.scrollHeight, transitions.length].join(',');
+    };
+    let last = signature();
+    let stable = 0;
+    while (stable < frames || (width && innerWidth !== width)) {
+        if (performance.now() > deadline) return false;
+        await new Promise(resolve => requestAnimationFrame(resolve));
+        const current = signature();
+        stable = current === last ? stable + 1 : 0;
+        last = current;
+    }
+    return true;
+}
+"""
+
+
+async def wait_for_modal_hidden(page, timeout=MODAL_TIMEOUT):
+    """Wait until `#movesModal` is `display:none`, as set by `closeModal()`."""
+    await page.wait_for_function(
+        "() => getComputedStyle(document.getElementById('movesModal')).display === 'none'",
+        timeout=timeout,
+    )
+
+
+async def wait_for_transition_end(element, prop="transform", timeout=TRANSITION_TIMEOUT):
+    """Wait until the element's CSS transition on `prop` has finished."""
+    if not await element.evaluate(_TRANSITION_END_JS, [prop, timeout]):
+        raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded waiting for {prop} transition to end")
+
+
+async def wait_for_layout_settled(page, frames=2, timeout=LAYOUT_TIMEOUT):
+    """Wait until the layout has stopped changing for `frames` animation frames."""
+    width = page.viewport_size["width"] if page.viewport_size else 0
+    if not await page.evaluate(_LAYOUT_SETTLED_JS, [width, frames, timeout]):
+        raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded waiting for layout to settle")
+
+
+async def set_viewport_size(page, size, timeout=LAYOUT_TIMEOUT):
+    """Resize the viewport and return once the responsive layout has settled."""
+    await page.set_viewport_size(size)
+    await wait_for_layout_settled(page, timeout=timeout)
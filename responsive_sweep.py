@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Responsive sweep: hamburger, roster grid and modal checks across a device matrix, one context per profile
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import time
+from dataclasses import dataclass
+from browser_session import BrowserSession, PAGE_URL
+from check_results import CheckResult, ERROR, PASSED, ResultStream
+from page_waits import MODAL_TIMEOUT, wait_for_modal_hidden
+
+# .nav-menu collapses into the hamburger at this width (game-styles.css)
+HAMBURGER_MAX_WIDTH = 768
+SETTLE_TIMEOUT = 5000
+
+PHONE_WIDTHS = (320, 360, 375, 390, 412, 414, 430)
+TABLET_WIDTHS = (480, 540, 600, 712, 768, 800, 820, 834, 912, 1024)
+DESKTOP_WIDTHS = (1180, 1280, 1366, 1440, 1536, 1680, 1920, 2560)
+WIDTHS = PHONE_WIDTHS + TABLET_WIDTHS + DESKTOP_WIDTHS
+
+
+@dataclass(slots=True, frozen=True)
+class DeviceProfile:
+    width: int
+    height: int
+    dpr: float = 1
+    touch: bool = False
+    reduced_motion: bool = False
+
+    @property
+    def name(self):
+        flags = ("-touch" if self.touch else "") + ("-rm" if self.reduced_motion else "")
+        return f"{self.width}x{self.height}@{self.dpr:g}x{flags}"
+
+    @property
+    def mobile(self):
+        return self.touch and self.width < 1024
+
+    def context_options(self):
+        return {
+            "viewport": {"width": self.width, "height": self.height},
+            "device_scale_factor": self.dpr,
+            "has_touch": self.touch,
+            "is_mobile": self.mobile,
+            "reduced_motion": "reduce" if self.reduced_motion else "no-preference",
+        }
+
+
+def natural_height(width):
+    """Portrait phones and tablets, landscape desktops: 390 -> 844, 768 -> 1024, 1920 -> 1080."""
+    if width in PHONE_WIDTHS:
+        return round(width * 844 / 390)
+    if width in TABLET_WIDTHS:
+        return round(width * 4 / 3)
+    return round(width * 9 / 16)
+
+
+def natural_device(width):
+    """DPR and touch of the typical device at `width`."""
+    if width in PHONE_WIDTHS:
+        return 3, True
+    if width in TABLET_WIDTHS:
+        return 2, True
+    return 1, False
+
+
+def device_matrix(widths=WIDTHS, reduced_motion=(False, True), full=False):
+    """Every width on its typical device, with and without reduced motion.
+
+    `full` crosses every width with DPR 1/2/3 and touch on/off as well.
+    """
+    profiles = []
+    for width in widths:
+        devices = itertools.product((1, 2, 3), (False, True)) if full else [natural_device(width)]
+        for (dpr, touch), motion in itertools.product(devices, reduced_motion):
+            profiles.append(DeviceProfile(width, natural_height(width), dpr, touch, motion))
+    return profiles
+
+
+# The three sizes the suites used to check one after another on a single page
+LEGACY_MATRIX = [DeviceProfile(1920, 1080), DeviceProfile(390, 844, 3, True), DeviceProfile(768, 1024, 2, True)]
+
+# Every layout fact the checks need, read in one round-trip
+_LAYOUT_JS = """
+() => {
+    const grid = document.querySelector('.roster-grid');
+    const hamburger = document.querySelector('.hamburger');
+    const cards = grid ? [...grid.querySelectorAll('.character-card')].map(c => c.getBoundingClientRect()) : [];
+    const gridBox = grid ? grid.getBoundingClientRect() : null;
+    const hamburgerBox = hamburger ? hamburger.getBoundingClientRect() : null;
+    return {
+        viewport: innerWidth,
+        overflow_x: Math.max(0, document.documentElement.scrollWidth - innerWidth),
+        hamburger: !!hamburger && getComputedStyle(hamburger).display !== 'none' && hamburgerBox.width > 0,
+        columns: grid ? getComputedStyle(grid).gridTemplateColumns.split(' ').filter(Boolean).length : 0,
+        rows: new Set(cards.map(c => Math.round(c.top))).size,
+        min_card_width: cards.length ? Math.round(Math.min(...cards.map(c => c.width))) : 0,
+        cards_outside: gridBox ? cards.filter(c => c.left < gridBox.left - 1 || c.right > gridBox.right + 1).length : null,
+        reduced_motion: matchMedia('(prefers-reduced-motion: reduce)').matches,
+        coarse_pointer: matchMedia('(pointer: coarse)').matches,
+        dpr: devicePixelRatio,
+    };
+}
+"""
+
+_MODAL_BOX_JS = "el => { const r = el.getBoundingClientRect(); return {left: r.left, right: r.right}; }"
+
+
+async def check_modal(page, profile):
+    """Open Mario's modal the way the device would, check it fits the viewport, then close it."""
+    card = '[data-character="mario"]'
+    if profile.touch:
+        await page.tap(card)
+    else:
+        await page.click(card)
+    await page.wait_for_selector("#movesModal", state="visible", timeout=MODAL_TIMEOUT)
+    box = await page.eval_on_selector("#movesModal .modal-content", _MODAL_BOX_JS)
+    await page.click(".close")
+    await wait_for_modal_hidden(page)
+    return box["left"] >= 0 and box["right"] <= profile.width + 1
+
+
+async def sweep_profile(session, profile, url=PAGE_URL, freeze=None):
+    """Load the page on a context emulating `profile` and run every layout check on it.
+
+    `freeze` overrides the session's own setting for this profile's context.
+    """
+    result = CheckResult(name=f"responsive_{profile.name}", group="responsive")
+    timings = {}
+    started = time.perf_counter()
+    try:
+        async with session.isolated_context(freeze, **profile.context_options()) as context:
+            page = await context.new_page()
+            await page.goto(url)
+            await page.wait_for_selector(".loading-screen", state="detached", timeout=SETTLE_TIMEOUT)
+            timings["load_ms"] = (time.perf_counter() - started) * 1000
+
+            checks_started = time.perf_counter()
+            layout = await page.evaluate(_LAYOUT_JS)
+            result.expect("hamburger", layout["hamburger"], profile.width <= HAMBURGER_MAX_WIDTH)
+            result.expect("overflow_x", layout["overflow_x"], 0)
+            result.expect("cards_outside_grid", layout["cards_outside"], 0)
+            result.expect("reduced_motion", layout["reduced_motion"], profile.reduced_motion)
+            result.measure("columns", layout["columns"])
+            result.measure("rows", layout["rows"])
+            result.measure("min_card_width", layout["min_card_width"])
+            result.expect("modal_fits", await check_modal(page, profile), True)
+            timings["checks_ms"] = (time.perf_counter() - checks_started) * 1000
+    except Exception as e:
+        result.status = ERROR
+        result.message = str(e)
+    result.duration = time.perf_counter() - started
+    result.measured.update({key: round(value, 1) for key, value in timings.items()})
+    return result
+
+
+def _row(profile, result):
+    m = result.measured
+
+    def value(key, fmt="{}"):
+        return "-" if m.get(key) is None else fmt.format(m[key])
+
+    grid = f"{value('columns')}x{value('rows')}"
+    burger = {True: "yes", False: "no"}.get(m.get("hamburger"), "-")
+    modal = {True: "fits", False: "OVERFLOWS"}.get(m.get("modal_fits"), "-")
+    return (f"{result.icon} {profile.name:<22} {grid:>6} {burger:>6} {value('overflow_x', '{}px'):>8} "
+            f"{modal:>9} {value('load_ms', '{:.0f}'):>8} {value('checks_ms', '{:.0f}'):>8}"
+            + (f"  {result.message}" if result.message else ""))
+
+
+async def run_sweep(session, profiles, results=None, concurrency=None, freeze=None):
+    """Sweep every profile concurrently, printing each table row as soon as its profile finishes."""
+    results = results if results is not None else ResultStream()
+    limit = asyncio.Semaphore(concurrency or 2 * (os.cpu_count() or 1))
+
+    async def sweep(profile):
+        async with limit:
+            return profile, await sweep_profile(session, profile, freeze=freeze)
+
+    print(f"   {'Profile':<22} {'Grid':>6} {'Burger':>6} {'Overflow':>8} {'Modal':>9} "
+          f"{'Load ms':>8} {'Check ms':>8}")
+    started = time.perf_counter()
+    swept = {}
+    for finished in asyncio.as_completed([sweep(profile) for profile in profiles]):
+        profile, result = await finished
+        results.add(result)
+        swept[profile] = result
+        print(_row(profile, result))
+    wall_time = time.perf_counter() - started
+    serial_time = sum(result.duration for result in swept.values())
+    failed = sum(1 for result in swept.values() if result.status != PASSED)
+    print(f"📱 {len(profiles)} profiles in {wall_time:.2f}s wall vs {serial_time:.2f}s serial"
+          + (f", {failed} failed" if failed else ", all passed"))
+    return [swept[profile] for profile in profiles], wall_time
+
+
+async def main(args):
+    print("🎮 Responsive sweep for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    profiles = LEGACY_MATRIX if args.matrix == "legacy" else device_matrix(full=args.matrix == "full")
+    with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+        # Every profile opens its own context, so the shared pool needs only one
+        async with BrowserSession(workers=1, freeze=not args.real_timers) as session:
+            await run_sweep(session, profiles, results, args.concurrency)
+    print(f"📊 {results.summary()}")
+    return results.ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matrix", choices=["default", "full", "legacy"], default="default",
+                        help="default: every width on its typical device, with and without reduced motion; "
+                             "full: also every DPR and touch setting; legacy: the old three viewports")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="profiles in flight at once (default: two per core)")
+    parser.add_argument("--real-timers", action="store_true",
+                        help="run page timers in real time instead of on the frozen virtual clock")
+    parser.add_argument("--jsonl", help="stream check results as JSON Lines to this path")
+    parser.add_argument("--junit", help="stream check results as JUnit XML to this path")
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Roster model extracted from the characterMoves literal in game-script.js, cached by file hash
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_PATH = os.path.join(ROOT, "game-script.js")
+CACHE_DIR = os.path.join(ROOT, ".roster_cache")
+# Cards that open a generic modal rather than a character's moveset
+NON_FIGHTER_CARDS = {"more"}
+
+_DECLARATION = re.compile(r'\b(?:const|let|var)\s+characterMoves\s*=\s*')
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+
+
+@dataclass(slots=True, frozen=True)
+class Fighter:
+    key: str
+    name: str
+    description: str
+    moves: tuple
+    combos: tuple
+
+
+class _LiteralParser:
+    """Parser for the JSON-like subset of JavaScript object literals the data uses."""
+
+    def __init__(self, text, pos=0):
+        self.text = text
+        self.pos = pos
+
+    def error(self, message):
+        line = self.text.count("\n", 0, self.pos) + 1
+        return ValueError(f"characterMoves literal, line {line}: {message}")
+
+    def skip(self):
+        text = self.text
+        while self.pos < len(text):
+            if text[self.pos].isspace():
+                self.pos += 1
+            elif text.startswith("//", self.pos):
+                end = text.find("\n", self.pos)
+                self.pos = len(text) if end < 0 else end
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos)
+                if end < 0:
+                    raise self.error("unterminated comment")
+                self.pos = end + 2
+            else:
+                return
+
+    def value(self):
+        self.skip()
+        char = self.text[self.pos:self.pos + 1]
+        if char == "{":
+            return self.object()
+        if char == "[":
+            return self.array()
+        if char in ("'", '"'):
+            return self.string()
+        match = _NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return float(match.group()) if "." in match.group() or "e" in match.group().lower() else int(match.group())
+        match = _IDENTIFIER.match(self.text, self.pos)
+        if match and match.group() in ("true", "false", "null"):
+            self.pos = match.end()
+            return {"true": True, "false": False, "null": None}[match.group()]
+        raise self.error(f"unsupported value starting with {char!r}")
+
+    def string(self):
+        quote = self.text[self.pos]
+        self.pos += 1
+        parts = []
+        while True:
+            if self.pos >= len(self.text):
+                raise self.error("unterminated string")
+            char = self.text[self.pos]
+            if char == quote:
+                self.pos += 1
+                return "".join(parts)
+            if char == "\\":
+                escaped = self.text[self.pos + 1]
+                if escaped == "u":
+                    parts.append(chr(int(self.text[self.pos + 2:self.pos + 6], 16)))
+                    self.pos += 6
+                    continue
+                parts.append(_ESCAPES.get(escaped, escaped))
+                self.pos += 2
+                continue
+            parts.append(char)
+            self.pos += 1
+
+    def key(self):
+        self.skip()
+        if self.text[self.pos] in ("'", '"'):
+            return self.string()
+        match = _IDENTIFIER.match(self.text, self.pos)
+        if not match:
+            raise self.error("expected a property name")
+        self.pos = match.end()
+        return match.group()
+
+    def expect(self, char):
+        self.skip()
+        if self.text[self.pos:self.pos + 1] != char:
+            raise self.error(f"expected {char!r}")
+        self.pos += 1
+
+    def _items(self, close, item):
+        while True:
+            self.skip()
+            if self.text[self.pos:self.pos + 1] == close:
+                self.pos += 1
+                return
+            item()
+            self.skip()
+            if self.text[self.pos:self.pos + 1] == ",":
+                self.pos += 1
+            elif self.text[self.pos:self.pos + 1] != close:
+                raise self.error(f"expected ',' or {close!r}")
+
+    def object(self):
+        self.expect("{")
+        result = {}
+
+        def item():
+            name = self.key()
+            self.expect(":")
+            result[name] = self.value()
+
+        self._items("}", item)
+        return result
+
+    def array(self):
+        self.expect("[")
+        result = []
+        self._items("]", lambda: result.append(self.value()))
+        return result
+
+
+def find_character_moves(source):
+    """Parse the characterMoves declaration in JavaScript source.
+
+    Returns (data, start, end): the literal as plain data and the span of
+    `source` from the declaration keyword to just past the closing brace.
+    """
+    match = _DECLARATION.search(source)
+    if not match:
+        raise ValueError("characterMoves declaration not found")
+    literal = _LiteralParser(source, match.end())
+    return literal.value(), match.start(), literal.pos
+
+
+def parse_character_moves(source):
+    """Extract the characterMoves object literal from JavaScript source as plain data."""
+    return find_character_moves(source)[0]
+
+
+def build_roster(data):
+    return {key: Fighter(key=key, name=entry.get("name", key), description=entry.get("description", ""),
+                         moves=tuple(entry.get("moves", ())), combos=tuple(entry.get("combos", ())))
+            for key, entry in data.items()}
+
+
+_memory = {}
+
+
+def load_roster(source=None, path=SCRIPT_PATH, cache_dir=CACHE_DIR):
+    """Roster keyed by character, re-parsed only when the script's SHA-256 changes.
+
+    Pass `source` to use already-fetched script text, otherwise `path` is read.
+    """
+    if source is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+    else:
+        raw = source.encode("utf-8") if isinstance(source, str) else source
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest in _memory:
+        return _memory[digest]
+
+    cache_path = os.path.join(cache_dir, f"{digest}.json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        data = parse_character_moves(raw.decode("utf-8"))
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+
+    roster = _memory[digest] = build_roster(data)
+    return roster
+
+
+class RosterIndex:
+    """Cross-index between characterMoves entries and data-character cards."""
+
+    def __init__(self, roster, card_keys):
+        self.roster = roster
+        self.cards = set(card_keys) - NON_FIGHTER_CARDS
+        self.missing_moves = sorted(self.cards - roster.keys())
+        self.orphaned_moves = sorted(roster.keys() - self.cards)
+
+    def has_moves(self, key):
+        return key in self.roster
+
+    def has_card(self, key):
+        return key in self.cards
+
+    def fighter(self, key):
+        return self.roster.get(key)
+
+
+if __name__ == "__main__":
+    from static_analyzer import HTML_PATH, analyze_html
+
+    roster = load_roster()
+    with open(HTML_PATH, encoding="utf-8") as f:
+        index = RosterIndex(roster, analyze_html(f.read())["data_characters"])
+    print(f"🎮 {len(roster)} fighters in characterMoves, {len(index.cards)} fighter cards")
+    for fighter in roster.values():
+        marker = "✅" if index.has_card(fighter.key) else "❌"
+        print(f"{marker} {fighter.name}: {len(fighter.moves)} moves, {len(fighter.combos)} combos")
+    print(f"Cards without moves: {', '.join(index.missing_moves) or 'none'}")
+    print(f"Moves without cards: {', '.join(index.orphaned_moves) or 'none'}")
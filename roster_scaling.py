@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Roster scaling benchmark: synthetic N-fighter sites, measured for load, memory, modal latency and scrolling
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import shutil
+import tempfile
+from browser_session import BrowserSession
+from check_results import CheckResult, ResultStream, percentile
+from frame_profiler import FRAME_BUDGET_MS, summarize_frames
+from modal_stress_benchmark import CYCLE_JS
+from page_metrics import VIEWPORTS, measure_page
+from roster_model import find_character_moves
+from static_analyzer import analyze_html, enlarge_roster
+from static_server import INDEX, ROOT, SITE_ROOT, StaticServer
+
+try:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
+
+ROSTER_SIZES = (100, 1000, 10000)
+TEMPLATE_FIGHTER = "mario"
+MODAL_CYCLES = 60
+SCROLL_FRAMES = 240
+SCROLL_STEP = 40
+PLOT_PATH = os.path.join(ROOT, "roster_scaling.png")
+
+# Where each metric stops being acceptable: Core Web Vitals "good" limits for
+# load and interaction, two frame budgets for scrolling
+BREAK_LIMITS = {
+    "lcp_ms": 2500,
+    "modal_p95_ms": 200,
+    "scroll_p95_ms": FRAME_BUDGET_MS * 2,
+    "tbt_ms": 200,
+}
+
+# Scrolls through the roster grid itself for a fixed number of frames, so the
+# sample covers card rows at every N instead of the whole (ever longer) page
+_GRID_SCROLL_JS = """
+async ([step, frames]) => {
+    const grid = document.querySelector('.roster-grid');
+    const top = grid.getBoundingClientRect().top + scrollY;
+    const end = Math.max(top, grid.getBoundingClientRect().bottom + scrollY - innerHeight);
+    window.scrollTo(0, top);
+    const deltas = [];
+    let last = await new Promise(resolve => requestAnimationFrame(resolve));
+    for (let i = 0; i < frames; i++) {
+        // Wrap back to the first row once the last one is on screen
+        window.scrollTo(0, scrollY + step > end ? top : scrollY + step);
+        await new Promise(resolve => requestAnimationFrame(now => {
+            deltas.push(now - last);
+            last = now;
+            resolve();
+        }));
+    }
+    return deltas;
+}
+"""
+
+
+def synthetic_moves(source, keys, template=TEMPLATE_FIGHTER):
+    """`source` with one characterMoves entry per key, each a renamed copy of `template`."""
+    data, _, end = find_character_moves(source)
+    if template not in data:
+        raise ValueError(f"no {template} entry to clone")
+    close = end - 1
+    head = source[:close].rstrip()
+    separator = "" if head.endswith(("{", ",")) else ","
+    entries = []
+    for index, key in enumerate(keys):
+        entry = dict(data[template], name=f"Fighter {index}")
+        entries.append(f"    {json.dumps(key)}: {json.dumps(entry, ensure_ascii=False)}")
+    return head + separator + "\n" + ",\n".join(entries) + "\n" + source[close:]
+
+
+def synthesize_site(fighters, out_dir, root=SITE_ROOT):
+    """Write a copy of the site whose roster has `fighters` cards, every one with a move list."""
+    with open(os.path.join(root, INDEX), encoding="utf-8") as f:
+        html = f.read()
+    with open(os.path.join(root, "game-script.js"), encoding="utf-8") as f:
+        script = f.read()
+    existing = len(analyze_html(html)["data_characters"])
+    if fighters < existing:
+        raise ValueError(f"the page already has {existing} cards; cannot shrink it to {fighters}")
+
+    clones = fighters - existing
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, INDEX), "w", encoding="utf-8") as f:
+        f.write(enlarge_roster(html, clones) if clones else html)
+    with open(os.path.join(out_dir, "game-script.js"), "w", encoding="utf-8") as f:
+        f.write(synthetic_moves(script, [f"fighter-{i}" for i in range(clones)]) if clones else script)
+    shutil.copy(os.path.join(root, "game-styles.css"), out_dir)
+    return out_dir
+
+
+async def measure_roster(session, url, fighters, viewport=VIEWPORTS["desktop"]):
+    """Load time, memory, click-to-modal latency and grid scrolling for one synthetic site."""
+    async with session.page(url=None) as page:
+        metrics = await measure_page(page, viewport, url)
+        keys = await page.evaluate("() => Object.keys(characterMoves)")
+        # Spread the clicks over the whole roster, first card to last
+        stride = max(1, len(keys) // MODAL_CYCLES)
+        latencies = await page.evaluate(CYCLE_JS, [keys[::stride][:MODAL_CYCLES], MODAL_CYCLES, 0, 0])
+        frames = summarize_frames(await page.evaluate(_GRID_SCROLL_JS, [SCROLL_STEP, SCROLL_FRAMES]))
+    return {
+        "fighters": fighters,
+        "load_ms": metrics["load_ms"],
+        "lcp_ms": metrics["lcp_ms"],
+        "tbt_ms": metrics["tbt_ms"],
+        "heap_mb": metrics.get("JSHeapUsedSize", 0.0) / 2 ** 20,
+        "nodes": metrics.get("Nodes", 0),
+        "listeners": metrics.get("JSEventListeners", 0),
+        "modal_p50_ms": percentile(latencies, 50),
+        "modal_p95_ms": percentile(latencies, 95),
+        "scroll_p95_ms": frames["p95_ms"],
+        "scroll_fps": frames["fps"],
+        "jank_ratio": frames["jank_ratio"],
+    }
+
+
+async def run_scaling(sizes=ROSTER_SIZES, out_dir=None, root=SITE_ROOT):
+    """Generate every roster size, then measure them one after another on a single browser."""
+    sizes = sorted(set(sizes))
+    work_dir = out_dir or tempfile.mkdtemp(prefix="roster-scaling-")
+    for fighters in sizes:
+        synthesize_site(fighters, os.path.join(work_dir, str(fighters)), root)
+    rows = []
+    try:
+        with StaticServer(root=work_dir) as server:
+            async with BrowserSession(workers=1, base_url=server.url) as session:
+                for fighters in sizes:
+                    row = await measure_roster(session, f"/{fighters}/{INDEX}", fighters)
+                    print_row(row)
+                    rows.append(row)
+    finally:
+        if out_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return rows
+
+
+def growth_exponent(rows, key):
+    """Log-log slope between the smallest and largest roster with a positive value.
+
+    1.0 is linear, 2.0 quadratic. Returns (slope, first N, last N), or None when
+    fewer than two roster sizes measured the metric above zero.
+    """
+    points = [(row["fighters"], row[key]) for row in rows if row.get(key) is not None and row[key] > 0]
+    if len(points) < 2 or points[0][0] == points[-1][0]:
+        return None
+    (n0, v0), (n1, v1) = points[0], points[-1]
+    return math.log(v1 / v0) / math.log(n1 / n0), n0, n1
+
+
+def breaking_points(rows, limits=BREAK_LIMITS):
+    """Smallest roster at which each metric first exceeds its limit (None if it never does)."""
+    return {key: next((row["fighters"] for row in rows if row.get(key) is not None and row[key] > limit), None)
+            for key, limit in limits.items()}
+
+
+def scaling_checks(rows, limits=BREAK_LIMITS):
+    checks = []
+    for row in rows:
+        check = CheckResult(name=f"roster_{row['fighters']}", group="roster_scaling")
+        for key, limit in limits.items():
+            check.expect_max(key, row[key], limit)
+        for key, value in row.items():
+            if key not in check.measured:
+                check.measure(key, value)
+        checks.append(check)
+    return checks
+
+
+def print_row(row):
+    print(f"🧪 {row['fighters']:>6} fighters: load {row['load_ms']:.0f}ms, LCP {row['lcp_ms'] or 0:.0f}ms, "
+          f"TBT {row['tbt_ms']:.0f}ms, heap {row['heap_mb']:.1f}MB, {row['nodes']:.0f} nodes, "
+          f"{row['listeners']:.0f} listeners, modal p95 {row['modal_p95_ms']:.1f}ms, "
+          f"scroll p95 {row['scroll_p95_ms']:.1f}ms")
+
+
+def print_scaling(rows):
+    print("\n📈 Growth from smallest to largest roster (log-log slope, 1.0 = linear):")
+    for key in ("load_ms", "tbt_ms", "heap_mb", "nodes", "listeners", "modal_p95_ms", "scroll_p95_ms"):
+        growth = growth_exponent(rows, key)
+        if growth is None:
+            print(f"   {key:<14}   n/a (fewer than two roster sizes measured it above zero)")
+            continue
+        exponent, n0, n1 = growth
+        print(f"   {key:<14} {exponent:+.2f} N={n0}..{n1} {'█' * max(0, round(exponent * 20))}")
+    print("💥 First roster size over budget:")
+    broken = sorted(breaking_points(rows).items(), key=lambda item: (item[1] is None, item[1] or 0))
+    for key, fighters in broken:
+        limit = BREAK_LIMITS[key]
+        print(f"   {key:<14} > {limit:.0f}: " + (f"breaks at {fighters} fighters" if fighters else "holds"))
+
+
+def plot_scaling(rows, path=PLOT_PATH):
+    """Log-scale scaling curves, one panel per metric family; returns False without matplotlib."""
+    if plt is None:
+        return False
+    fighters = [row["fighters"] for row in rows]
+    panels = [("Load (ms)", ["load_ms", "lcp_ms", "tbt_ms"]), ("Memory", ["heap_mb"]),
+              ("DOM", ["nodes", "listeners"]), ("Interaction (ms)", ["modal_p50_ms", "modal_p95_ms", "scroll_p95_ms"])]
+    figure, axes = plt.subplots(2, 2, figsize=(11, 8))
+    for axis, (title, keys) in zip(axes.flat, panels):
+        for key in keys:
+            axis.plot(fighters, [row[key] or 0 for row in rows], marker="o", label=key)
+            if key in BREAK_LIMITS:
+                axis.axhline(BREAK_LIMITS[key], linestyle=":", linewidth=0.8, color=axis.lines[-1].get_color())
+        axis.set_xscale("log")
+        axis.set_yscale("log")
+        axis.set_title(title)
+        axis.set_xlabel("fighters")
+        axis.legend(fontsize=8)
+    figure.suptitle("Super Smash Bros Infinity roster scaling")
+    figure.tight_layout()
+    figure.savefig(path, dpi=120)
+    plt.close(figure)
+    return True
+
+
+async def main(args):
+    print("🎮 Roster scaling benchmark for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+    rows = await run_scaling(args.sizes, args.out)
+    print_scaling(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    if plot_scaling(rows, args.plot):
+        print(f"📊 Scaling curves written to {args.plot}")
+    else:
+        print("📊 matplotlib is not installed; skipping the plot")
+    with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+        for check in scaling_checks(rows):
+            results.add(check)
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(ROSTER_SIZES),
+                        help="total roster sizes to generate and measure")
+    parser.add_argument("--out", help="keep the generated sites in this directory")
+    parser.add_argument("--plot", default=PLOT_PATH, help="scaling curves PNG")
+    parser.add_argument("--json", help="write the measured rows to this JSON file")
+    parser.add_argument("--jsonl", help="write per-size results as JSON Lines to this path")
+    parser.add_argument("--junit", help="write per-size results as JUnit XML to this path")
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
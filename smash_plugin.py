@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+pytest plugin: session-scoped server and browser fixtures, async tests and duration-balanced sharding
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import statistics
+import pytest
+from static_analyzer import HTML_PATH, analyze_html
+from static_server import ROOT, StaticServer
+
+DURATIONS_PATH = os.path.join(ROOT, ".test_durations.json")
+# Weight of a test with no recorded duration when nothing else is known
+DEFAULT_DURATION = 1.0
+
+_loop_key = pytest.StashKey()
+# Call-phase durations of this run's passing tests, by node id
+_recorded = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("smash", "Super Smash Bros Infinity website checks")
+    group.addoption("--shard", metavar="I/N",
+                    help="run only shard I of N (1-based), balanced by recorded test durations")
+    group.addoption("--store-durations", action="store_true",
+                    help=f"merge this run's test durations into {os.path.basename(DURATIONS_PATH)}")
+    group.addoption("--durations-path", default=DURATIONS_PATH, help="recorded test durations file")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "browser: needs the Playwright browser session")
+    config.stash[_loop_key] = asyncio.new_event_loop()
+
+
+def pytest_unconfigure(config):
+    loop = config.stash.get(_loop_key, None)
+    if loop is not None:
+        loop.close()
+
+
+def _run(config, awaitable):
+    """Every async test and fixture shares one loop, so session fixtures outlive single tests."""
+    return config.stash[_loop_key].run_until_complete(awaitable)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    kwargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    _run(pyfuncitem.config, pyfuncitem.obj(**kwargs))
+    return True
+
+
+def roster_cards(path=HTML_PATH):
+    """data-character keys of every roster card, in page order."""
+    with open(path, encoding="utf-8") as f:
+        return analyze_html(f.read())["data_characters"]
+
+
+def pytest_generate_tests(metafunc):
+    # Collected from the page source so every xdist worker sees the same items
+    if "character" in metafunc.fixturenames:
+        metafunc.parametrize("character", roster_cards())
+
+
+# --- Fixtures --------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def site_url():
+    """Base URL under test: SMASH_BASE_URL, or a static server on the working tree."""
+    base_url = os.environ.get("SMASH_BASE_URL")
+    if base_url:
+        yield base_url.rstrip("/")
+        return
+    with StaticServer() as server:
+        yield server.url
+
+
+@pytest.fixture(scope="session")
+def browser_session(request, site_url):
+    """One browser per test process; under xdist each worker starts a single context and grows on demand."""
+    from browser_session import BrowserSession
+
+    workers = 1 if hasattr(request.config, "workerinput") else None
+    session = _run(request.config, BrowserSession(workers=workers, base_url=site_url).start())
+    yield session
+    _run(request.config, session.close())
+
+
+@pytest.fixture
+def page(request, browser_session):
+    """A fresh page on a pooled context, loaded and network-idle."""
+    manager = browser_session.page()
+    yield _run(request.config, manager.__aenter__())
+    _run(request.config, manager.__aexit__(None, None, None))
+
+
+@pytest.fixture(scope="session")
+def roster():
+    from roster_model import RosterIndex, load_roster
+
+    return RosterIndex(load_roster(), roster_cards())
+
+
+# --- Sharding --------------------------------------------------------------
+
+def load_durations(path=DURATIONS_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _parse_shard(value):
+    index, _, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise pytest.UsageError(f"--shard expects I/N, got {value!r}") from None
+    if not 1 <= index <= count:
+        raise pytest.UsageError(f"--shard {value}: I must be between 1 and N")
+    return index - 1, count
+
+
+def balance(weights, count):
+    """Longest-processing-time-first: each test goes to the currently lightest shard."""
+    loads = [0.0] * count
+    shards = [[] for _ in range(count)]
+    for position in sorted(range(len(weights)), key=lambda i: -weights[i]):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(position)
+        loads[lightest] += weights[position]
+    return shards, loads
+
+
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        if "browser_session" in item.fixturenames:
+            item.add_marker(pytest.mark.browser)
+
+    durations = load_durations(config.getoption("durations_path"))
+    known = [durations[item.nodeid] for item in items if item.nodeid in durations]
+    fallback = statistics.fmean(known) if known else DEFAULT_DURATION
+    weights = [durations.get(item.nodeid, fallback) for item in items]
+
+    shard = config.getoption("shard")
+    if shard:
+        index, count = _parse_shard(shard)
+        shards, _ = balance(weights, count)
+        keep = set(shards[index])
+        deselected = [item for position, item in enumerate(items) if position not in keep]
+        weights = [weight for position, weight in enumerate(weights) if position in keep]
+        items[:] = [item for position, item in enumerate(items) if position in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+
+    # Longest first, so xdist's load scheduler hands the slow tests out before the quick ones.
+    # In a single process this would interleave modules and rebuild their module-scoped
+    # fixtures over and over, so collection order is kept there.
+    if config.getoption("numprocesses", None):
+        order = sorted(range(len(items)), key=lambda i: -weights[i])
+        items[:] = [items[i] for i in order]
+
+
+def pytest_runtest_logreport(report):
+    # Under xdist the controller receives every worker's reports, so it alone records
+    if report.when == "call" and report.passed:
+        _recorded[report.nodeid] = round(report.duration, 4)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput") or not config.getoption("store_durations"):
+        return
+    path = config.getoption("durations_path")
+    durations = load_durations(path)
+    durations.update(_recorded)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(durations.items())), f, indent=2)
+        f.write("\n")
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Single-pass static analysis of game-website.html over an indexed element tree
+"""
+
+import argparse
+import os
+import re
+import time
+from collections import defaultdict
+from html.parser import HTMLParser
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+HTML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game-website.html")
+PLACEHOLDER_SRC = re.compile(r'via\.placeholder\.com')
+TEXT_TAGS = {"title", "h1", "h2", "h3", "a"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+             "meta", "param", "source", "track", "wbr"}
+
+
+class Element:
+    __slots__ = ("tag", "attrs", "parent", "text")
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.text = ""
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    def closest(self, cls):
+        """Nearest ancestor (not self) carrying class `cls`."""
+        node = self.parent
+        while node is not None and cls not in node.classes:
+            node = node.parent
+        return node
+
+
+class DocumentIndex:
+    """Elements indexed by tag, class, id and data-* attribute as they are parsed."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.count = 0
+        self.by_tag = defaultdict(list)
+        self.by_class = defaultdict(list)
+        self.by_id = {}
+        self.by_data = defaultdict(lambda: defaultdict(list))
+
+    def add(self, element):
+        self.count += 1
+        self.by_tag[element.tag].append(element)
+        for cls in element.classes:
+            self.by_class[cls].append(element)
+        for name, value in element.attrs.items():
+            if name == "id":
+                self.by_id.setdefault(value, element)
+            elif name.startswith("data-"):
+                self.by_data[name][value].append(element)
+        return element
+
+    def find_all(self, tag=None, cls=None):
+        if cls is not None:
+            return [el for el in self.by_class.get(cls, ()) if tag is None or el.tag == tag]
+        return list(self.by_tag.get(tag, ()))
+
+    def data_values(self, name):
+        return self.by_data[name].keys()
+
+
+class _IndexingParser(HTMLParser):
+    """Stdlib fallback: builds the index from start/end tag events in one pass."""
+
+    def __init__(self, index):
+        super().__init__(convert_charrefs=True)
+        self.index = index
+        self.stack = []
+        self.capturing = []
+
+    def _open(self, tag, attrs):
+        parent = self.stack[-1][0] if self.stack else None
+        element = self.index.add(Element(tag, {k: v or "" for k, v in attrs}, parent))
+        return element
+
+    def handle_starttag(self, tag, attrs):
+        element = self._open(tag, attrs)
+        if tag in VOID_TAGS:
+            return
+        parts = None
+        if tag in TEXT_TAGS:
+            parts = []
+            self.capturing.append(parts)
+        self.stack.append((element, parts))
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if not any(element.tag == tag for element, _ in self.stack):
+            return
+        while self.stack:
+            element, parts = self.stack.pop()
+            if parts is not None:
+                element.text = "".join(parts)
+                self.capturing.remove(parts)
+            if element.tag == tag:
+                break
+
+    def handle_data(self, data):
+        for parts in self.capturing:
+            parts.append(data)
+
+
+def _index_html_parser(content):
+    index = DocumentIndex("html.parser")
+    parser = _IndexingParser(index)
+    parser.feed(content if isinstance(content, str) else content.decode("utf-8", "replace"))
+    parser.close()
+    return index
+
+
+def _index_lxml(content):
+    index = DocumentIndex("lxml")
+    root = lxml.html.document_fromstring(content)
+    elements = {}
+    for node in root.iter():
+        if not isinstance(node.tag, str):
+            continue
+        parent = elements.get(node.getparent())
+        element = index.add(Element(node.tag, dict(node.attrib), parent))
+        if node.tag in TEXT_TAGS:
+            element.text = node.text_content()
+        elements[node] = element
+    return index
+
+
+def _index_selectolax(content):
+    index = DocumentIndex("selectolax")
+    tree = SelectolaxParser(content)
+    elements = {}
+    for node in tree.root.traverse():
+        if node.tag.startswith(("-", "_")):
+            continue
+        parent = elements.get(node.parent.mem_id) if node.parent is not None else None
+        attrs = {k: v or "" for k, v in node.attributes.items()}
+        element = index.add(Element(node.tag, attrs, parent))
+        if node.tag in TEXT_TAGS:
+            element.text = node.text(deep=True)
+        elements[node.mem_id] = element
+    return index
+
+
+# Fastest first
+BACKENDS = {
+    "selectolax": _index_selectolax if SelectolaxParser else None,
+    "lxml": _index_lxml if lxml else None,
+    "html.parser": _index_html_parser,
+}
+
+
+def available_backends():
+    return [name for name, build in BACKENDS.items() if build]
+
+
+def build_index(content, backend=None):
+    """Parse `content` once with the fastest available (or requested) backend."""
+    backend = backend or available_backends()[0]
+    if not BACKENDS.get(backend):
+        raise ValueError(f"HTML backend {backend!r} is not available")
+    return BACKENDS[backend](content)
+
+
+def analyze(index):
+    """Answer every structural check from the index."""
+    titles = index.find_all("title")
+    cards = index.find_all("div", cls="character-card")
+    images = index.find_all("img")
+    card_names = {}
+    for h3 in index.find_all("h3"):
+        card = h3 if "character-card" in h3.classes else h3.closest("character-card")
+        if card is not None and card not in card_names:
+            card_names[card] = h3.text.strip()
+
+    return {
+        "backend": index.backend,
+        "elements": index.count,
+        "title": titles[0].text.strip() if titles else None,
+        "hero_title": bool(index.find_all("h1", cls="hero-title")),
+        "nav_items": sum(1 for a in index.find_all("a") if a.attrs.get("href", "").startswith("#")),
+        "character_cards": len(cards),
+        "character_names": [card_names[card] for card in cards if card in card_names],
+        "data_characters": list(index.data_values("data-character")),
+        "placeholder_images": sum(1 for img in images if PLACEHOLDER_SRC.search(img.attrs.get("src", ""))),
+        "sections": len(index.find_all("section")),
+        "stylesheets": sum(1 for link in index.find_all("link") if "href" in link.attrs),
+        "scripts": sum(1 for script in index.find_all("script") if "src" in script.attrs),
+        "images": len(images),
+        "images_with_alt": sum(1 for img in images if "alt" in img.attrs),
+    }
+
+
+def analyze_html(content, backend=None):
+    return analyze(build_index(content, backend))
+
+
+def enlarge_roster(content, cards):
+    """Synthetic roster page with `cards` extra clones of the Mario character card."""
+    match = re.search(r'( *<div class="character-card" data-character="mario".*?</div>\s*</div>\r?\n)',
+                      content, re.S)
+    if not match:
+        raise ValueError("no mario character card to clone")
+    template = match.group(1)
+    clones = "".join(template.replace('"mario"', f'"fighter-{i}"').replace("'mario'", f"'fighter-{i}'")
+                     for i in range(cards))
+    return content[:match.start()] + clones + content[match.start():]
+
+
+def legacy_analysis(content):
+    """The BeautifulSoup walk test_website.py and final_test_report.py used to do."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    cards = soup.find_all('div', class_='character-card')
+    return {
+        "title": soup.find('title').text,
+        "hero_title": soup.find('h1', class_='hero-title') is not None,
+        "nav_items": len(soup.find_all('a', href=re.compile(r'^#'))),
+        "character_cards": len(cards),
+        "character_names": [card.find('h3').text.strip() for card in cards if card.find('h3')],
+        "placeholder_images": len(soup.find_all('img', src=PLACEHOLDER_SRC)),
+        "sections": len(soup.find_all('section')),
+        "stylesheets": len(soup.find_all('link', href=True)),
+        "scripts": len(soup.find_all('script', src=True)),
+        "images": len(soup.find_all('img')),
+        "images_with_alt": len(soup.find_all('img', alt=True)),
+    }
+
+
+def _best_of(func, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def benchmark(cards=5000, repeat=3, path=HTML_PATH):
+    """Time the legacy BeautifulSoup walk against each indexed backend on an enlarged page."""
+    with open(path, encoding="utf-8") as f:
+        content = enlarge_roster(f.read(), cards)
+
+    print(f"📄 Synthetic roster page: {cards} extra cards, {len(content) / 1024:.0f}KB")
+    timings = {}
+    try:
+        timings["BeautifulSoup (legacy)"] = _best_of(legacy_analysis, content, repeat)
+    except ImportError:
+        print("⏭️  BeautifulSoup not installed, skipping legacy baseline")
+    for backend in available_backends():
+        timings[f"indexed {backend}"] = _best_of(lambda c: analyze_html(c, backend), content, repeat)
+
+    baseline = timings.get("BeautifulSoup (legacy)")
+    for name, seconds in timings.items():
+        speedup = f" ({baseline / seconds:.1f}x)" if baseline else ""
+        print(f"⏱️  {name:<26} {seconds * 1000:8.1f}ms{speedup}")
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=5000, help="extra cards in the synthetic page")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    benchmark(args.cards, args.repeat)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+In-process static server for the site: gzip/brotli, strong ETags and Cache-Control on a free port
+"""
+
+import argparse
+import email.utils
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Serve another build of the site, e.g. SMASH_SITE_ROOT=dist for the optimised one
+SITE_ROOT = os.environ.get("SMASH_SITE_ROOT", ROOT)
+INDEX = "game-website.html"
+COMPRESSIBLE = re.compile(r'^(text/|application/(javascript|json|xml)|image/svg)')
+MIN_COMPRESS_BYTES = 256
+# Content-hashed names (see the dist build) never change, so they can be cached forever
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.\w+$')
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("font/woff2", ".woff2")
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+
+def cache_control(path):
+    if path.endswith(".html"):
+        return "no-cache"
+    if HASHED_NAME.search(path):
+        return "public, max-age=31536000, immutable"
+    return "public, max-age=3600"
+
+
+def accepted_encodings(header):
+    """Encodings from an Accept-Encoding header that have a non-zero q-value."""
+    accepted = set()
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()[2:] if params.strip().startswith("q=") else "1"
+        try:
+            if float(q) > 0:
+                accepted.add(name.strip().lower())
+        except ValueError:
+            pass
+    return accepted
+
+
+class Asset:
+    """A file's bytes plus lazily built compressed variants, each with its own strong ETag."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.raw = f.read()
+        stat = os.stat(path)
+        self.mtime = stat.st_mtime
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type == "application/javascript":
+            self.content_type += "; charset=utf-8"
+        self.digest = hashlib.sha256(self.raw).hexdigest()[:20]
+        self.last_modified = email.utils.formatdate(self.mtime, usegmt=True)
+        self._variants = {"identity": (self.raw, f'"{self.digest}"')}
+        self._lock = threading.Lock()
+
+    @property
+    def compressible(self):
+        return bool(COMPRESSIBLE.match(self.content_type)) and len(self.raw) >= MIN_COMPRESS_BYTES
+
+    def variant(self, encoding):
+        with self._lock:
+            if encoding not in self._variants:
+                if encoding == "br":
+                    body = brotli.compress(self.raw, quality=11)
+                else:
+                    body = gzip.compress(self.raw, compresslevel=9, mtime=0)
+                self._variants[encoding] = (body, f'"{self.digest}-{encoding}"')
+            return self._variants[encoding]
+
+    def negotiate(self, accept_encoding):
+        if self.compressible:
+            accepted = accepted_encodings(accept_encoding)
+            if brotli is not None and "br" in accepted:
+                return "br"
+            if "gzip" in accepted:
+                return "gzip"
+        return "identity"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "SmashStatic/1.0"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, keep-alive responses stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _serve(self, send_body):
+        asset = self.server.asset(urlparse(self.path).path)
+        if asset is None:
+            body = b"Not Found"
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        encoding = asset.negotiate(self.headers.get("Accept-Encoding"))
+        body, etag = asset.variant(encoding)
+        if_none_match = self.headers.get("If-None-Match", "")
+        not_modified = if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", asset.last_modified)
+        self.send_header("Cache-Control", cache_control(urlparse(self.path).path))
+        self.send_header("Vary", "Accept-Encoding")
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default backlog of 5 drops SYNs under load (a 1s retransmit per drop)
+    request_queue_size = 128
+
+    def __init__(self, address, root, quiet):
+        super().__init__(address, _Handler)
+        self.root = root
+        self.quiet = quiet
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def asset(self, url_path):
+        """Asset for a URL path inside the root, reloaded whenever the file changes."""
+        relative = posixpath.normpath(unquote(url_path)).lstrip("/")
+        if relative in ("", "."):
+            relative = INDEX
+        if relative.startswith("..") or "\\" in relative:
+            return None
+        path = os.path.join(self.root, *relative.split("/"))
+        if not os.path.isfile(path):
+            return None
+        mtime = os.stat(path).st_mtime
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset is None or asset.mtime != mtime:
+                asset = self._assets[path] = Asset(path)
+            return asset
+
+
+class StaticServer:
+    """Threaded server for `root`, started in-process on a free port (port 0).
+
+    ETags are content hashes, so they stay valid across restarts and ports;
+    fetch_client keys local URLs by path so its cache revalidates against them.
+    """
+
+    def __init__(self, root=SITE_ROOT, host="127.0.0.1", port=0, quiet=True):
+        self.root = root
+        self.host = host
+        self.port = port
+        self.quiet = quiet
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._server = _Server((self.host, self.port), self.root, self.quiet)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="static-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def print_compression_report(root=SITE_ROOT):
+    print("🗜️  Compressed transfer sizes:")
+    for name in sorted(os.listdir(root)):
+        if not name.endswith((".html", ".css", ".js")):
+            continue
+        asset = Asset(os.path.join(root, name))
+        sizes = [f"raw {len(asset.raw):>7} B", f"gzip {len(asset.variant('gzip')[0]):>6} B"]
+        if brotli is not None:
+            sizes.append(f"br {len(asset.variant('br')[0]):>6} B")
+        print(f"   {name:<20} {', '.join(sizes)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default=SITE_ROOT)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--quiet", action="store_true", help="do not log requests")
+    args = parser.parse_args()
+    print_compression_report(args.root)
+    server = StaticServer(args.root, args.host, args.port, quiet=args.quiet).start()
+    print(f"🌐 Serving {args.root} at {server.url}/{INDEX} (Ctrl+C to stop)")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
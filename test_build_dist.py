@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the dist build: request counting and the optimised page
+"""
+
+import sys
+import pytest
+import build_dist
+from build_dist import MANIFEST, _deferred_stylesheet, build, count_requests, minify_css, minify_js, optimise_html
+
+# The built-in minifier, used when rjsmin is not installed
+JS_CASES = {
+    "division": ("const r = x / 2 / y;", "const r=x/2/y;"),
+    "division_after_index": ("i = a[0] / 2;", "i=a[0]/2;"),
+    "regex_after_assignment": ("const re = /ab+c/gi.test(s);", "const re=/ab+c/gi.test(s);"),
+    "regex_after_keyword": ("const t = typeof /x/;", "const t=typeof/x/;"),
+    "regex_with_slash_in_class": ("if (a) return /[/]\\//.source;", "if(a)return/[/]\\//.source;"),
+    "asi_call": ("let a = b\n(c)", "let a=b\n(c)"),
+    "asi_declarations": ("let a = 1\nlet b = 2", "let a=1\nlet b=2"),
+    "asi_increment": ("a\n++b", "a\n++b"),
+    "unary_signs": ("x = a + +b; y = a - -b;", "x=a+ +b;y=a- -b;"),
+    "nested_template": ("const s = `a ${b + `c ${d}`} // not a comment`;", "const s=`a ${b+`c ${d}`} // not a comment`;"),
+    "url_in_string": ("const u = 'http://example.com'; // tail", "const u='http://example.com';"),
+    "block_comment_in_string": ('const s = "/* keep */"; /* drop */ f();', 'const s="/* keep */"; f();'),
+    "multiline_comment_keeps_break": ("f(a)\n/* multi\nline */\ng()", "f(a)\n\ng()"),
+}
+CSS_CASES = {
+    "comment_in_string": ('a { content: "/* x */  ;" ; margin : 0.5em 0 }', 'a{content:"/* x */  ;";margin:.5em 0}'),
+    "braces_in_string": ('.x::before { content: "a{b}" }', '.x::before{content:"a{b}"}'),
+    "media_group": ("@media (max-width: 768px) { .a > .b , .c { color : red !important } }",
+                    "@media (max-width: 768px){.a>.b,.c{color:red!important}}"),
+    "comment_dropped": ("/* header */ body { margin: 0 } /* footer */", "body{margin:0}"),
+}
+
+
+def test_noscript_fallback_is_not_a_request():
+    html = (f"<html><head>{_deferred_stylesheet('site.css')}</head>"
+            "<body><noscript><img src='pixel.gif'></noscript><script src='app.js' defer></script></body></html>")
+    assert count_requests(html) == {"requests": 2, "render_blocking": 0}
+
+
+def test_blocking_stylesheet_and_head_script():
+    html = ("<html><head><link rel='stylesheet' href='site.css'><link rel='stylesheet' href='print.css' "
+            "media='print'><script src='app.js'></script></head><body></body></html>")
+    assert count_requests(html) == {"requests": 3, "render_blocking": 2}
+
+
+def test_stylesheet_stays_blocking_without_critical_css():
+    html = "<html><head><link rel='stylesheet' href='site.css'></head><body></body></html>"
+    assets = {"site.css": "site.0123456789.css"}
+    deferred = optimise_html(html, assets, "body{margin:0}")
+    assert "<style>body{margin:0}</style>" in deferred
+    assert count_requests(deferred)["render_blocking"] == 0
+    blocking = optimise_html(html, assets, "")
+    assert "<style>" not in blocking
+    assert count_requests(blocking) == {"requests": 1, "render_blocking": 1}
+
+
+@pytest.mark.parametrize("case", JS_CASES)
+def test_fallback_minify_js(monkeypatch, case):
+    monkeypatch.setattr(build_dist, "rjsmin", None)
+    source, expected = JS_CASES[case]
+    assert minify_js(source) == expected + "\n"
+
+
+@pytest.mark.parametrize("case", CSS_CASES)
+def test_minify_css(case):
+    source, expected = CSS_CASES[case]
+    assert minify_css(source) == expected
+
+
+def test_build_only_replaces_a_previous_build(tmp_path):
+    (tmp_path / "notes.txt").write_text("keep me")
+    with pytest.raises(ValueError, match=MANIFEST):
+        build(out_dir=str(tmp_path))
+    assert (tmp_path / "notes.txt").read_text() == "keep me"
+    out_dir = tmp_path / "dist"
+    build(out_dir=str(out_dir))
+    build(out_dir=str(out_dir))
+    assert (out_dir / MANIFEST).is_file()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for HAR replay: rebasing recordings, wire sizes and the simulated network
+"""
+
+import sys
+import pytest
+import har_replay
+from har_replay import REPLAY_ORIGIN, NetworkThrottle, rebase_har, response_sizes
+
+PROFILE = {"rtt_ms": 100, "down_kbps": 800, "up_kbps": 400}
+
+
+def entry(url, **response):
+    return {"request": {"url": url, "headers": [{"name": "Referer", "value": "http://127.0.0.1:8123/"}]},
+            "response": {"content": {"size": 0}, **response}}
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(har_replay.time, "monotonic", lambda: clock[0])
+    return clock
+
+
+def test_rebase_rewrites_urls_and_headers():
+    har = {"log": {"entries": [entry("http://127.0.0.1:8123/index.html")]}}
+    rebased = rebase_har(har, "http://127.0.0.1:8123/")
+    request = rebased["log"]["entries"][0]["request"]
+    assert request["url"] == f"{REPLAY_ORIGIN}/index.html"
+    assert request["headers"][0]["value"] == f"{REPLAY_ORIGIN}/"
+    assert har["log"]["entries"][0]["request"]["url"] == "http://127.0.0.1:8123/index.html"
+
+
+def test_response_sizes_prefer_transfer_size():
+    har = {"log": {"entries": [
+        entry("/transfer", _transferSize=500, bodySize=900, headersSize=100),
+        entry("/body", _transferSize=-1, bodySize=900, headersSize=100),
+        entry("/unknown_headers", bodySize=900, headersSize=-1),
+        entry("/cached", _transferSize=0, bodySize=-1, content={"size": 2048}),
+    ]}}
+    assert response_sizes(har) == {"/transfer": 500, "/body": 1000, "/unknown_headers": 900, "/cached": 2048}
+
+
+def test_new_host_costs_an_extra_round_trip(now):
+    throttle = NetworkThrottle(PROFILE, {})
+    assert throttle.delay("http://a.test/") == pytest.approx(0.2)
+    now[0] = 1.0
+    assert throttle.delay("http://a.test/app.js") == pytest.approx(0.1)
+    assert throttle.delay("http://b.test/font.woff2") == pytest.approx(0.2)
+
+
+def test_transfer_and_upload_use_link_bandwidth(now):
+    throttle = NetworkThrottle(PROFILE, {"http://a.test/big.js": 10_000})
+    # 10 kB down at 800 kbit/s is 0.1s; the fragment is not part of the URL
+    assert throttle.delay("http://a.test/big.js#v2") == pytest.approx(0.2 + 0.1)
+    now[0] = 1.0
+    # 5 kB up at 400 kbit/s is 0.1s before the response can start
+    assert throttle.delay("http://a.test/api", sent_bytes=5_000) == pytest.approx(0.1 + 0.1)
+
+
+def test_parallel_responses_queue_for_the_link(now):
+    sizes = {"http://a.test/one.css": 10_000, "http://a.test/two.css": 10_000}
+    throttle = NetworkThrottle(PROFILE, sizes)
+    throttle.delay("http://a.test/")
+    now[0] = 1.0
+    first = throttle.delay("http://a.test/one.css")
+    second = throttle.delay("http://a.test/two.css")
+    assert first == pytest.approx(0.1 + 0.1)
+    assert second == pytest.approx(first + 0.1)
+
+
+def test_named_profile():
+    assert NetworkThrottle("3g", {}).profile == har_replay.NETWORK_PROFILES["3g"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
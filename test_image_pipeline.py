@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the image pipeline: responsive card images and the capture store
+"""
+
+import sys
+import pytest
+from image_pipeline import (CARD_DENSITIES, DEVICE_DPRS, build_card_images, card_placeholders,
+                            check_card_bytes, chosen_density, load_capture, prune_captures, render_card,
+                            store_capture)
+from static_server import INDEX, ROOT
+
+pytest.importorskip("PIL")
+
+
+@pytest.fixture(scope="module")
+def cards(tmp_path_factory):
+    with open(f"{ROOT}/{INDEX}", encoding="utf-8") as f:
+        html = f.read()
+    out_dir = tmp_path_factory.mktemp("cards")
+    return (*build_card_images(html, str(out_dir)), out_dir)
+
+
+def test_every_placeholder_becomes_a_lazy_srcset(cards):
+    html, report, out_dir = cards
+    assert not card_placeholders(html)
+    assert len(report) == 18
+    assert html.count('loading="lazy" decoding="async"') == 18
+    assert html.count('width="80" height="80"') == 18
+    for slug in report:
+        assert f"img/cards/{slug}-80." in html
+        assert list(out_dir.glob(f"img/cards/{slug}-80.*.webp"))
+
+
+@pytest.mark.parametrize("dpr", DEVICE_DPRS)
+def test_no_card_is_heavier_than_its_placeholder(cards, dpr):
+    _, report, _ = cards
+    check = check_card_bytes(report, dprs=[dpr])
+    assert check.status == "passed", check.message
+    assert check.measured[f"dpr{dpr}_bytes"]["after"] < check.measured[f"dpr{dpr}_bytes"]["before"]
+
+
+def test_chosen_density():
+    assert chosen_density(CARD_DENSITIES, 1) == 1
+    assert chosen_density((1, 2), 1.5) == 2
+    assert chosen_density((1, 2), 3) == 2
+
+
+def objects(store):
+    return sorted(path.name for path in (store / "objects").rglob("*") if path.is_file())
+
+
+def test_unchanged_capture_stores_nothing_new(tmp_path):
+    png = render_card("https://via.placeholder.com/80x80/FF6B6B/FFFFFF?text=Mario", fmt="png")[0]
+    first = store_capture("hero", png, str(tmp_path))
+    second = store_capture("hero", png, str(tmp_path))
+    assert first.new and not second.new
+    assert first.stored_bytes < first.png_bytes
+    assert load_capture("hero", str(tmp_path))[1]["digest"] == first.digest
+
+
+def test_changed_capture_replaces_its_object(tmp_path):
+    pngs = [render_card(f"https://via.placeholder.com/80x80/{color}/FFFFFF?text=Mario", fmt="png")[0]
+            for color in ("FF6B6B", "4ECDC4", "FFD93D")]
+    for png in pngs:
+        store_capture("hero", png, str(tmp_path))
+    # Another name sharing the current pixels keeps that object alive
+    store_capture("hero_copy", pngs[-1], str(tmp_path))
+    store_capture("hero", pngs[0], str(tmp_path))
+    assert len(objects(tmp_path)) == 2
+
+
+def test_prune_removes_unreferenced_objects(tmp_path):
+    png = render_card("https://via.placeholder.com/80x80/FF6B6B/FFFFFF?text=Mario", fmt="png")[0]
+    store_capture("hero", png, str(tmp_path))
+    stray = tmp_path / "objects" / "ab" / "cdef.webp"
+    stray.parent.mkdir(parents=True)
+    stray.write_bytes(b"x" * 10)
+    assert prune_captures(str(tmp_path)) == 10
+    assert len(objects(tmp_path)) == 1
+    assert not stray.parent.exists()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental runner: each edit invalidates exactly the checks that read what changed
+"""
+
+import shutil
+import sys
+import pytest
+from check_results import CheckResult, ERROR
+from incremental_runner import CHECKS, DependencyHashes, ResultCache
+from static_server import INDEX, ROOT
+
+BROWSER_CHECKS = {"hero_nav_render", "mobile_hamburger", "character_modals"}
+# performance_budgets hashes the whole page, stylesheet and script, so every edit invalidates it
+EDITS = {
+    "nav": (INDEX, "<h2>SSB Infinity v0.7.0</h2>", "<h2>SSB Infinity</h2>",
+            {"nav_links", "hero_nav_render", "mobile_hamburger", "performance_budgets"}),
+    "roster": (INDEX, "<h3>Mario</h3>", "<h3>Super Mario</h3>",
+               {"roster_cards", "roster_moves", "character_modals", "performance_budgets"}),
+    "rest_of_page": (INDEX, "❓ Frequently Asked Questions", "❓ FAQ", BROWSER_CHECKS | {"performance_budgets"}),
+    "script_tag": (INDEX, '<script src="game-script.js">', '<script src="game-script.js" defer>',
+                   BROWSER_CHECKS | {"performance_budgets"}),
+    "whitespace": (INDEX, '<section id="faq" class="faq">', '\n\n    <section id="faq" class="faq">',
+                   {"performance_budgets"}),
+    "css": ("game-styles.css", ".hamburger {", ".hamburger {\n    cursor: pointer;",
+            BROWSER_CHECKS | {"performance_budgets"}),
+    "js_logic": ("game-script.js", "function closeModal() {", "function closeModal() {\n    void 0;",
+                 BROWSER_CHECKS | {"performance_budgets"}),
+    "move_data": ("game-script.js", '"🔥 Fireball - Projectile attack"', '"🔥 Fire Flower - Projectile attack"',
+                  {"roster_moves", "character_modals", "performance_budgets"}),
+}
+
+
+@pytest.fixture
+def site(tmp_path):
+    for name in (INDEX, "game-styles.css", "game-script.js"):
+        shutil.copy(f"{ROOT}/{name}", tmp_path)
+    return tmp_path
+
+
+def keys(root):
+    deps = DependencyHashes(str(root))
+    return {check.name: deps.key(check) for check in CHECKS}
+
+
+def edit(path, old, new):
+    text = path.read_text(encoding="utf-8")
+    assert old in text, f"{old!r} not found in {path.name}"
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
+
+
+@pytest.mark.parametrize("change", EDITS)
+def test_edit_invalidates_only_dependents(site, change):
+    name, old, new, expected = EDITS[change]
+    before = keys(site)
+    edit(site / name, old, new)
+    after = keys(site)
+    assert {check for check in before if before[check] != after[check]} == expected
+
+
+def test_unchanged_site_keeps_every_key(site):
+    assert keys(site) == keys(site)
+
+
+def test_harness_module_edit_invalidates_browser_checks(site):
+    before = keys(site)
+    deps = DependencyHashes(str(site))
+    deps.hashes["py:page_waits"] = "edited"
+    after = {check.name: deps.key(check) for check in CHECKS}
+    assert {check for check in before if before[check] != after[check]} == BROWSER_CHECKS | {"performance_budgets"}
+
+
+def test_hashed_asset_names_resolve(site):
+    (site / "game-styles.css").rename(site / "game-styles.0123456789.css")
+    edit(site / INDEX, 'href="game-styles.css"', 'href="game-styles.0123456789.css"')
+    deps = DependencyHashes(str(site))
+    assert deps.stylesheets == ["game-styles.0123456789.css"]
+    assert deps.character_moves
+
+
+def test_result_cache_replays_only_matching_keys(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("title", "key-1", CheckResult(name="title", measured={"has_version": True}))
+    assert cache.get("title", "key-1").measured == {"has_version": True}
+    assert cache.get("title", "key-2") is None
+    cache.put("nav_links", "key-1", CheckResult(name="nav_links", status=ERROR))
+    assert cache.get("nav_links", "key-1") is None
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
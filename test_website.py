@@ -1,118 +1,113 @@
 #!/usr/bin/env python3
 """
-Manual test script for Super Smash Bros Infinity v0.7.0 website
+HTTP-level tests for Super Smash Bros Infinity v0.7.0 website: page structure, assets and caching
 """
 
+import sys
+import pytest
 import requests
-from bs4 import BeautifulSoup
-import re
-
-def test_website():
-    print("🎮 Testing Super Smash Bros Infinity v0.7.0 Website")
-    print("=" * 60)
-    
-    base_url = "http://localhost:8081"
-    
-    try:
-        # Test 1: Check if main HTML loads
-        print("\n1. Testing main HTML file...")
-        response = requests.get(f"{base_url}/game-website.html")
-        if response.status_code == 200:
-            print("✅ HTML file loads successfully")
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Check title
-            title = soup.find('title')
-            if title and "Super Smash Bros Infinity v0.7.0" in title.text:
-                print("✅ Page title is correct")
-            else:
-                print("❌ Page title is incorrect or missing")
-            
-            # Check hero title
-            hero_title = soup.find('h1', class_='hero-title')
-            if hero_title:
-                print("✅ Hero title found")
-            else:
-                print("❌ Hero title not found")
-            
-            # Check navigation menu
-            nav_items = soup.find_all('a', href=re.compile(r'^#'))
-            print(f"✅ Found {len(nav_items)} navigation items")
-            
-            # Check character cards
-            character_cards = soup.find_all('div', class_='character-card')
-            print(f"✅ Found {len(character_cards)} character cards")
-            
-            # Check placeholder images
-            placeholder_images = soup.find_all('img', src=re.compile(r'via\.placeholder\.com'))
-            print(f"✅ Found {len(placeholder_images)} placeholder images")
-            
-            # List some character names
-            character_names = []
-            for card in character_cards[:10]:  # First 10 characters
-                h3 = card.find('h3')
-                if h3:
-                    character_names.append(h3.text.strip())
-            
-            print(f"✅ Character names found: {', '.join(character_names)}")
-            
-        else:
-            print(f"❌ HTML file failed to load: {response.status_code}")
-            return False
-        
-        # Test 2: Check CSS file
-        print("\n2. Testing CSS file...")
-        css_response = requests.get(f"{base_url}/game-styles.css")
-        if css_response.status_code == 200:
-            print("✅ CSS file loads successfully")
-            if ".character-card" in css_response.text:
-                print("✅ CSS contains character card styles")
-            if ".modal" in css_response.text:
-                print("✅ CSS contains modal styles")
-        else:
-            print(f"❌ CSS file failed to load: {css_response.status_code}")
-        
-        # Test 3: Check JavaScript file
-        print("\n3. Testing JavaScript file...")
-        js_response = requests.get(f"{base_url}/game-script.js")
-        if js_response.status_code == 200:
-            print("✅ JavaScript file loads successfully")
-            if "characterMoves" in js_response.text:
-                print("✅ JavaScript contains character moves data")
-            if "showCharacterMoves" in js_response.text:
-                print("✅ JavaScript contains modal functions")
-        else:
-            print(f"❌ JavaScript file failed to load: {js_response.status_code}")
-        
-        # Test 4: Check specific characters mentioned in the review
-        print("\n4. Testing specific characters from review...")
-        review_characters = ['kirby', 'naruto', 'goku', 'pikachu', 'link', 'megaman', 
-                           'scratch-cat', 'impostor', 'ness', 'hat-kid', 'sora', 'reimu']
-        
-        found_characters = []
-        for char in review_characters:
-            if f'data-character="{char}"' in response.text:
-                found_characters.append(char)
-        
-        print(f"✅ Found {len(found_characters)}/{len(review_characters)} review characters")
-        print(f"   Characters found: {', '.join(found_characters)}")
-        
-        # Test 5: Check moveset data in JavaScript
-        print("\n5. Testing character movesets...")
-        moveset_count = 0
-        for char in found_characters:
-            if f'"{char}":' in js_response.text:
-                moveset_count += 1
-        
-        print(f"✅ Found movesets for {moveset_count}/{len(found_characters)} characters")
-        
-        print("\n" + "=" * 60)
-        print("🎮 Website testing completed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error during testing: {str(e)}")
-        return False
+from browser_session import REVIEW_CHARACTERS
+from fetch_client import HttpCache, fetch_assets
+from static_analyzer import analyze_html
+from static_server import StaticServer
+
+ASSETS = ("game-website.html", "game-styles.css", "game-script.js")
+
+
+@pytest.fixture(scope="module")
+def responses(site_url):
+    # HTML, CSS and JS come down concurrently over one pooled client,
+    # revalidated against the on-disk ETag/Last-Modified cache
+    return dict(zip(ASSETS, fetch_assets([f"{site_url}/{name}" for name in ASSETS])))
+
+
+@pytest.fixture(scope="module")
+def report(responses):
+    # Parse once and answer every structural check from the index
+    return analyze_html(responses["game-website.html"].content)
+
+
+@pytest.mark.parametrize("name", ASSETS)
+def test_asset_loads(responses, name):
+    assert responses[name].ok, f"{name} returned {responses[name].status}"
+
+
+def test_page_title(report):
+    assert "Super Smash Bros Infinity v0.7.0" in (report["title"] or "")
+
+
+def test_hero_title(report):
+    assert report["hero_title"]
+
+
+def test_navigation(report):
+    assert report["nav_items"] >= 7
+
+
+def test_character_cards(report):
+    assert report["character_cards"] == 19
+    assert len(report["character_names"]) == report["character_cards"]
+
+
+def test_stylesheet_rules(responses):
+    css = responses["game-styles.css"].text
+    assert ".character-card" in css
+    assert ".modal" in css
+
+
+def test_script_functions(responses):
+    js = responses["game-script.js"].text
+    assert "characterMoves" in js
+    assert "showCharacterMoves" in js
+
+
+def test_review_characters_have_cards(report):
+    missing = sorted(set(REVIEW_CHARACTERS) - set(report["data_characters"]))
+    assert not missing, f"review characters without cards: {missing}"
+
+
+def test_character_has_moves(roster, character):
+    if character == "more":
+        pytest.skip("'And 4 More!' is not a fighter")
+    fighter = roster.fighter(character)
+    assert fighter is not None, f"{character} has a card but no characterMoves entry"
+    assert fighter.moves, f"{character} has no moves"
+
+
+def test_no_orphaned_moves(roster):
+    assert not roster.orphaned_moves, f"movesets without cards: {roster.orphaned_moves}"
+
+
+def test_repeat_visit_revalidates(site_url, responses):
+    # A repeat visit should revalidate every asset with a 304
+    repeat = fetch_assets([f"{site_url}/{name}" for name in ASSETS])
+    stale = [name for name, result in zip(ASSETS, repeat) if not result.from_cache]
+    assert not stale, f"not revalidated as 304: {stale}"
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_etag_survives_server_restart(encoding):
+    # A validator issued by one run's server must be honoured by the next one's
+    headers = {"Accept-Encoding": encoding}
+    with StaticServer() as first, StaticServer() as second:
+        etag = requests.get(f"{first.url}/game-styles.css", headers=headers, timeout=5).headers["ETag"]
+        repeat = requests.get(f"{second.url}/game-styles.css", headers={**headers, "If-None-Match": etag},
+                              timeout=5)
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == etag
+
+
+def test_revalidates_across_server_restarts(tmp_path):
+    # Every run serves from a new port; the cache written by one run must still answer the next
+    cache = HttpCache(str(tmp_path))
+    with StaticServer() as first, StaticServer() as second:
+        fresh = fetch_assets([f"{first.url}/{name}" for name in ASSETS], cache)
+        repeat = fetch_assets([f"{second.url}/{name}" for name in ASSETS], cache)
+    assert [result.status for result in fresh] == [200] * len(ASSETS)
+    assert all(result.from_cache for result in repeat)
+    assert [result.content for result in repeat] == [result.content for result in fresh]
+    assert len(list(tmp_path.glob("*.json"))) == len(ASSETS)
+
 
 if __name__ == "__main__":
-    test_website()
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Screenshot visual regression: stored baselines, masked NumPy diffs and tile checksums for early exit
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import shutil
+import time
+import zlib
+from dataclasses import dataclass, field
+from animation_freeze import settle_clock
+from image_pipeline import store_capture
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = Image = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(ROOT, "visual_baselines")
+OUTPUT_DIR = os.path.join(ROOT, "visual_output")
+# Per-channel difference (0-255) below which a pixel counts as unchanged
+PIXEL_THRESHOLD = 16
+# Share of compared pixels that may differ before a capture fails
+MAX_DIFF_RATIO = 0.001
+TILE = 64
+# Randomly positioned by createParticles() on every load
+IGNORE_SELECTORS = [".particle-container"]
+
+_REGIONS_JS = """
+(selectors) => {
+    const ratio = window.devicePixelRatio || 1;
+    return selectors.flatMap(selector => Array.from(document.querySelectorAll(selector), el => {
+        const r = el.getBoundingClientRect();
+        return [(r.left + scrollX) * ratio, (r.top + scrollY) * ratio, r.width * ratio, r.height * ratio]
+            .map(Math.round);
+    }));
+}
+"""
+
+
+@dataclass(slots=True)
+class DiffResult:
+    name: str
+    width: int
+    height: int
+    diff_pixels: int = 0
+    compared_pixels: int = 0
+    changed_tiles: int = 0
+    tiles: int = 0
+    size_changed: bool = False
+    early_exit: bool = False
+    duration_ms: float = 0.0
+    diff_path: str = None
+    bbox: list = field(default_factory=list)
+
+    @property
+    def diff_ratio(self):
+        return self.diff_pixels / self.compared_pixels if self.compared_pixels else 0.0
+
+    def passed(self, max_ratio=MAX_DIFF_RATIO):
+        return not self.size_changed and self.diff_ratio <= max_ratio
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("numpy and Pillow are required for visual regression")
+
+
+def decode(png):
+    """RGB pixel array from PNG bytes or a path."""
+    _require_numpy()
+    source = io.BytesIO(png) if isinstance(png, bytes) else png
+    with Image.open(source) as image:
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+        return np.asarray(image)[..., :3]
+
+
+def region_mask(shape, regions):
+    """Boolean (h, w) mask, True inside any [x, y, w, h] region."""
+    mask = np.zeros(shape[:2], dtype=bool)
+    for x, y, w, h in regions:
+        mask[max(y, 0):max(y + h, 0), max(x, 0):max(x + w, 0)] = True
+    return mask
+
+
+def _tiles(pixels, tile):
+    """View a zero-padded (h, w[, 3]) image as (rows, tile, cols, tile[, 3]) blocks."""
+    h, w = pixels.shape[:2]
+    padded_h, padded_w = -(-h // tile) * tile, -(-w // tile) * tile
+    if (padded_h, padded_w) != (h, w):
+        pad = ((0, padded_h - h), (0, padded_w - w)) + ((0, 0),) * (pixels.ndim - 2)
+        pixels = np.pad(pixels, pad)
+    return pixels.reshape(padded_h // tile, tile, padded_w // tile, tile, *pixels.shape[2:])
+
+
+def tile_checksums(pixels, mask=None, tile=TILE):
+    """CRC-32 per tile; masked pixels are zeroed first.
+
+    Exact content checksums rather than perceptual hashes: a one-pixel text
+    regression must not hash equal, tolerance comes from the pixel threshold.
+    """
+    if mask is not None and mask.any():
+        pixels = pixels.copy()
+        pixels[mask] = 0
+    blocks = np.ascontiguousarray(_tiles(pixels, tile).swapaxes(1, 2))
+    rows, cols = blocks.shape[:2]
+    checksums = np.empty((rows, cols), dtype=np.uint32)
+    for row in range(rows):
+        for col in range(cols):
+            checksums[row, col] = zlib.crc32(blocks[row, col])
+    return checksums
+
+
+def changed_pixels(a, b, threshold=PIXEL_THRESHOLD):
+    """(h, w) mask of pixels where any channel differs by more than `threshold`."""
+    delta = np.maximum(a, b)
+    delta -= np.minimum(a, b)
+    over = delta > threshold
+    return over[..., 0] | over[..., 1] | over[..., 2]
+
+
+def _sidecar_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def save_baseline(name, png, regions, baseline_dir=BASELINE_DIR, tile=TILE):
+    """Store `png` as the baseline for `name` with its ignore regions and tile checksums."""
+    os.makedirs(baseline_dir, exist_ok=True)
+    path = os.path.join(baseline_dir, f"{name}.png")
+    with open(path, "wb") as f:
+        f.write(png)
+    pixels = decode(png)
+    checksums = tile_checksums(pixels, region_mask(pixels.shape, regions), tile)
+    with open(_sidecar_path(path), "w", encoding="utf-8") as f:
+        json.dump({"width": pixels.shape[1], "height": pixels.shape[0], "regions": regions,
+                   "tile": tile, "checksums": checksums.tolist()}, f)
+    return path
+
+
+def diff_image(current, changed, mask, bbox, margin=16):
+    """Changed pixels in red over a dimmed copy, ignored regions tinted blue, cropped to `bbox`."""
+    x0, y0, x1, y1 = bbox
+    h, w = changed.shape
+    x0, y0, x1, y1 = max(x0 - margin, 0), max(y0 - margin, 0), min(x1 + margin, w), min(y1 + margin, h)
+    out = (current[y0:y1, x0:x1].mean(axis=2, keepdims=True) * 0.35).astype(np.uint8).repeat(3, axis=2)
+    out[mask[y0:y1, x0:x1]] = (out[mask[y0:y1, x0:x1]] // 2 + np.array([0, 0, 96], dtype=np.uint8))
+    out[changed[y0:y1, x0:x1]] = (255, 0, 0)
+    return Image.fromarray(out)
+
+
+def compare(name, current_png, regions=(), baseline_dir=BASELINE_DIR, output_dir=OUTPUT_DIR,
+            threshold=PIXEL_THRESHOLD):
+    """Diff a capture against the stored baseline; writes a cropped diff image when pixels changed."""
+    _require_numpy()
+    started = time.perf_counter()
+    baseline_path = os.path.join(baseline_dir, f"{name}.png")
+    with open(_sidecar_path(baseline_path), encoding="utf-8") as f:
+        meta = json.load(f)
+
+    current = decode(current_png)
+    h, w = current.shape[:2]
+    result = DiffResult(name, w, h)
+    regions = [list(region) for region in regions]
+    size_changed = (w, h) != (meta["width"], meta["height"])
+
+    # Tiles whose checksum matches the baseline's are identical and skipped;
+    # when every tile matches the baseline PNG is never even decoded
+    suspect = None
+    if not size_changed and regions == meta["regions"]:
+        checksums = tile_checksums(current, region_mask(current.shape, regions), meta["tile"])
+        suspect = checksums != np.array(meta["checksums"], dtype=np.uint32)
+        result.tiles = checksums.size
+        if not suspect.any():
+            result.compared_pixels = w * h - int(region_mask(current.shape, regions).sum())
+            result.early_exit = True
+            result.duration_ms = (time.perf_counter() - started) * 1000
+            return result
+
+    baseline = decode(baseline_path)
+    ch, cw = min(h, baseline.shape[0]), min(w, baseline.shape[1])
+    mask = region_mask((ch, cw), regions) | region_mask((ch, cw), meta["regions"])
+    tile = meta["tile"]
+    if suspect is not None and suspect.mean() < 0.25:
+        changed = np.zeros((ch, cw), dtype=bool)
+        for row, col in zip(*np.nonzero(suspect)):
+            ys, xs = slice(row * tile, (row + 1) * tile), slice(col * tile, (col + 1) * tile)
+            changed[ys, xs] = changed_pixels(current[ys, xs], baseline[ys, xs], threshold)
+    else:
+        changed = changed_pixels(current[:ch, :cw], baseline[:ch, :cw], threshold)
+    changed &= ~mask
+
+    result.size_changed = size_changed
+    result.compared_pixels = int((~mask).sum())
+    result.diff_pixels = int(changed.sum())
+    tile_hits = _tiles(changed, tile).any(axis=(1, 3))
+    result.tiles = tile_hits.size
+    result.changed_tiles = int(tile_hits.sum())
+    if result.diff_pixels:
+        ys, xs = np.nonzero(tile_hits)
+        result.bbox = [int(xs.min() * tile), int(ys.min() * tile),
+                       int(min((xs.max() + 1) * tile, cw)), int(min((ys.max() + 1) * tile, ch))]
+        os.makedirs(output_dir, exist_ok=True)
+        result.diff_path = os.path.join(output_dir, f"{name}.diff.png")
+        diff_image(current[:ch, :cw], changed, mask, result.bbox).save(result.diff_path, optimize=True)
+    result.duration_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+async def capture(page, name, full_page=True, ignore=IGNORE_SELECTORS, output_dir=OUTPUT_DIR):
+    """Screenshot with CSS animations stopped; returns the PNG bytes and ignore regions.
+
+    The capture is kept in the content-addressed store under `output_dir`/captures,
+    so a run that renders the same pixels as the last one writes nothing. On a
+    frozen page the virtual clock is run forward first, after scrolling through
+    the page for full-page captures, so late timers cannot leave content hidden.
+    """
+    await settle_clock(page, reveal=full_page)
+    png = await page.screenshot(full_page=full_page, animations="disabled", caret="hide")
+    store_capture(name, png, os.path.join(output_dir, "captures"))
+    regions = await page.evaluate(_REGIONS_JS, list(ignore))
+    return png, regions
+
+
+def check_capture(name, png, regions, baseline_dir=BASELINE_DIR, update=False, max_ratio=MAX_DIFF_RATIO):
+    """CheckResult for one capture; saves a new baseline when asked to or when none exists yet."""
+    from check_results import CheckResult, SKIPPED
+
+    check = CheckResult(name=name, group="visual_regression")
+    if np is None:
+        check.status = SKIPPED
+        check.message = "numpy and Pillow are not installed"
+        return check, None
+    if update or not os.path.exists(os.path.join(baseline_dir, f"{name}.png")):
+        save_baseline(name, png, regions, baseline_dir)
+        check.status = SKIPPED
+        check.message = "baseline saved"
+        return check, None
+    result = compare(name, png, regions, baseline_dir)
+    check.expect("size_changed", result.size_changed, False)
+    check.expect_max("diff_ratio", result.diff_ratio, max_ratio)
+    for key in ("diff_pixels", "changed_tiles", "tiles", "early_exit", "duration_ms", "diff_path"):
+        check.measure(key, getattr(result, key))
+    return check, result
+
+
+def print_diff(result):
+    if result.early_exit:
+        print(f"✅ {result.name}: identical ({result.tiles} tiles, {result.duration_ms:.0f}ms)")
+        return
+    icon = "✅" if result.passed() else "❌"
+    print(f"{icon} {result.name}: {result.diff_pixels} px differ ({result.diff_ratio:.4%}), "
+          f"{result.changed_tiles}/{result.tiles} tiles, {result.duration_ms:.0f}ms"
+          + (" — size changed" if result.size_changed else "")
+          + (f" → {os.path.relpath(result.diff_path, ROOT)}" if result.diff_path else ""))
+
+
+def benchmark(width=1920, height=9000, repeat=3):
+    """Time a full-page-sized compare: identical capture and one with a changed block."""
+    _require_numpy()
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8).repeat(8, 0).repeat(8, 1)
+    baseline_dir = os.path.join(OUTPUT_DIR, "benchmark")
+    regions = [[0, 0, width, 600]]
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG", compress_level=1)
+    save_baseline("bench", buffer.getvalue(), regions, baseline_dir)
+    changed = pixels.copy()
+    changed[4000:4100, 900:1100] = 255
+    changed_buffer = io.BytesIO()
+    Image.fromarray(changed).save(changed_buffer, format="PNG", compress_level=1)
+
+    print(f"🖼️  {width}x{height} capture, {TILE}px tiles")
+    for label, png in (("identical", buffer.getvalue()), ("changed block", changed_buffer.getvalue())):
+        timings = []
+        for _ in range(repeat):
+            result = compare("bench", png, regions, baseline_dir, baseline_dir)
+            timings.append(result.duration_ms)
+        print(f"⏱️  {label:<14} best {min(timings):6.0f}ms, {result.diff_pixels} px differ")
+    shutil.rmtree(baseline_dir)
+
+
+async def main(args):
+    from browser_session import BrowserSession
+    from check_results import ResultStream
+    from page_metrics import VIEWPORTS, SETTLE_TIMEOUT
+
+    print("🎮 Visual regression for Super Smash Bros Infinity v0.7.0")
+    print("=" * 60)
+
+    async def shoot(page, name):
+        await page.set_viewport_size(VIEWPORTS[name])
+        await page.goto("/game-website.html")
+        await page.wait_for_load_state("networkidle")
+        await page.wait_for_selector(".loading-screen", state="detached", timeout=SETTLE_TIMEOUT)
+        return await capture(page, f"full_{name}")
+
+    # Frozen pages render byte-stable: seeded particles, no running animations or timers
+    async with BrowserSession(workers=len(VIEWPORTS), freeze=True) as session:
+        captures, _ = await session.map_pages(shoot, list(VIEWPORTS), url=None)
+
+    with ResultStream(jsonl_path=args.jsonl, junit_path=args.junit) as results:
+        for name, (png, regions) in zip(VIEWPORTS, captures):
+            check, result = check_capture(f"full_{name}", png, regions, update=args.update)
+            results.add(check)
+            if result:
+                print_diff(result)
+            else:
+                print(f"📸 full_{name}: {check.message}")
+    return results.ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--update", action="store_true", help="accept the current captures as baselines")
+    parser.add_argument("--benchmark", action="store_true", help="time the diff engine on synthetic captures")
+    parser.add_argument("--jsonl", help="write results as JSON Lines to this path")
+    parser.add_argument("--junit", help="write results as JUnit XML to this path")
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark()
+    else:
+        raise SystemExit(0 if asyncio.run(main(args)) else 1)